@@ -0,0 +1,58 @@
+""" Compare the peak memory and time of validating a large events file whole and a chunk of rows at a time.
+
+Every tenth row of the file has an invalid tag in its HED column, so the issues also grow with the file.
+
+Run from the repository root after creating config.py:  python benchmarks/bench_events_chunks.py [rows] [chunk_size]
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.join(ROOT_DIR, 'hedweb'))
+
+from hed.models import Sidecar, TabularInput  # noqa: E402
+from app_factory import AppFactory  # noqa: E402
+
+
+def measure(func):
+    tracemalloc.start()
+    start = time.perf_counter()
+    issue_count = func()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak, issue_count
+
+
+def main(count=20000, chunk_size=1000):
+    app = AppFactory.create_app('config.TestConfig')
+    with app.app_context():
+        from events import validate_chunks
+        from schema_loader import get_schema_from_string, get_validator
+        with open(os.path.join(ROOT_DIR, 'tests/data/HED8.0.0.xml'), 'r') as fp:
+            validator = get_validator(get_schema_from_string(fp.read()))
+        sidecar = Sidecar(file=os.path.join(ROOT_DIR, 'tests/data/bids_events.json'), name='bids_events')
+        with open(os.path.join(ROOT_DIR, 'tests/data/bids_events.tsv'), 'r') as fp:
+            header, *rows = fp.read().splitlines()
+        with tempfile.NamedTemporaryFile('w', suffix='.tsv', delete=False) as fp:
+            fp.write(header + '\tHED\n')
+            for pos in range(count):
+                fp.write(rows[pos % len(rows)] + ('\tBlech\n' if pos % 10 == 0 else '\tn/a\n'))
+        try:
+            whole = measure(lambda: len(TabularInput(file=fp.name, sidecar=sidecar,
+                                                     name='bids_events').validate_file(validator)))
+            chunked = measure(lambda: sum(len(issues) for _, _, issues in
+                                          validate_chunks(validator, fp.name, sidecar, name='bids_events',
+                                                          chunk_size=chunk_size)))
+        finally:
+            os.remove(fp.name)
+        for label, (elapsed, peak, issue_count) in (('whole file', whole), (f'{chunk_size}-row chunks', chunked)):
+            print(f"{count} rows, {label:18} {elapsed:8.2f} s  peak {peak / 2 ** 20:8.1f} MB  {issue_count} issues")
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,54 @@
+""" Compare searching the assembled strings of a large events file row by row and with its tag index.
+
+Run from the repository root after creating config.py:  python benchmarks/bench_events_index.py [rows]
+"""
+import io
+import os
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.join(ROOT_DIR, 'hedweb'))
+
+import pandas as pd  # noqa: E402
+from hed.models import Sidecar, TabularInput, TagExpressionParser  # noqa: E402
+from hed.tools import get_assembled_strings  # noqa: E402
+from app_factory import AppFactory  # noqa: E402
+from events_index import EventsIndex  # noqa: E402
+
+QUERIES = ['Sensory-event', 'Agent-action and Hand', 'Red or Feedback', '(Cue or Press) and Mouse-button',
+           'Sensory-event and [[Intended-effect, Reward]]', '~Hand']
+
+
+def main(count=10000):
+    app = AppFactory.create_app('config.TestConfig')
+    with app.app_context():
+        from schema_loader import get_schema_from_string
+        with open(os.path.join(ROOT_DIR, 'tests/data/HED8.0.0.xml'), 'r') as fp:
+            hed_schema = get_schema_from_string(fp.read())
+        sidecar = Sidecar(file=os.path.join(ROOT_DIR, 'tests/data/bids_events.json'), name='bids_events')
+        df = pd.read_csv(os.path.join(ROOT_DIR, 'tests/data/bids_events.tsv'), sep='\t', dtype=str,
+                         keep_default_na=False)
+        df = pd.concat([df] * (count // len(df) + 1), ignore_index=True).iloc[:count]
+        events = TabularInput(file=io.StringIO(df.to_csv(sep='\t', index=False)), sidecar=sidecar, name='bids_events')
+        hed_list = get_assembled_strings(events, hed_schema=hed_schema, expand_defs=True)[0]
+
+        start = time.perf_counter()
+        index = EventsIndex(hed_list)
+        print(f"{count} rows: index of {len(index)} terms built in {time.perf_counter() - start:.3f} s")
+        for query in QUERIES:
+            expression = TagExpressionParser(query)
+            start = time.perf_counter()
+            rows = [row for row, hed_string in enumerate(hed_list) if expression.search_hed_string(hed_string)]
+            scan_time = time.perf_counter() - start
+            start = time.perf_counter()
+            index_rows = index.search(expression, hed_list)
+            index_time = time.perf_counter() - start
+            assert index_rows == rows
+            print(f"  {query:46} {len(rows):6} rows  scan {scan_time:8.3f} s  index {index_time:8.4f} s  "
+                  f"speedup {scan_time / max(index_time, 1e-6):.0f}x")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
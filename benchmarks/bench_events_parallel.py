@@ -0,0 +1,55 @@
+""" Compare validating a large events file serially and on process pools of increasing size.
+
+Run from the repository root after creating config.py:  python benchmarks/bench_events_parallel.py [rows]
+"""
+import io
+import multiprocessing
+import os
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.join(ROOT_DIR, 'hedweb'))
+
+import pandas as pd  # noqa: E402
+from hed.models import Sidecar, TabularInput  # noqa: E402
+from app_factory import AppFactory  # noqa: E402
+
+
+def time_validate(events, hed_schema, events_text, sidecar, parallel=False):
+    tabular_input = TabularInput(file=io.StringIO(events_text), sidecar=sidecar, name='bids_events')
+    start = time.perf_counter()
+    results = events.validate(hed_schema, tabular_input, sidecar, parallel=parallel)
+    return time.perf_counter() - start, results
+
+
+def main(count=40000):
+    app = AppFactory.create_app('config.TestConfig')
+    with app.app_context():
+        import events
+        from process_pool import SchemaProcessPool
+        from schema_loader import get_schema_from_string
+        with open(os.path.join(ROOT_DIR, 'tests/data/HED8.0.0.xml'), 'r') as fp:
+            hed_schema = get_schema_from_string(fp.read())
+        sidecar = Sidecar(file=os.path.join(ROOT_DIR, 'tests/data/bids_events.json'), name='bids_events')
+        df = pd.read_csv(os.path.join(ROOT_DIR, 'tests/data/bids_events.tsv'), sep='\t', dtype=str,
+                         keep_default_na=False)
+        df = pd.concat([df] * (count // len(df) + 1), ignore_index=True).iloc[:count]
+        df['HED'] = ['Blech' if pos % 10 == 0 else 'n/a' for pos in range(count)]
+        events_text = df.to_csv(sep='\t', index=False)
+        warm_up_text = df.iloc[:16].to_csv(sep='\t', index=False)
+        serial_time, serial_results = time_validate(events, hed_schema, events_text, sidecar)
+        print(f"{count} rows on {multiprocessing.cpu_count()} CPUs: serial {serial_time:.2f} s")
+        events.app_config['EVENTS_PARALLEL_THRESHOLD'] = 1
+        for workers in (2, 4, 8, 16):
+            events.process_pool = SchemaProcessPool(max_workers=workers)
+            time_validate(events, hed_schema, warm_up_text, sidecar, parallel=True)  # Start the workers
+            pool_time, pool_results = time_validate(events, hed_schema, events_text, sidecar, parallel=True)
+            events.process_pool.shutdown()
+            assert pool_results == serial_results
+            print(f"  {workers} workers {pool_time:.2f} s, speedup {serial_time / pool_time:.2f}x")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 40000)
@@ -0,0 +1,44 @@
+""" Compare validating every row of a large events file with validating each distinct row only once.
+
+Run from the repository root after creating config.py:  python benchmarks/bench_events_unique.py [rows]
+"""
+import io
+import os
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.join(ROOT_DIR, 'hedweb'))
+
+import pandas as pd  # noqa: E402
+from hed.models import Sidecar, TabularInput  # noqa: E402
+from app_factory import AppFactory  # noqa: E402
+
+
+def main(count=10000):
+    app = AppFactory.create_app('config.TestConfig')
+    with app.app_context():
+        from events import validate_unique_rows
+        from schema_loader import get_schema_from_string, get_validator
+        with open(os.path.join(ROOT_DIR, 'tests/data/HED8.0.0.xml'), 'r') as fp:
+            validator = get_validator(get_schema_from_string(fp.read()))
+        sidecar = Sidecar(file=os.path.join(ROOT_DIR, 'tests/data/bids_events.json'), name='bids_events')
+        df = pd.read_csv(os.path.join(ROOT_DIR, 'tests/data/bids_events.tsv'), sep='\t', dtype=str,
+                         keep_default_na=False)
+        df = pd.concat([df] * (count // len(df) + 1), ignore_index=True).iloc[:count]
+        events = TabularInput(file=io.StringIO(df.to_csv(sep='\t', index=False)), sidecar=sidecar,
+                              name='bids_events')
+
+        start = time.perf_counter()
+        issues = events.validate_file(validator)
+        all_time = time.perf_counter() - start
+        print(f"All {count} rows:   {all_time:8.3f} s  {len(issues)} issues")
+        start = time.perf_counter()
+        unique_issues = validate_unique_rows(validator, events, sidecar)
+        unique_time = time.perf_counter() - start
+        print(f"Distinct rows: {unique_time:8.3f} s  {len(unique_issues)} issues  speedup {all_time / unique_time:.1f}x")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
@@ -0,0 +1,36 @@
+""" Compare HED-3G compliance checking of the HED8.0.0 test schema with and without the compliance cache.
+
+Run from the repository root after creating config.py:  python benchmarks/bench_schema_compliance.py [repeats]
+"""
+import os
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.join(ROOT_DIR, 'hedweb'))
+
+from app_factory import AppFactory  # noqa: E402
+
+
+def time_call(func, repeats):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        func()
+    return (time.perf_counter() - start) / repeats
+
+
+def main(repeats=20):
+    app = AppFactory.create_app('config.TestConfig')
+    with app.app_context():
+        from schema_loader import get_compliance_issues, get_schema_from_string
+        with open(os.path.join(ROOT_DIR, 'tests/data/HED8.0.0.xml'), 'r') as fp:
+            hed_schema = get_schema_from_string(fp.read(), file_type='.xml')
+        uncached_time = time_call(hed_schema.check_compliance, repeats)
+        get_compliance_issues(hed_schema)
+        cached_time = time_call(lambda: get_compliance_issues(hed_schema), repeats)
+    print(f"HED8.0.0 compliance check: uncached {uncached_time * 1000:.2f} ms, cached {cached_time * 1000:.4f} ms")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20)
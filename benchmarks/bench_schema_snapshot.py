@@ -0,0 +1,43 @@
+""" Compare cold-load times of the schemas in schema_cache from XML and from snapshot files.
+
+Run from the repository root:  python benchmarks/bench_schema_snapshot.py [repeats]
+"""
+import glob
+import hashlib
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'hedweb'))
+
+from hed import schema as hedschema  # noqa: E402
+from schema_snapshot import get_snapshot_path, read_snapshot, write_snapshot  # noqa: E402
+
+SNAPSHOT_KEY = os.urandom(24)
+
+
+def time_call(func, repeats):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        func()
+    return (time.perf_counter() - start) / repeats
+
+
+def main(repeats=5):
+    cache_folder = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'schema_cache')
+    with tempfile.TemporaryDirectory() as temp_dir:
+        print(f"{'Schema':<28}{'XML (ms)':>12}{'Snapshot (ms)':>16}{'Speedup':>10}")
+        for hed_file_path in sorted(glob.glob(os.path.join(cache_folder, '*.xml'))):
+            with open(hed_file_path, 'rb') as fp:
+                source_hash = hashlib.sha256(fp.read()).hexdigest()
+            snapshot_path = get_snapshot_path(os.path.join(temp_dir, os.path.basename(hed_file_path)))
+            write_snapshot(snapshot_path, hedschema.load_schema(hed_file_path), source_hash, SNAPSHOT_KEY)
+            xml_time = time_call(lambda: hedschema.load_schema(hed_file_path), repeats)
+            snapshot_time = time_call(lambda: read_snapshot(snapshot_path, source_hash, SNAPSHOT_KEY), repeats)
+            print(f"{os.path.basename(hed_file_path):<28}{xml_time * 1000:>12.1f}{snapshot_time * 1000:>16.1f}"
+                  f"{xml_time / snapshot_time:>9.1f}x")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
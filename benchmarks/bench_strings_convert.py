@@ -0,0 +1,56 @@
+""" Compare converting HED strings by validating and then converting with converting in the validation pass.
+
+Run from the repository root:  python benchmarks/bench_strings_convert.py [strings]
+"""
+import os
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.join(ROOT_DIR, 'hedweb'))
+
+from hed import schema as hedschema  # noqa: E402
+from hed.models import HedString  # noqa: E402
+from hed.validator import HedValidator  # noqa: E402
+from process_pool import validate_strings  # noqa: E402
+
+HED_STRINGS = ['Red', 'Sensory-event, Visual-presentation, (Square, Blue)', 'Agent-action, (Press, Mouse-button)',
+               'Property/Sensory-property/Sensory-attribute/Visual-attribute/Color/CSS-color/Red-color/Red']
+
+
+def two_pass(hed_validator, hed_schema, string_list):
+    issues = [hed_string_obj.validate(hed_validator, check_for_warnings=False) for hed_string_obj in string_list]
+    if any(issues):
+        return issues
+    return [hed_string_obj.convert_to_short(hed_schema)[0] for hed_string_obj in string_list]
+
+
+def single_pass(hed_validator, hed_schema, string_list):
+    results = validate_strings(hed_validator, string_list, tag_form='short_tag')
+    if any(issues for issues, _ in results):
+        return [issues for issues, _ in results]
+    return [converted_string for _, converted_string in results]
+
+
+def time_convert(convert, hed_validator, hed_schema, texts):
+    string_list = [HedString(text) for text in texts]
+    start = time.perf_counter()
+    converted = convert(hed_validator, hed_schema, string_list)
+    return time.perf_counter() - start, converted
+
+
+def main(count=5000):
+    hed_schema = hedschema.load_schema(os.path.join(ROOT_DIR, 'tests/data/HED8.0.0.xml'))
+    hed_validator = HedValidator(hed_schema=hed_schema)
+    texts = [f"{HED_STRINGS[pos % len(HED_STRINGS)]}, Label/Item{pos}" for pos in range(count)]
+    time_convert(single_pass, hed_validator, hed_schema, texts[:100])  # Warm up
+    two_time, two_converted = time_convert(two_pass, hed_validator, hed_schema, texts)
+    single_time, single_converted = time_convert(single_pass, hed_validator, hed_schema, texts)
+    assert two_converted == single_converted
+    print(f"{count} strings to short: two passes {two_time:.2f} s, single pass {single_time:.2f} s, "
+          f"saving {100 * (1 - single_time / two_time):.0f}%")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
@@ -0,0 +1,51 @@
+""" Compare validating a large list of HED strings serially and on process pools of increasing size.
+
+Run from the repository root after creating config.py:  python benchmarks/bench_strings_parallel.py [strings]
+"""
+import multiprocessing
+import os
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.join(ROOT_DIR, 'hedweb'))
+
+from hed.models import HedString  # noqa: E402
+from app_factory import AppFactory  # noqa: E402
+
+HED_STRINGS = ['Red', 'Sensory-event, Visual-presentation, (Square, Blue)', 'Agent-action, (Press, Mouse-button)',
+               'Blech, (Green, Circle)']
+
+
+def time_validate(strings, hed_schema, string_list):
+    strings.validation_cache.clear()
+    start = time.perf_counter()
+    results = strings.validate(hed_schema, string_list, parallel=True)
+    return time.perf_counter() - start, results
+
+
+def main(count=20000):
+    app = AppFactory.create_app('config.TestConfig')
+    with app.app_context():
+        import strings
+        from process_pool import SchemaProcessPool
+        from schema_loader import get_schema_from_string
+        with open(os.path.join(ROOT_DIR, 'tests/data/HED8.0.0.xml'), 'r') as fp:
+            hed_schema = get_schema_from_string(fp.read())
+        string_list = [HedString(f"{HED_STRINGS[pos % len(HED_STRINGS)]}, Label/Item{pos}") for pos in range(count)]
+        strings.app_config['STRING_BATCH_THRESHOLD'] = count + 1
+        serial_time, serial_results = time_validate(strings, hed_schema, string_list)
+        print(f"{count} strings on {multiprocessing.cpu_count()} CPUs: serial {serial_time:.2f} s")
+        strings.app_config['STRING_BATCH_THRESHOLD'] = 1
+        for workers in (2, 4, 8):
+            strings.process_pool = SchemaProcessPool(max_workers=workers)
+            time_validate(strings, hed_schema, string_list[:workers])  # Start the workers
+            pool_time, pool_results = time_validate(strings, hed_schema, string_list)
+            strings.process_pool.shutdown()
+            assert pool_results == serial_results
+            print(f"  {workers} workers {pool_time:.2f} s, speedup {serial_time / pool_time:.2f}x")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
@@ -0,0 +1,32 @@
+""" Time building the tag completion index of a schema and answering prefix completions from it.
+
+Run from the repository root:  python benchmarks/bench_tag_index.py [lookups]
+"""
+import os
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT_DIR, 'hedweb'))
+
+from hed import schema as hedschema  # noqa: E402
+from tag_index import TagIndex  # noqa: E402
+
+PREFIXES = ['s', 'Sens', 'Sensory-ev', 'Event/', 'Property/Sensory-property/Sensory-attribute/', 'Durat', 'Blech']
+
+
+def main(count=100000):
+    hed_schema = hedschema.load_schema(os.path.join(ROOT_DIR, 'tests/data/HED8.0.0.xml'))
+    start = time.perf_counter()
+    tag_index = TagIndex(hed_schema)
+    print(f"Built an index of {len(tag_index)} tag forms in {(time.perf_counter() - start) * 1000:.1f} ms")
+    for prefix in PREFIXES:
+        start = time.perf_counter()
+        for _ in range(count // len(PREFIXES)):
+            completions = tag_index.complete(prefix, limit=10)
+        elapsed = (time.perf_counter() - start) / (count // len(PREFIXES))
+        print(f"{prefix!r:50} {len(completions):3} completions  {elapsed * 1e6:7.2f} us per lookup")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
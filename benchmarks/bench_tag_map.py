@@ -0,0 +1,45 @@
+""" Compare converting HED strings with the schema converter and with the precomputed tag map.
+
+Run from the repository root:  python benchmarks/bench_tag_map.py [strings]
+"""
+import os
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT_DIR, 'hedweb'))
+
+from hed import schema as hedschema  # noqa: E402
+from hed.models import HedString  # noqa: E402
+from tag_map import TagConverter, build_tag_map  # noqa: E402
+
+HED_STRINGS = ['Red', 'Sensory-event, Visual-presentation, (Square, Blue)', 'Agent-action, (Press, Mouse-button)',
+               'Property/Sensory-property/Sensory-attribute/Visual-attribute/Color/CSS-color/Red-color/Red']
+
+
+def time_convert(convert, texts):
+    string_list = [HedString(text) for text in texts]
+    start = time.perf_counter()
+    converted = [convert(hed_string_obj) for hed_string_obj in string_list]
+    return time.perf_counter() - start, converted
+
+
+def main(count=20000):
+    hed_schema = hedschema.load_schema(os.path.join(ROOT_DIR, 'tests/data/HED8.0.0.xml'))
+    start = time.perf_counter()
+    tag_converter = TagConverter(hed_schema, build_tag_map(hed_schema))
+    build_time = time.perf_counter() - start
+    texts = [f"{HED_STRINGS[pos % len(HED_STRINGS)]}, Label/Item{pos}" for pos in range(count)]
+    for tag_form, convert_name in (('long_tag', 'convert_to_long'), ('short_tag', 'convert_to_short')):
+        schema_time, schema_converted = time_convert(
+            lambda hed_string_obj: getattr(hed_string_obj, convert_name)(hed_schema), texts)
+        map_time, map_converted = time_convert(lambda hed_string_obj: tag_converter.convert(hed_string_obj, tag_form),
+                                               texts)
+        assert schema_converted == map_converted
+        print(f"{count} strings {convert_name}: schema {schema_time:.2f} s, tag map {map_time:.2f} s, "
+              f"speedup {schema_time / map_time:.2f}x")
+    print(f"Building the tag map took {build_time * 1000:.1f} ms")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
@@ -0,0 +1,43 @@
+""" Compare validating small HED strings with a new HedValidator per request and with a cached validator.
+
+Run from the repository root after creating config.py:  python benchmarks/bench_validator_reuse.py [requests]
+"""
+import os
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.join(ROOT_DIR, 'hedweb'))
+
+from hed import schema as hedschema  # noqa: E402
+from hed.models import HedString  # noqa: E402
+from hed.validator import HedValidator  # noqa: E402
+from app_factory import AppFactory  # noqa: E402
+
+HED_STRINGS = ['Red', 'Sensory-event, Visual-presentation, (Square, Blue)', 'Agent-action, (Press, Mouse-button)']
+
+
+def run_requests(hed_schema, get_validator, requests):
+    start = time.perf_counter()
+    for _ in range(requests):
+        validator = get_validator(hed_schema)
+        for hed_string in HED_STRINGS:
+            HedString(hed_string).validate(validator, check_for_warnings=False)
+    return (time.perf_counter() - start) / requests
+
+
+def main(requests=200):
+    app = AppFactory.create_app('config.TestConfig')
+    with app.app_context():
+        from schema_loader import get_validator
+        hed_schema = hedschema.load_schema(os.path.join(ROOT_DIR, 'tests/data/HED8.0.0.xml'))
+        run_requests(hed_schema, get_validator, requests)  # Warm up
+        new_time = run_requests(hed_schema, lambda schema: HedValidator(hed_schema=schema), requests)
+        cached_time = run_requests(hed_schema, get_validator, requests)
+    print(f"Per request ({len(HED_STRINGS)} strings): new validator {new_time * 1e6:.0f} us, "
+          f"cached validator {cached_time * 1e6:.0f} us, saving {(new_time - cached_time) * 1e6:.0f} us")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
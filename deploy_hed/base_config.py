@@ -21,6 +21,38 @@ class Config(object):
     UPLOAD_FOLDER = os.path.join(tempfile.gettempdir(), 'hedtools_uploads')
     URL_PREFIX = None
     HED_CACHE_FOLDER = '/var/cache/schema_cache'
+    SCHEMA_CACHE_SIZE = 8  # Maximum number of parsed schema versions kept in memory.
+    SCHEMA_CONTENT_CACHE_SIZE = 32  # Maximum number of parsed uploaded schemas kept in memory.
+    SCHEMA_CONTENT_CACHE_BYTES = 64 * 1024 * 1024  # Budget for parsed uploaded schemas (about 2.2 MB each for HED 8).
+    PRELOAD_SCHEMA_VERSIONS = ['8.0.0']  # Schema versions loaded from HED_CACHE_FOLDER at startup.
+    SCHEMA_VERSIONS_TTL = 300  # Seconds between background refreshes of the schema version list.
+    VALIDATOR_CACHE_SIZE = 16  # Maximum number of HedValidator objects kept for reuse.
+    SCHEMA_URL_CACHE_FOLDER = os.path.join(tempfile.gettempdir(), 'hedtools_url_cache')
+    SCHEMA_URL_CACHE_TTL = 600  # Seconds before a downloaded schema is revalidated with its origin.
+    SCHEMA_URL_TIMEOUT = 10  # Seconds to wait for a schema download.
+    SCHEMA_CONVERSION_CACHE_SIZE = 32  # Maximum number of converted schemas kept for reuse.
+    SCHEMA_CONVERSION_CACHE_BYTES = 64 * 1024 * 1024  # Budget for converted schema text.
+    SCHEMA_COMPLIANCE_CACHE_SIZE = 32  # Maximum number of schema compliance results kept for reuse.
+    TAG_MAP_CACHE_SIZE = 16  # Maximum number of precomputed short/long tag maps kept for reuse.
+    TAG_INDEX_CACHE_SIZE = 16  # Maximum number of tag completion indexes kept for reuse.
+    TAG_COMPLETION_MAX_LIMIT = 100  # Largest number of completions returned for a tag prefix.
+    PROCESS_POOL_SIZE = None  # Number of worker processes for batch validation (None uses the CPU count).
+    PROCESS_POOL_START_METHOD = None  # Pool start method (None uses forkserver, or spawn if unavailable).
+    PROCESS_POOL_EXECUTABLE = '/usr/local/bin/python'  # Python that starts pool workers (the image's interpreter).
+    STRING_BATCH_THRESHOLD = 5000  # Minimum strings for the parallel option to use the pool (untuned).
+    STRING_BATCH_SIZE = 1000  # Number of strings in each chunk sent to a worker process.
+    STRING_VALIDATION_CACHE_SIZE = 10000  # Maximum number of per-string validation results kept for reuse.
+    STRING_VALIDATION_CACHE_BYTES = 32 * 1024 * 1024  # Approximate byte budget of the string validation cache.
+    STRING_INCREMENTAL_CACHE_SIZE = 1000  # Maximum number of typed strings whose segments are kept by token hash.
+    STRING_SEGMENT_CACHE_SIZE = 10000  # Maximum number of top-level string parts whose repeat keys are kept.
+    SIDECAR_VALIDATION_CACHE_SIZE = 256  # Maximum number of sidecar validation results kept by content hash.
+    SIDECAR_VALIDATION_CACHE_BYTES = 32 * 1024 * 1024  # Approximate byte budget of the sidecar validation cache.
+    EVENTS_CHUNK_SIZE = 10000  # Number of rows in each chunk of streamed or parallel events validation.
+    EVENTS_PARALLEL_THRESHOLD = 20000  # Minimum rows for the parallel option to use the pool (untuned).
+    EVENTS_PROCESS_POOL_SIZE = None  # Number of worker processes for events validation (None uses the CPU count).
+    EVENTS_ASSEMBLY_CACHE_SIZE = 16  # Maximum number of events files whose assembled strings are kept for searches.
+    EVENTS_ASSEMBLY_CACHE_BYTES = 64 * 1024 * 1024  # Approximate byte budget of the assembled events cache.
+    QUERY_CACHE_SIZE = 256  # Maximum number of parsed search queries kept by schema content hash and query.
 
 
 class DevelopmentConfig(Config):
@@ -1,3 +1,4 @@
+CHANGED_SEGMENTS = 'changed_segments'
 CHECK_FOR_WARNINGS = 'check_for_warnings'
 
 COLUMN_COUNTS = 'column_counts'
@@ -31,8 +32,11 @@ COMMAND_TARGET = 'command_target'
 COMMAND_TO_LONG = 'to_long'
 COMMAND_TO_SHORT = 'to_short'
 COMMAND_VALIDATE = 'validate'
+COMPLETIONS = 'completions'
 
 
+DEDUP_RATIO = 'dedup_ratio'
+
 DOWNLOAD_FILE = 'download_file'
 
 EVENTS = 'events'
@@ -56,7 +60,9 @@ HEDSTRING = 'hedstring'
 
 INCLUDE_DEFINITION_TAGS = 'include_definition_tags'
 INCLUDE_DESCRIPTION_TAGS = 'include_description_tags'
+ISSUE_COUNT = 'issue_count'
 ISSUE_STRING = 'issue_string'
+ISSUES = 'issues'
 
 JSON_DISPLAY_NAME = 'json_display_name'
 JSON_FILE = 'json_file'
@@ -66,13 +72,19 @@ JSON_SIDECAR = 'json_sidecar'
 JSON_SIDECARS = 'json_sidecars'
 JSON_STRING = 'json_string'
 
+LIMIT = 'limit'
+
 OTHER_VERSION_OPTION = 'Other'
 OUTPUT_DISPLAY_NAME = 'output_display_name'
 
+PREVIOUS_HASH = 'previous_hash'
+
 QUERY = 'query'
+QUERY_LIST = 'query_list'
 
 REMOVE_DEFS = 'remove_defs'
 REQUIRED_COLUMN_INDICES = 'required_column_indices'
+ROW_COUNT = 'row_count'
 
 # Schema-specific constants
 SCHEMA = 'schema'
@@ -83,6 +95,7 @@ SCHEMA_FILE_FLASH = 'schema_file_flash'
 SCHEMA_FILE_OPTION = 'schema_file_option'
 SCHEMA_FILE_TYPE = 'schema_file_type'
 SCHEMA_FORMAT = 'schema_format'
+SCHEMA_HASH = 'schema_hash'
 SCHEMA_PATH = 'schema_path'
 SCHEMA_SELECT_FLASH = 'schema_select_flash'
 SCHEMA_STRING = 'schema_string'
@@ -96,6 +109,10 @@ SCHEMA_URL_OPTION = 'schema_url_option'
 SCHEMA_VERSION = 'schema_version'
 SCHEMA_VERSION_LIST = 'schema_version_list'
 
+PARALLEL = 'parallel'
+
+SEGMENT_COUNT = 'segment_count'
+
 SERVICE = 'service'
 SERVICE_PARAMETERS = 'service_parameters'
 
@@ -110,11 +127,20 @@ SPREADSHEET_STRING = 'spreadsheet_string'
 SPREADSHEET_TYPE = 'spreadsheet_type'
 SPREADSHEET_SUBMIT_FLASH = 'spreadsheet_submit_flash'
 
+STREAM = 'stream'
+STRING_COUNT = 'string_count'
 STRING_INPUT = 'string_input'
 STRING_LIST = 'string_list'
 STRING_RESULT = 'string_result'
 
 TAG_COLUMNS = 'tag_columns'
+TAG_PREFIX = 'tag_prefix'
+
+TOKEN_HASH = 'token_hash'
+
+UNIQUE_ROWS = 'unique_rows'
+UNIQUE_STRING_COUNT = 'unique_string_count'
+
 WORKSHEET_NAME = 'worksheet_name'
 WORKSHEET_NAMES = 'worksheet_names'
 WORKSHEET_SELECT = 'worksheet_select'
@@ -1,4 +1,6 @@
 BYTE_LIMIT = -1
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+SCHEMA_HEADER_BYTE_LIMIT = 4096
 TEXT_EXTENSION = '.txt'
 TSV_EXTENSION = '.tsv'
 SPREADSHEET_EXTENSIONS = ['.xlsx', '.txt', '.tsv']
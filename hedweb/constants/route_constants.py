@@ -1,5 +1,6 @@
 ROUTE_BLUEPRINT = 'route_blueprint'
 ADDITIONAL_EXAMPLES_ROUTE = '/additional-examples'
+CACHE_STATS_ROUTE = '/cache_stats'
 COLUMNS_INFO_ROUTE = '/get_columns_info'
 HED_ERRORS_ROUTE = '/hed-errors'
 EVENTS_ROUTE = '/events'
@@ -18,3 +19,5 @@ SPREADSHEET_SUBMIT_ROUTE = '/spreadsheet_submit'
 WORKSHEET_COLUMN_INFO_ROUTE = '/worksheets_info'
 STRING_ROUTE = '/string'
 STRING_SUBMIT_ROUTE = '/string_submit'
+STRING_INCREMENTAL_ROUTE = '/string_incremental'
+TAG_COMPLETIONS_ROUTE = '/tag_completions'
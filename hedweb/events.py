@@ -1,19 +1,37 @@
 from flask import current_app
+import io
 import json
+import math
+import re
+import tempfile
 from werkzeug.utils import secure_filename
 import pandas as pd
 
-from hed.models import Sidecar, TabularInput
+from hed.models import DefMapper, OnsetMapper, Sidecar, TabularInput, TagExpressionParser
 from hed import schema as hedschema
-from hed.errors import get_printable_issue_string, HedFileError
-from hed.validator import HedValidator
+from hed.errors import ErrorContext, ErrorHandler, get_printable_issue_string, HedFileError
 from constants import base_constants
 from columns import create_column_selections, create_columns_included
 from hed.util import generate_filename
-from hed.tools import BidsTabularSummary, assemble_hed, generate_sidecar_entry, search_tabular
+from hed.tools import BidsTabularSummary, assemble_hed, generate_sidecar_entry, get_assembled_strings
+from events_index import EventsIndex
+from lru_cache import LruCache
+from process_pool import SchemaProcessPool, validate_events_chunk, validate_rows
+from schema_loader import get_content_hash, get_schema_hash, get_validator
+from sidecar import get_sidecar_issues
 from web_util import form_has_option, get_hed_schema_from_pull_down
 
 app_config = current_app.config
+process_pool = SchemaProcessPool(max_workers=app_config.get('EVENTS_PROCESS_POOL_SIZE', None),
+                                 start_method=app_config.get('PROCESS_POOL_START_METHOD', None),
+                                 executable=app_config.get('PROCESS_POOL_EXECUTABLE', None))
+query_cache = LruCache(max_entries=app_config.get('QUERY_CACHE_SIZE', 256))
+assembly_cache = LruCache(max_entries=app_config.get('EVENTS_ASSEMBLY_CACHE_SIZE', 16),
+                          max_bytes=app_config.get('EVENTS_ASSEMBLY_CACHE_BYTES', 64 * 1024 * 1024))
+
+TEMPORAL_TAG_PATTERN = re.compile(r'(?:^|[,(/])\s*(?:onset|offset)\s*(?:[,)]|$)', re.IGNORECASE)
+DEFINITION_TAG_PATTERN = re.compile(r'(?:^|[,(/])\s*definition\s*/', re.IGNORECASE)
+ASSEMBLED_TAG_BYTES = 350  # Approximate memory of a tag of an assembled string with its share of groups and text.
 
 
 def get_events_form_input(request):
@@ -33,8 +51,13 @@ def get_events_form_input(request):
                  base_constants.CHECK_FOR_WARNINGS: form_has_option(request, base_constants.CHECK_FOR_WARNINGS, 'on'),
                  base_constants.EXPAND_DEFS: form_has_option(request, base_constants.EXPAND_DEFS, 'on'),
                  base_constants.COLUMNS_SELECTED: create_column_selections(request.form),
-                 base_constants.COLUMNS_INCLUDED: create_columns_included(request.form)
+                 base_constants.COLUMNS_INCLUDED: create_columns_included(request.form),
+                 base_constants.UNIQUE_ROWS: form_has_option(request, base_constants.UNIQUE_ROWS, 'on'),
+                 base_constants.PARALLEL: form_has_option(request, base_constants.PARALLEL, 'on'),
+                 base_constants.STREAM: form_has_option(request, base_constants.STREAM, 'on')
                  }
+    if arguments[base_constants.COMMAND] != base_constants.COMMAND_VALIDATE:
+        arguments[base_constants.STREAM] = False
     if arguments[base_constants.COMMAND] == base_constants.COMMAND_ASSEMBLE:
         arguments[base_constants.COLUMNS_INCLUDED] = ['onset']   # TODO  add user interface option to choose columns.
     if arguments[base_constants.COMMAND] != base_constants.COMMAND_GENERATE_SIDECAR:
@@ -44,7 +67,14 @@ def get_events_form_input(request):
         f = request.files[base_constants.JSON_FILE]
         json_sidecar = Sidecar(file=f, name=secure_filename(f.filename))
     arguments[base_constants.JSON_SIDECAR] = json_sidecar
-    if base_constants.EVENTS_FILE in request.files:
+    if base_constants.EVENTS_FILE in request.files and arguments[base_constants.STREAM]:
+        f = request.files[base_constants.EVENTS_FILE]
+        events_file = tempfile.TemporaryFile()   # The upload is closed with the request before the stream is read.
+        f.save(events_file)
+        events_file.seek(0)
+        arguments[base_constants.EVENTS_FILE] = events_file
+        arguments[base_constants.EVENTS_DISPLAY_NAME] = secure_filename(f.filename)
+    elif base_constants.EVENTS_FILE in request.files:
         f = request.files[base_constants.EVENTS_FILE]
         arguments[base_constants.EVENTS] = \
             TabularInput(file=f, sidecar=arguments.get(base_constants.JSON_SIDECAR, None),
@@ -78,9 +108,14 @@ def process(arguments):
     if not events or not isinstance(events, TabularInput):
         raise HedFileError('InvalidEventsFile', "An events file was given but could not be processed", "")
     if command == base_constants.COMMAND_VALIDATE:
-        results = validate(hed_schema, events, sidecar, arguments.get(base_constants.CHECK_FOR_WARNINGS, False))
+        results = validate(hed_schema, events, sidecar, arguments.get(base_constants.CHECK_FOR_WARNINGS, False),
+                           unique_rows=arguments.get(base_constants.UNIQUE_ROWS, False),
+                           parallel=arguments.get(base_constants.PARALLEL, False))
+    elif command == base_constants.COMMAND_SEARCH and arguments.get(base_constants.QUERY_LIST, None):
+        results = search_multiple(hed_schema, events, arguments[base_constants.QUERY_LIST],
+                                  columns_included=columns_included, sidecar=sidecar)
     elif command == base_constants.COMMAND_SEARCH:
-        results = search(hed_schema, events, query, columns_included=columns_included)
+        results = search(hed_schema, events, query, columns_included=columns_included, sidecar=sidecar)
     elif command == base_constants.COMMAND_ASSEMBLE:
         results = assemble(hed_schema, events,
                            arguments.get(base_constants.COLUMNS_INCLUDED, None),
@@ -92,6 +127,56 @@ def process(arguments):
     return results
 
 
+def process_stream(arguments):
+    """ Check the arguments of an events validation request and return a generator of its results.
+
+    Args:
+        arguments (dict): A dictionary with the input arguments from the event form or service request.
+            The events file is an unread tsv file object in EVENTS_FILE with its name in EVENTS_DISPLAY_NAME.
+
+    Returns:
+        generator: A generator of the results of each chunk of rows followed by a summary (see generate_results).
+
+    Raises:
+        HedFileError:  If the command is not validate or the input arguments were not valid.
+
+    Notes:
+        The arguments are checked before the generator is returned, so bad requests raise before any results are sent.
+        The events file is closed when the generator finishes or is closed.
+
+    """
+    hed_schema = arguments.get('schema', None)
+    if not hed_schema or not isinstance(hed_schema, hedschema.hed_schema.HedSchema):
+        raise HedFileError('BadHedSchema', "Please provide a valid HedSchema for event processing", "")
+    command = arguments.get(base_constants.COMMAND, None)
+    if command != base_constants.COMMAND_VALIDATE:
+        raise HedFileError('UnknownEventsProcessingMethod', f'Command {command} cannot be streamed', '')
+    events_file = arguments.get(base_constants.EVENTS_FILE, None)
+    if not events_file:
+        raise HedFileError('InvalidEventsFile', "An events file was given but could not be processed", "")
+    results = generate_results(hed_schema, events_file, arguments.get(base_constants.JSON_SIDECAR, None),
+                               name=arguments.get(base_constants.EVENTS_DISPLAY_NAME, 'Events'),
+                               check_for_warnings=arguments.get(base_constants.CHECK_FOR_WARNINGS, False))
+    return generate_and_close(results, events_file)
+
+
+def generate_and_close(results, events_file):
+    """ Yield the results of a generator and close the events file it reads when it finishes or is closed.
+
+    Args:
+        results (generator): The generator of the results.
+        events_file (file like): The events file read by results.
+
+    Yields:
+        dict: The results.
+
+    """
+    try:
+        yield from results
+    finally:
+        events_file.close()
+
+
 def assemble(hed_schema, events, columns_included=None, expand_defs=True):
     """ Create a tabular file with the first column, specified additional columns and a HED column.
 
@@ -152,7 +237,7 @@ def generate_sidecar(events, columns_selected):
             'msg': 'JSON sidecar generation from event file complete'}
 
 
-def search(hed_schema, events, query, columns_included=None):
+def search(hed_schema, events, query, columns_included=None, sidecar=None):
     """ Create a three-column tsv file with event number, matched string, and assembled strings for matched events.
 
     Args:
@@ -160,20 +245,26 @@ def search(hed_schema, events, query, columns_included=None):
         events (EventsInput):     An events input object.
         query (str):              A string containing the query.
         columns_included (list):  A list of column names of columns to include.
+        sidecar (Sidecar or None): The sidecar of the events input object, which identifies its assembled strings.
 
     Returns:
         dict: A dictionary pointing to results or errors.
 
+    Notes:
+        The validation results, assembled strings and tag index of the events and the parsed query are cached,
+        so repeating a search on the same events file only evaluates the query on the index.
+
     """
     schema_version = hed_schema.header_attributes.get('version', 'Unknown version')
-    results = validate(hed_schema, events)
+    results, hed_list, index = get_assembled_events(hed_schema, events, sidecar)
     if results['data']:
         return results
     results = validate_query(hed_schema, query)
     if results['data']:
         return results
 
-    df = search_tabular(events, hed_schema, query, columns_included=columns_included)
+    df = search_assembled(events, hed_list, compile_query(hed_schema, query)[0], columns_included=columns_included,
+                          index=index)
     if isinstance(df, pd.DataFrame):
         csv_string = df.to_csv(None, sep='\t', index=False, header=True)
         msg = f"Events file query {query} satisfied by {len(df)} out of {len(events.dataframe)} events."
@@ -188,7 +279,136 @@ def search(hed_schema, events, query, columns_included=None):
             'schema_version': schema_version, 'msg_category': 'success', 'msg': msg}
 
 
-def validate(hed_schema, events, sidecar=None, check_for_warnings=False):
+def search_multiple(hed_schema, events, query_list, columns_included=None, sidecar=None):
+    """ Create a tsv file with a column for each query indicating which events satisfy it.
+
+    Args:
+        hed_schema (HedSchema or HedSchemaGroup): A HED schema or HED schema group.
+        events (EventsInput):     An events input object.
+        query_list (list):        A list of strings containing the queries.
+        columns_included (list):  A list of column names of columns to include.
+        sidecar (Sidecar or None): The sidecar of the events input object, which identifies its assembled strings.
+
+    Returns:
+        dict: A dictionary pointing to results or errors.
+
+    Notes:
+        The events are validated, assembled and indexed once and every query is evaluated on the same index.
+        The tsv has a row_number column, the included columns and a column named by each query with 1 for
+        the events that satisfy the query and 0 for the others.
+
+    """
+    schema_version = hed_schema.header_attributes.get('version', 'Unknown version')
+    results, hed_list, index = get_assembled_events(hed_schema, events, sidecar)
+    if results['data']:
+        return results
+    issues = [f"{query}: {issue}" for query in query_list for issue in get_query_issues(hed_schema, query)]
+    if issues:
+        file_name = generate_filename('query_list', name_suffix='_validation_errors', extension='.txt')
+        return {base_constants.COMMAND: base_constants.COMMAND_VALIDATE,
+                base_constants.COMMAND_TARGET: 'query',
+                'data': '\n'.join(issues), "output_display_name": file_name,
+                base_constants.SCHEMA_VERSION: schema_version, "msg_category": "warning",
+                'msg': "Query list had validation errors"}
+
+    matches = []
+    for query in query_list:
+        query_matches = [0] * len(hed_list)
+        for row in index.search(compile_query(hed_schema, query)[0], hed_list):
+            query_matches[row] = 1
+        matches.append(query_matches)
+    eligible_columns = [column for column in columns_included or [] if column in events.dataframe.columns]
+    df = events.dataframe[eligible_columns].reset_index(drop=True)
+    df.insert(0, 'row_number', range(len(hed_list)))
+    for query, query_matches in zip(query_list, matches):
+        df[query] = query_matches
+    counts = ', '.join(f"{query} by {sum(query_matches)}" for query, query_matches in zip(query_list, matches))
+    display_name = events.name
+    file_name = generate_filename(display_name, name_suffix='_query', extension='.tsv')
+    return {base_constants.COMMAND: base_constants.COMMAND_SEARCH,
+            base_constants.COMMAND_TARGET: 'events',
+            'data': df.to_csv(None, sep='\t', index=False, header=True), 'output_display_name': file_name,
+            'schema_version': schema_version, 'msg_category': 'success',
+            'msg': f"Events file queries satisfied out of {len(hed_list)} events: {counts}."}
+
+
+def get_assembled_events(hed_schema, events, sidecar=None):
+    """ Return the validation results of an events input object and its assembled HED strings and tag index.
+
+    Args:
+        hed_schema (HedSchema or HedSchemaGroup): A HED schema or HED schema group.
+        events (TabularInput): The events input object.
+        sidecar (Sidecar or None): The sidecar of the events input object.
+
+    Returns:
+        dict: The validation results of the events in standard format.
+        list or None: The assembled HedString of each row with definitions expanded, or None if the events had
+                      validation errors. The list is shared and must not be modified.
+        EventsIndex or None: The tag index of the assembled strings, or None if the events had validation errors.
+
+    Notes:
+        Results are cached by the schema content hash, the SHA-256 hashes of the events and sidecar contents and
+        the names of the events and sidecar, since the names appear in the messages and issues of the results.
+        The index is built when the events are first assembled, so later searches of the events only use the index.
+        The cache is charged an approximate size of ASSEMBLED_TAG_BYTES per tag of the assembled strings, which
+        holds for the parsed strings of typical events files, plus the index bitsets and any validation errors.
+
+    """
+    schema_hash = get_schema_hash(hed_schema)
+    key = None
+    if schema_hash:
+        events_string = events.dataframe.to_csv(sep='\t', index=False)
+        sidecar_string = sidecar.get_as_json_string() if sidecar else ''
+        key = (schema_hash, get_content_hash(events_string), get_content_hash(sidecar_string), events.name,
+               sidecar.name if sidecar else None)
+        cached = assembly_cache.get(key)
+        if cached is not None:
+            return cached
+    results = validate(hed_schema, events)
+    hed_list = None
+    index = None
+    if not results['data']:
+        hed_list = get_assembled_strings(events, hed_schema=hed_schema, expand_defs=True)[0]
+        index = EventsIndex(hed_list)
+    if key:
+        size = len(results['data'] or '')
+        if index is not None:
+            size += ASSEMBLED_TAG_BYTES * sum(len(hed_string.get_all_tags()) for hed_string in hed_list)
+            size += len(index) * (index.row_count // 8 + 1)
+        assembly_cache.put(key, (results, hed_list, index), size=size)
+    return results, hed_list, index
+
+
+def search_assembled(events, hed_list, expression, columns_included=None, index=None):
+    """ Return a dataframe with the rows of an events input object whose assembled strings satisfy a query.
+
+    Args:
+        events (TabularInput): The events input object.
+        hed_list (list): The assembled HedString of each row of events.
+        expression (TagExpressionParser): The parsed query.
+        columns_included (list or None):  List of names of columns to include.
+        index (EventsIndex or None): The tag index of hed_list, which is used to find the rows if given.
+
+    Returns:
+        DataFrame or None: A DataFrame with the results of the query or None if no events satisfied the query.
+
+    Notes:
+        The dataframe has the same form as the one returned by search_tabular of hedtools.
+
+    """
+    if index is not None:
+        row_numbers = index.search(expression, hed_list)
+    else:
+        row_numbers = [row for row, hed_string in enumerate(hed_list) if expression.search_hed_string(hed_string)]
+    if not row_numbers:
+        return None
+    eligible_columns = [column for column in columns_included or [] if column in events.dataframe.columns]
+    if not eligible_columns:
+        return pd.DataFrame({'row_number': row_numbers, 'HED_assembled': [hed_list[row] for row in row_numbers]})
+    return events.dataframe.iloc[row_numbers][eligible_columns].reset_index()
+
+
+def validate(hed_schema, events, sidecar=None, check_for_warnings=False, unique_rows=False, parallel=False):
     """ Validate a tabular input object and return the results.
 
     Args:
@@ -196,22 +416,35 @@ def validate(hed_schema, events, sidecar=None, check_for_warnings=False):
         events (TabularInput): Tabular input object representing a file to be validated.
         sidecar (Sidecar or None): The Sidecar associated with this tabular data file.
         check_for_warnings (bool): If true, validation should include warnings.
+        unique_rows (bool): If true, validate each distinct row once (see validate_unique_rows).
+        parallel (bool): If true, validate the rows in chunks on the process pool (see validate_parallel).
 
     Returns:
         dict: A dictionary containing results of validation in standard format.
 
+    Notes:
+        The parallel option only uses the process pool for files with at least EVENTS_PARALLEL_THRESHOLD rows
+        when the pool has more than one worker and the schema has a content hash.
+
     """
 
     schema_version = hed_schema.header_attributes.get('version', 'Unknown version')
     display_name = events.name
-    validator = HedValidator(hed_schema=hed_schema)
+    validator = get_validator(hed_schema)
     issue_str = ''
     if sidecar:
-        issues = sidecar.validate_entries(validator, check_for_warnings=check_for_warnings)
+        issues = get_sidecar_issues(hed_schema, sidecar, check_for_warnings=check_for_warnings)
         if issues:
             issue_str = issue_str + get_printable_issue_string(issues, title="Sidecar definition errors:")
     if not issue_str:
-        issues = events.validate_file(validator, check_for_warnings=check_for_warnings)
+        threshold = app_config.get('EVENTS_PARALLEL_THRESHOLD', None) or 0
+        if unique_rows:
+            issues = validate_unique_rows(validator, events, sidecar, check_for_warnings=check_for_warnings)
+        elif parallel and len(events.dataframe) >= threshold and process_pool.max_workers > 1 and \
+                get_schema_hash(hed_schema):
+            issues = validate_parallel(hed_schema, events, sidecar, check_for_warnings=check_for_warnings)
+        else:
+            issues = events.validate_file(validator, check_for_warnings=check_for_warnings)
         if issues:
             issue_str = get_printable_issue_string(issues, title="Event file errors:")
 
@@ -229,11 +462,294 @@ def validate(hed_schema, events, sidecar=None, check_for_warnings=False):
                 'msg': f"Events file {display_name} had no validation errors"}
 
 
+def generate_results(hed_schema, events_file, sidecar=None, name='Events', check_for_warnings=False):
+    """ Validate an events file a chunk of rows at a time, yielding the issues of each chunk when it is validated.
+
+    Args:
+        hed_schema (HedSchema or HedSchemaGroup): Schema or schemas used for validation.
+        events_file (str or file like): The path or file object of the events tsv file.
+        sidecar (Sidecar or None): The Sidecar associated with this tabular data file.
+        name (str): The name of the events file used in messages.
+        check_for_warnings (bool): If true, validation should include warnings.
+
+    Yields:
+        dict: For each chunk, its start row, number of rows, msg_category and issues as a printable string.
+              The last dictionary is a summary in standard results format with the row and issue counts.
+              If the sidecar has issues, they are yielded instead of the chunks.
+
+    """
+
+    schema_version = hed_schema.header_attributes.get('version', 'Unknown version')
+    issue_count = 0
+    row_count = 0
+    issues = get_sidecar_issues(hed_schema, sidecar, check_for_warnings=check_for_warnings) if sidecar else []
+    if issues:
+        issue_count = len(issues)
+        yield {'start': 0, 'rows': 0, 'msg_category': 'warning',
+               'issues': get_printable_issue_string(issues, title="Sidecar definition errors:")}
+    else:
+        chunks = validate_chunks(get_validator(hed_schema), events_file, sidecar, name=name,
+                                 check_for_warnings=check_for_warnings,
+                                 chunk_size=app_config.get('EVENTS_CHUNK_SIZE', 10000))
+        for start, rows, issues in chunks:
+            issue_count += len(issues)
+            row_count += rows
+            yield {'start': start, 'rows': rows, 'msg_category': 'warning' if issues else 'success',
+                   'issues': get_printable_issue_string(issues, title="Event file errors:") if issues else ''}
+    yield {base_constants.COMMAND: base_constants.COMMAND_VALIDATE, base_constants.COMMAND_TARGET: 'events',
+           base_constants.SCHEMA_VERSION: schema_version, 'msg_category': 'warning' if issue_count else 'success',
+           'msg': f"Events file {name} had validation errors" if issue_count else
+           f"Events file {name} had no validation errors",
+           base_constants.ROW_COUNT: row_count, base_constants.ISSUE_COUNT: issue_count}
+
+
+def validate_chunks(validator, events_file, sidecar=None, name='Events', check_for_warnings=False, chunk_size=10000):
+    """ Validate an events file without loading all of it, reading and validating chunk_size rows at a time.
+
+    Args:
+        validator (HedValidator): The validator used to validate the rows.
+        events_file (str or file like): The path or file object of the events tsv file.
+        sidecar (Sidecar or None): The Sidecar associated with this tabular data file.
+        name (str): The name of the events file used in the issues.
+        check_for_warnings (bool): If true, validation should include warnings.
+        chunk_size (int): The number of rows read and validated at a time.
+
+    Yields:
+        tuple: The 0-based position of the first row of a chunk, its number of rows and its issues.
+               The row numbers of the issues are positions in the whole file.
+
+    Notes:
+        The definitions and the onsets found in earlier chunks are used to validate later chunks,
+        but a Def cannot refer to a Definition in the HED column of a later chunk.
+        Issues that are not about a particular row, such as missing columns, are reported once.
+
+    """
+
+    def_mapper = DefMapper(sidecar.get_def_dicts() if sidecar else [])
+    hed_ops = [validator, def_mapper, OnsetMapper(def_mapper)]
+    file_issues = set()
+    start = 0
+    for df in pd.read_csv(events_file, delimiter='\t', dtype=str, keep_default_na=False, na_values=None,
+                          chunksize=chunk_size):
+        chunk = TabularInput(file=io.StringIO(df.to_csv(sep='\t', index=False)), sidecar=sidecar, name=name)
+        def_mapper.add_definitions(chunk.file_def_dict)
+        issues = []
+        for issue in chunk.validate_file(hed_ops, check_for_warnings=check_for_warnings):
+            if ErrorContext.ROW in issue:
+                row, flag = issue[ErrorContext.ROW]
+                issues.append(dict(issue, **{ErrorContext.ROW: (start + row, flag)}))
+            elif (issue['code'], issue['message']) not in file_issues:
+                file_issues.add((issue['code'], issue['message']))
+                issues.append(issue)
+        yield start, len(df), issues
+        start += len(df)
+
+
+def get_sidecar_hed(sidecar):
+    """ Return the HED of each column of a sidecar that has HED.
+
+    Args:
+        sidecar (Sidecar or None): The sidecar.
+
+    Returns:
+        dict: The HED string of each value column or the dictionary of HED strings of each categorical column.
+
+    """
+    if not sidecar:
+        return {}
+    sidecar_hed = {}
+    for column, entry in json.loads(sidecar.get_as_json_string()).items():
+        if isinstance(entry, dict) and entry.get('HED'):
+            sidecar_hed[column] = entry['HED']
+    return sidecar_hed
+
+
+def get_temporal_rows(events, sidecar=None):
+    """ Return which rows of a tabular input object could have Onset or Offset tags.
+
+    Args:
+        events (TabularInput): Tabular input object representing an events file.
+        sidecar (Sidecar or None): The Sidecar associated with this tabular data file.
+
+    Returns:
+        Series: A boolean for each row of the events dataframe.
+
+    Notes:
+        The validity of these rows depends on the rows before them, so they must be validated in order.
+
+    """
+    df = events.dataframe
+    temporal = pd.Series(False, index=df.index)
+    for column, hed in get_sidecar_hed(sidecar).items():
+        if column not in df.columns:
+            continue
+        elif isinstance(hed, dict):
+            values = [value for value, hed_string in hed.items() if TEMPORAL_TAG_PATTERN.search(str(hed_string))]
+            temporal |= df[column].isin(values)
+        elif TEMPORAL_TAG_PATTERN.search(str(hed)):
+            temporal[:] = True
+    if events.HED_COLUMN_NAME in df.columns:
+        temporal |= df[events.HED_COLUMN_NAME].str.contains(TEMPORAL_TAG_PATTERN)
+    return temporal
+
+
+def validate_parallel(hed_schema, events, sidecar=None, check_for_warnings=False):
+    """ Validate the rows of a tabular input object in chunks on the process pool.
+
+    Args:
+        hed_schema (HedSchema): The schema used for validation, which must have a content hash.
+        events (TabularInput): Tabular input object representing a file to be validated.
+        sidecar (Sidecar or None): The Sidecar associated with this tabular data file.
+        check_for_warnings (bool): If true, validation should include warnings.
+
+    Returns:
+        list: The issues in the order validate_file reports them.
+
+    Notes:
+        The workers hold the schema and sidecar, and each chunk carries the definitions of the whole file.
+        Rows that could have Onset or Offset are left out of the chunks and validated here in order, with
+        their issues merged with the issues of the chunks by row.
+
+    """
+
+    df = events.dataframe
+    error_handler = ErrorHandler()
+    error_handler.push_error_context(ErrorContext.FILE_NAME, events.name)
+    file_issues = events.get_def_and_mapper_issues(error_handler, check_for_warnings=check_for_warnings)
+    error_handler.pop_error_context()
+    temporal = get_temporal_rows(events, sidecar).to_numpy()
+    rows = [row for row in range(len(df)) if not temporal[row]]
+    row_issues = []
+    if rows:
+        chunk_size = min(app_config.get('EVENTS_CHUNK_SIZE', 10000), math.ceil(len(rows) / process_pool.max_workers))
+        chunks = [(df.iloc[rows[start:start + chunk_size]].to_csv(sep='\t', index=False),
+                   rows[start:start + chunk_size], events.file_def_dict, check_for_warnings, events.name)
+                  for start in range(0, len(rows), chunk_size)]
+        sidecar_string = sidecar.get_as_json_string() if sidecar else ''
+        data_key = (get_schema_hash(hed_schema), get_content_hash(sidecar_string))
+        chunk_issues = process_pool.map_chunks(validate_events_chunk, chunks, data_key,
+                                               {'schema': hed_schema, 'sidecar_string': sidecar_string})
+        row_issues = [issue for issues in chunk_issues for issue in issues]
+    temporal_rows = [row for row in range(len(df)) if temporal[row]]
+    if temporal_rows:
+        row_issues += validate_rows(get_validator(hed_schema), df.iloc[temporal_rows].to_csv(sep='\t', index=False),
+                                    temporal_rows, sidecar=sidecar, definitions=events.file_def_dict,
+                                    check_for_warnings=check_for_warnings, name=events.name, check_onsets=True)
+    row_issues.sort(key=lambda issue: issue[ErrorContext.ROW][0])
+    return file_issues + row_issues
+
+
+def validate_unique_rows(validator, events, sidecar=None, check_for_warnings=False):
+    """ Validate the rows of a tabular input object, validating each distinct row only once.
+
+    Args:
+        validator (HedValidator): The validator used to validate the rows.
+        events (TabularInput): Tabular input object representing a file to be validated.
+        sidecar (Sidecar or None): The Sidecar associated with this tabular data file.
+        check_for_warnings (bool): If true, validation should include warnings.
+
+    Returns:
+        list: The issues in the order validate_file reports them, each row issue reported for each row it applies to.
+
+    Notes:
+        Rows with the same values in all of the HED columns expand to the same HED string, so only the first
+        row of each combination is validated. Rows whose expansion may contain Onset or Offset, and rows
+        with a Definition in the HED column, are always validated in their original order, since their
+        validity depends on the other rows. Definitions in the sidecar are gathered before any row is validated.
+
+    """
+
+    df = events.dataframe
+    sidecar_hed = get_sidecar_hed(sidecar)
+    hed_columns = [column for column in df.columns if column == events.HED_COLUMN_NAME or column in sidecar_hed]
+    special = get_temporal_rows(events, sidecar)
+    if events.HED_COLUMN_NAME in df.columns:
+        special |= df[events.HED_COLUMN_NAME].str.contains(DEFINITION_TAG_PATTERN)
+    if not hed_columns or special.all():
+        return events.validate_file(validator, check_for_warnings=check_for_warnings)
+
+    group_ids = df.groupby(hed_columns, sort=False, dropna=False).ngroup().to_numpy()
+    is_first = ~pd.Series(group_ids).duplicated().to_numpy()
+    kept = [row for row in range(len(df)) if special.iat[row] or is_first[row]]
+    if len(kept) == len(df):
+        return events.validate_file(validator, check_for_warnings=check_for_warnings)
+    members = {}
+    for row, group_id in enumerate(group_ids):
+        if not special.iat[row]:
+            members.setdefault(group_id, []).append(row)
+
+    reduced = TabularInput(file=io.StringIO(df.iloc[kept].to_csv(sep='\t', index=False)), sidecar=sidecar,
+                           name=events.name)
+    file_issues = []
+    row_issues = []
+    for issue in reduced.validate_file(validator, check_for_warnings=check_for_warnings):
+        if ErrorContext.ROW not in issue:
+            file_issues.append(issue)
+            continue
+        reduced_row, flag = issue[ErrorContext.ROW]
+        row = kept[reduced_row]
+        rows = [row] if special.iat[row] else members[group_ids[row]]
+        row_issues.extend(dict(issue, **{ErrorContext.ROW: (member, flag)}) for member in rows)
+    row_issues.sort(key=lambda issue: issue[ErrorContext.ROW][0])
+    return file_issues + row_issues
+
+
+def compile_query(hed_schema, query):
+    """ Parse a query for searching assembled strings and check its terms against the schema.
+
+    Args:
+        hed_schema (HedSchema): The schema whose tag terms the query searches for.
+        query (str): A str representing the query.
+
+    Returns:
+        TagExpressionParser or None: The parsed query, or None if it could not be parsed.
+        list: A message for each problem with the query.
+
+    Notes:
+        Results are cached by schema content hash and query, so a query is parsed once per schema.
+        Each search term is a single term of the long form of a tag, such as Sensory-event.
+
+    """
+    schema_hash = get_schema_hash(hed_schema)
+    key = (schema_hash, query)
+    compiled = query_cache.get(key) if schema_hash else None
+    if compiled is not None:
+        return compiled
+    try:
+        expression = TagExpressionParser(query)
+    except Exception as ex:
+        compiled = (None, [f"Query could not be parsed: {ex}"])
+    else:
+        schema_terms = {term for entry in hed_schema.all_tags.values() for term in entry.tag_terms}
+        compiled = (expression, [f"Query term '{token.text}' is not a term of a tag in the schema"
+                                 for token in expression.tokens
+                                 if token.kind == token.Tag and token.text not in schema_terms])
+    if schema_hash:
+        query_cache.put(key, compiled, size=len(query))
+    return compiled
+
+
+def get_query_issues(hed_schema, query):
+    """ Return a message for each problem with a query.
+
+    Args:
+        hed_schema (HedSchema): Schema used to validate the query.
+        query (str):  A str representing the query.
+
+    Returns:
+        list: The messages, which are empty if the query is valid.
+
+    """
+    if not query:
+        return ["Empty query could not be processed."]
+    return compile_query(hed_schema, query)[1]
+
+
 def validate_query(hed_schema, query):
     """ Validate the query and return the results.
 
     Args:
-        hed_schema (HedSchema, or HedSchemaGroup): Schema or schemas used to validate the query.
+        hed_schema (HedSchema): Schema used to validate the query.
         query (str):  A str representing the query.
 
     Returns
@@ -242,18 +758,17 @@ def validate_query(hed_schema, query):
     """
 
     schema_version = hed_schema.header_attributes.get('version', 'Unknown version')
-    if not query:
-        display_name = 'empty_query'
-        issue_str = "Empty query could not be processed."
+    display_name = 'query' if query else 'empty_query'
+    issue_str = '\n'.join(get_query_issues(hed_schema, query))
+    if issue_str:
         file_name = generate_filename(display_name, name_suffix='_validation_errors', extension='.txt')
         return {base_constants.COMMAND: base_constants.COMMAND_VALIDATE,
                 base_constants.COMMAND_TARGET: 'query',
                 'data': issue_str, "output_display_name": file_name,
                 base_constants.SCHEMA_VERSION: schema_version, "msg_category": "warning",
-                'msg': f"Query {display_name} had validation errors"}
+                'msg': f"Query {query or display_name} had validation errors"}
     else:
-        display_name = 'Nice_query'
         return {base_constants.COMMAND: base_constants.COMMAND_VALIDATE,
                 base_constants.COMMAND_TARGET: 'query', 'data': '',
                 base_constants.SCHEMA_VERSION: schema_version, 'msg_category': 'success',
-                'msg': f"Events file {display_name} had no validation errors"}
+                'msg': f"Query {query} had no validation errors"}
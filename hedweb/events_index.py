@@ -0,0 +1,78 @@
+from hed.models.expression_parser import Expression, ExpressionAnd, ExpressionLogicalGroup, ExpressionNegation, \
+    ExpressionOr
+
+
+class EventsIndex:
+    """ An inverted index from the tag terms of the assembled strings of an events file to bitsets of their rows.
+
+    The terms of a tag are the nodes of its long form, so each tag is indexed under itself and all of its
+    ancestors in the schema, which is how query terms are matched.
+    """
+
+    def __init__(self, hed_list):
+        """ Build the index of the assembled strings of an events file.
+
+        Args:
+            hed_list (list): The assembled HedString of each row, converted with the schema.
+
+        """
+        term_rows = {}
+        for row, hed_string in enumerate(hed_list):
+            for term in {term for tag in hed_string.get_all_tags() for term in tag.tag_terms}:
+                term_rows.setdefault(term, []).append(row)
+        self.row_count = len(hed_list)
+        self._bits = {term: self._get_bits(rows) for term, rows in term_rows.items()}
+
+    def __len__(self):
+        return len(self._bits)
+
+    def search(self, expression, hed_list):
+        """ Return the rows whose assembled strings satisfy a parsed query.
+
+        Args:
+            expression (TagExpressionParser): The parsed query.
+            hed_list (list): The assembled HedString of each row that the index was built from.
+
+        Returns:
+            list: The 0-based rows that satisfy the query in increasing order.
+
+        Notes:
+            Terms combined with and, or and parentheses are evaluated on the bitsets alone. For other queries
+            the bitsets give the candidate rows, and only those are searched with the expression.
+
+        """
+        bits, exact = self._evaluate(expression.tree)
+        rows = self._get_rows(bits)
+        if exact:
+            return rows
+        return [row for row in rows if expression.search_hed_string(hed_list[row])]
+
+    def _evaluate(self, node):
+        """ Return the bitset of the rows that can satisfy node and whether exactly those rows satisfy it. """
+        if isinstance(node, ExpressionAnd):
+            left_bits, left_exact = self._evaluate(node.left)
+            right_bits, right_exact = self._evaluate(node.right)
+            return left_bits & right_bits, left_exact and right_exact
+        elif isinstance(node, ExpressionOr):
+            left_bits, left_exact = self._evaluate(node.left)
+            right_bits, right_exact = self._evaluate(node.right)
+            return left_bits | right_bits, left_exact and right_exact
+        elif isinstance(node, ExpressionLogicalGroup):
+            return self._evaluate(node.right)
+        elif isinstance(node, ExpressionNegation):
+            return (1 << self.row_count) - 1, False
+        elif type(node) is Expression:
+            return self._bits.get(node.token.text, 0), True
+        return self._evaluate(node.right)[0], False
+
+    @staticmethod
+    def _get_bits(rows):
+        bitmap = bytearray(rows[-1] // 8 + 1)
+        for row in rows:
+            bitmap[row >> 3] |= 1 << (row & 7)
+        return int.from_bytes(bitmap, 'little')
+
+    @staticmethod
+    def _get_rows(bits):
+        bitmap = bits.to_bytes((bits.bit_length() + 7) // 8, 'little')
+        return [pos * 8 + bit for pos, byte in enumerate(bitmap) if byte for bit in range(8) if byte >> bit & 1]
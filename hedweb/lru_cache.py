@@ -0,0 +1,148 @@
+import threading
+from collections import OrderedDict
+
+
+class LruCache:
+    """ A bounded, thread-safe least-recently-used cache that keeps hit and miss counts. """
+
+    def __init__(self, max_entries=16, max_bytes=None, on_remove=None):
+        """ Construct an empty cache.
+
+        Args:
+            max_entries (int): Maximum number of entries kept before the least recently used one is evicted.
+            max_bytes (int or None): If given, the maximum total size of the entries as reported to put.
+            on_remove (func or None): If given, called with the key and value of each entry that is evicted,
+                                      replaced or removed, for example to release objects that depend on it.
+
+        """
+        if max_entries < 1:
+            raise ValueError("LruCache must be able to hold at least one entry")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.on_remove = on_remove
+        self.total_bytes = 0
+        self._entries = OrderedDict()
+        self._sizes = {}
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def get(self, key, default=None):
+        """ Return the value stored under key and mark it as most recently used.
+
+        Args:
+            key (hashable): The key of the entry to look up.
+            default (object): Value returned if key is not in the cache.
+
+        Returns:
+            object: The cached value or default if key is not cached.
+
+        """
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._entries[key]
+
+    def put(self, key, value, size=0):
+        """ Store value under key, evicting least recently used entries if the cache is full.
+
+        Args:
+            key (hashable): The key of the entry.
+            value (object): The value to store.
+            size (int): The number of bytes charged against max_bytes for this entry.
+
+        Returns:
+            bool: True if the value was stored, False if it is larger than the whole byte budget.
+
+        """
+        with self._lock:
+            if self.max_bytes is not None and size > self.max_bytes:
+                return False
+            self._remove_entry(key)
+            self._entries[key] = value
+            self._sizes[key] = size
+            self.total_bytes += size
+            while len(self._entries) > self.max_entries or \
+                    (self.max_bytes is not None and self.total_bytes > self.max_bytes):
+                oldest_key = next(iter(self._entries))
+                self._remove_entry(oldest_key)
+                self.evictions += 1
+            return True
+
+    def keys(self):
+        """ Return a list of the cached keys from least to most recently used. """
+        with self._lock:
+            return list(self._entries.keys())
+
+    def remove(self, key):
+        """ Remove the entry stored under key if there is one.
+
+        Args:
+            key (hashable): The key of the entry to remove.
+
+        Returns:
+            bool: True if an entry was removed.
+
+        """
+        with self._lock:
+            return self._remove_entry(key)
+
+    def remove_if(self, predicate):
+        """ Remove all entries whose key satisfies predicate.
+
+        Args:
+            predicate (func): A function taking a key and returning True if the entry should be removed.
+
+        Returns:
+            int: The number of entries removed.
+
+        """
+        with self._lock:
+            stale_keys = [key for key in self._entries if predicate(key)]
+            for key in stale_keys:
+                self._remove_entry(key)
+            return len(stale_keys)
+
+    def clear(self):
+        """ Remove all entries and reset the counters. """
+        with self._lock:
+            entries = list(self._entries.items())
+            self._entries.clear()
+            self._sizes.clear()
+            self.total_bytes = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+            if self.on_remove is not None:
+                for key, value in entries:
+                    self.on_remove(key, value)
+
+    def get_stats(self):
+        """ Return a dictionary with the current size and usage counters of the cache. """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {'entries': len(self._entries), 'max_entries': self.max_entries,
+                    'bytes': self.total_bytes, 'max_bytes': self.max_bytes,
+                    'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                    'hit_rate': self.hits / lookups if lookups else 0.0}
+
+    def _remove_entry(self, key):
+        if key not in self._entries:
+            return False
+        value = self._entries.pop(key)
+        self.total_bytes -= self._sizes.pop(key)
+        if self.on_remove is not None:
+            self.on_remove(key, value)
+        return True
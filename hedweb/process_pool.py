@@ -0,0 +1,267 @@
+import io
+import multiprocessing
+import pickle
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from hed.errors import ErrorContext
+from hed.models import DefMapper, OnsetMapper, Sidecar, TabularInput
+from hed.validator import HedValidator
+
+DEFAULT_START_METHOD = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+worker_data = {}
+
+
+class IssueHedString(str):
+    """ The text of the HED string in the context of a portable issue, which stands in for the parsed HedString. """
+
+    __slots__ = ()
+
+    def get_original_hed_string(self):
+        return str(self)
+
+
+def init_worker(data_bytes):
+    """ Initialize a worker process with the pickled objects that every task in the pool uses.
+
+    Args:
+        data_bytes (bytes): A pickled dictionary, for example with a schema under the key 'schema' and
+                            the JSON text of a sidecar under the key 'sidecar_string'.
+
+    """
+    worker_data.clear()
+    worker_data.update(pickle.loads(data_bytes))
+    if 'schema' in worker_data:
+        worker_data['validator'] = HedValidator(hed_schema=worker_data['schema'])
+    if worker_data.get('sidecar_string'):
+        worker_data['sidecar'] = Sidecar(file=io.StringIO(worker_data['sidecar_string']), name='Sidecar')
+
+
+def validate_strings(hed_validator, string_list, check_for_warnings=False, tag_form=None):
+    """ Validate HED strings and convert the valid ones in the same traversal.
+
+    Args:
+        hed_validator (HedValidator): The validator to use.
+        string_list (list): A list of HedString.
+        check_for_warnings (bool): If True, also report warnings.
+        tag_form (str or None): If given, the tag attribute (long_tag or short_tag) of the form to convert to.
+
+    Returns:
+        list: An (issues, converted_string) tuple for each string, where converted_string is None if
+              tag_form is None or the string had issues.
+
+    Notes:
+        Validation computes the canonical forms of the tags, so conversion only has to join them.
+
+    """
+    results = []
+    for hed_string_obj in string_list:
+        issues = hed_string_obj.validate(hed_validator, check_for_warnings=check_for_warnings)
+        converted_string = hed_string_obj.get_as_form(tag_form) if tag_form and not issues else None
+        results.append((issues, converted_string))
+    return results
+
+
+def validate_strings_chunk(chunk):
+    """ Validate and optionally convert a chunk of HED strings in a worker initialized with a schema.
+
+    Args:
+        chunk (tuple): (string_list, check_for_warnings, tag_form) as for validate_strings.
+
+    Returns:
+        list: An (issues, converted_string) tuple for each string in the chunk, in order, with the issues made
+              small enough to return from the worker.
+
+    """
+    string_list, check_for_warnings, tag_form = chunk
+    results = validate_strings(worker_data['validator'], string_list, check_for_warnings, tag_form)
+    return [([get_portable_issue(issue) for issue in issues], converted_string)
+            for issues, converted_string in results]
+
+
+def validate_rows(hed_validator, events_text, rows, sidecar=None, definitions=None, check_for_warnings=False,
+                  name=None, check_onsets=False):
+    """ Validate some of the rows of an events file and return their issues.
+
+    Args:
+        hed_validator (HedValidator): The validator to use.
+        events_text (str): The rows as a tsv string with a header line.
+        rows (list): The 0-based position in the whole events file of each row in events_text.
+        sidecar (Sidecar or None): The sidecar of the events file.
+        definitions (DefinitionDict or None): The definitions in the HED column of the whole events file.
+        check_for_warnings (bool): If True, also report warnings.
+        name (str or None): The name of the events file used in the issues.
+        check_onsets (bool): If True, check the Onset and Offset tags of the rows in order.
+
+    Returns:
+        list: The issues of the rows, with the row numbers of the whole file. Issues that are not about
+              a particular row, such as missing columns, are left out.
+
+    """
+    events = TabularInput(file=io.StringIO(events_text), sidecar=sidecar, name=name)
+    def_mapper = DefMapper((sidecar.get_def_dicts() if sidecar else []) + ([definitions] if definitions else []))
+    hed_ops = [hed_validator, def_mapper]
+    if check_onsets:
+        hed_ops.append(OnsetMapper(def_mapper))
+    issues = []
+    for issue in events.validate_file(hed_ops, check_for_warnings=check_for_warnings):
+        if ErrorContext.ROW in issue:
+            row, flag = issue[ErrorContext.ROW]
+            issues.append(dict(issue, **{ErrorContext.ROW: (rows[row], flag)}))
+    return issues
+
+
+def validate_events_chunk(chunk):
+    """ Validate a chunk of events file rows in a worker initialized with a schema and sidecar.
+
+    Args:
+        chunk (tuple): (events_text, rows, definitions, check_for_warnings, name) as for validate_rows.
+
+    Returns:
+        list: The issues of the rows in the chunk, made small enough to return from the worker.
+
+    """
+    events_text, rows, definitions, check_for_warnings, name = chunk
+    issues = validate_rows(worker_data['validator'], events_text, rows, sidecar=worker_data.get('sidecar'),
+                           definitions=definitions, check_for_warnings=check_for_warnings, name=name)
+    return [get_portable_issue(issue) for issue in issues]
+
+
+def get_portable_issue(issue):
+    """ Return a copy of an issue without references to parsed strings or the schema.
+
+    Args:
+        issue (dict): An issue from validation.
+
+    Returns:
+        dict: The issue with its source tag as a string and its HED string context as an IssueHedString.
+
+    Notes:
+        The tags and strings of an issue refer to their parsed string and the schema, which would otherwise be
+        pickled with each result and kept alive by caches of issues.
+
+    """
+    issue = dict(issue)
+    if issue.get('source_tag') is not None:
+        issue['source_tag'] = str(issue['source_tag'])
+    if ErrorContext.HED_STRING in issue:
+        hed_string, flag = issue[ErrorContext.HED_STRING]
+        issue[ErrorContext.HED_STRING] = (IssueHedString(hed_string.get_original_hed_string()), flag)
+    return issue
+
+
+def get_issues_size(issues):
+    """ Return the approximate number of bytes held by a list of portable issues.
+
+    Args:
+        issues (list): Issues returned by get_portable_issue.
+
+    Returns:
+        int: The sizes of the list, the issue dictionaries, their values and the items of their context tuples.
+
+    """
+    size = sys.getsizeof(issues)
+    for issue in issues:
+        size += sys.getsizeof(issue)
+        for value in issue.values():
+            size += sys.getsizeof(value)
+            if isinstance(value, tuple):
+                size += sum(sys.getsizeof(item) for item in value)
+    return size
+
+
+def split_chunks(items, chunk_size):
+    """ Return (start, chunk) pairs that split items into consecutive chunks.
+
+    Args:
+        items (list): The items to split.
+        chunk_size (int): The maximum number of items in a chunk.
+
+    Returns:
+        list: A list of (start, chunk) tuples where start is the 1-based position of the first item of chunk.
+
+    """
+    return [(start + 1, items[start:start + chunk_size]) for start in range(0, len(items), chunk_size)]
+
+
+class SchemaProcessPool:
+    """ A process pool whose workers are initialized with shared data such as a schema.
+
+    The pool is kept between requests and recreated only when it is asked to run with different data.
+    """
+
+    def __init__(self, max_workers=None, start_method=None, executable=None):
+        """ Construct a pool that starts its worker processes on first use.
+
+        Args:
+            max_workers (int or None): Number of worker processes. If None, the number of CPUs is used.
+            start_method (str or None): The multiprocessing start method. If None, forkserver is used where it is
+                                        available and spawn otherwise.
+            executable (str or None): The Python interpreter that starts the workers. If None, sys.executable
+                                      is used, which is not a Python interpreter under embedded mod_wsgi.
+                                      It is set with multiprocessing's set_executable, which applies to every
+                                      pool in the process.
+
+        Notes:
+            The pool is not started with fork by default because the web server process has other threads,
+            and a forked worker could inherit a lock held by one of them.
+
+        """
+        self.max_workers = max_workers or multiprocessing.cpu_count()
+        self.start_method = start_method or DEFAULT_START_METHOD
+        self.executable = executable
+        self._executor = None
+        self._data_key = None
+        self._lock = threading.Lock()
+
+    def map_chunks(self, func, chunks, data_key, data):
+        """ Run func on each chunk in the worker processes and return the results in chunk order.
+
+        Args:
+            func (func): A module-level function taking a chunk.
+            chunks (list): The chunks to process.
+            data_key (hashable): A key identifying data, such as a schema content hash.
+            data (dict): The objects the workers are initialized with if the pool does not already hold data_key.
+
+        Returns:
+            list: The result of func for each chunk, in the same order as chunks.
+
+        Raises:
+            BrokenProcessPool or OSError: If a worker could not be started or died. The pool is shut down so that
+                                          the next call starts new workers, and callers can fall back to working
+                                          in this process.
+
+        """
+        executor = None
+        try:
+            with self._lock:
+                if self._executor is None or self._data_key != data_key:
+                    self._shutdown_executor()
+                    mp_context = multiprocessing.get_context(self.start_method)
+                    if self.executable:
+                        mp_context.set_executable(self.executable)
+                    data_bytes = pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+                    self._executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=mp_context,
+                                                         initializer=init_worker, initargs=(data_bytes,))
+                    self._data_key = data_key
+                executor = self._executor
+                results = executor.map(func, chunks)
+            return list(results)
+        except (BrokenProcessPool, OSError):
+            with self._lock:
+                if self._executor is executor:
+                    self._shutdown_executor()
+            raise
+
+    def shutdown(self):
+        """ Stop the worker processes. The pool starts new workers if it is used again. """
+        with self._lock:
+            self._shutdown_executor()
+
+    def _shutdown_executor(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+        self._executor = None
+        self._data_key = None
@@ -1,18 +1,43 @@
-from flask import render_template, request, Blueprint, current_app
+from flask import render_template, request, Blueprint, current_app, make_response
 from werkzeug.utils import secure_filename
 import json
 
-from hed import schema as hedschema
 from constants import base_constants, page_constants
 from constants import route_constants, file_constants
-from web_util import handle_http_error, package_results, handle_error
-import sidecar, events, spreadsheet, services, strings, schema
+from web_util import generate_ndjson_response, handle_http_error, package_results, handle_error
+import sidecar, events, spreadsheet, services, strings, string_incremental, schema
+from schema_loader import get_cache_stats, get_schema_from_string, schema_version_list
 from columns import get_columns_request
 
 app_config = current_app.config
 route_blueprint = Blueprint(route_constants.ROUTE_BLUEPRINT, __name__)
 
 
+@route_blueprint.route(route_constants.CACHE_STATS_ROUTE, methods=['GET'])
+def cache_stats_results():
+    """Gets the usage statistics of the in-memory caches of this process
+
+    Returns
+    -------
+    string
+        A serialized JSON string mapping each cache name to its entry and byte counts, hits, misses and hit rate.
+
+    """
+
+    try:
+        stats = get_cache_stats()
+        stats['conversion_cache'] = schema.conversion_cache.get_stats()
+        stats['string_validation_cache'] = strings.validation_cache.get_stats()
+        stats['string_incremental_cache'] = string_incremental.incremental_cache.get_stats()
+        stats['string_segment_cache'] = string_incremental.segment_cache.get_stats()
+        stats['sidecar_validation_cache'] = sidecar.validation_cache.get_stats()
+        stats['events_assembly_cache'] = events.assembly_cache.get_stats()
+        stats['query_cache'] = events.query_cache.get_stats()
+        return json.dumps(stats)
+    except Exception as ex:
+        return handle_error(ex)
+
+
 @route_blueprint.route(route_constants.COLUMNS_INFO_ROUTE, methods=['POST'])
 def columns_info_results():
     """Gets the names of the spreadsheet columns and sheet_name names if any.
@@ -37,11 +62,14 @@ def events_results():
     Returns
     -------
         downloadable file
-        Contains the results of processing
+        Contains the results of processing, or a response with one JSON object per line if the form has
+        stream set to on and the command is validate.
     """
 
     try:
         input_arguments = events.get_events_form_input(request)
+        if input_arguments[base_constants.STREAM]:
+            return generate_ndjson_response(events.process_stream(input_arguments))
         a = events.process(input_arguments)
         return package_results(a)
     except Exception as ex:
@@ -83,9 +111,13 @@ def schema_version_results():
         hed_info = {}
         if base_constants.SCHEMA_PATH in request.files:
             f = request.files[base_constants.SCHEMA_PATH]
-            hed_schema = hedschema.from_string(f.stream.read(file_constants.BYTE_LIMIT).decode('ascii'),
-                                               file_type=secure_filename(f.filename))
-            hed_info[base_constants.SCHEMA_VERSION] = hed_schema.header_attributes['version']
+            file_type = secure_filename(f.filename)
+            header = f.stream.read(file_constants.SCHEMA_HEADER_BYTE_LIMIT)
+            version = schema.get_header_version(header.decode('ascii', errors='ignore'), file_type=file_type)
+            if not version:
+                schema_text = (header + f.stream.read(file_constants.BYTE_LIMIT)).decode('ascii')
+                version = get_schema_from_string(schema_text, file_type=file_type).header_attributes['version']
+            hed_info[base_constants.SCHEMA_VERSION] = version
         return json.dumps(hed_info)
     except Exception as ex:
         return handle_error(ex)
@@ -97,15 +129,20 @@ def schema_versions_results():
 
     Returns
     -------
-    string
-        A serialized JSON string containing a list of the HED versions.
+    Response
+        A response whose body is a serialized JSON string containing a list of the HED versions. The response
+        carries ETag and Last-Modified headers so that clients can revalidate with conditional requests.
 
     """
 
     try:
-        hedschema.cache_all_hed_xml_versions()
-        hed_info = {base_constants.SCHEMA_VERSION_LIST: hedschema.get_all_hed_versions()}
-        return json.dumps(hed_info)
+        versions, etag, last_modified = schema_version_list.get()
+        hed_info = {base_constants.SCHEMA_VERSION_LIST: versions}
+        response = make_response(json.dumps(hed_info))
+        response.set_etag(etag)
+        response.last_modified = last_modified
+        response.cache_control.no_cache = True
+        return response.make_conditional(request)
     except Exception as ex:
         return handle_error(ex)
 
@@ -117,11 +154,14 @@ def services_results():
     Returns
     -------
         string
-        A serialized JSON string containing processed information.
+        A serialized JSON string containing processed information. If the request has stream set to on and the
+        service supports streaming, a response with one JSON object per line ending with the summary response.
     """
     response = {}
     try:
         arguments = services.get_input_from_request(request)
+        if services.is_streaming(arguments):
+            return generate_ndjson_response(services.process_stream(arguments))
         response = services.process(arguments)
         return json.dumps(response)
     except Exception as ex:
@@ -174,18 +214,59 @@ def string_results():
 
     Returns
     -------
-        A serialized JSON string
+        A serialized JSON string, or a response with one JSON object per line if the form has stream set to on.
 
     """
 
     try:
         input_arguments = strings.get_input_from_form(request)
+        if input_arguments[base_constants.STREAM]:
+            return generate_ndjson_response(strings.process_stream(input_arguments))
         a = strings.process(input_arguments)
         return json.dumps(a)
     except Exception as ex:
         return handle_error(ex)
 
 
+@route_blueprint.route(route_constants.STRING_INCREMENTAL_ROUTE, strict_slashes=False, methods=['POST'])
+def string_incremental_results():
+    """Validate a hed string while it is being typed in the string form.
+
+    Returns
+    -------
+    string
+        A serialized JSON string with the validation results, the token hash of the string and the issue offsets.
+
+    """
+
+    try:
+        input_arguments = string_incremental.get_input_from_incremental_form(request)
+        a = string_incremental.validate_incremental(
+            input_arguments[base_constants.SCHEMA], input_arguments[base_constants.STRING_INPUT],
+            check_for_warnings=input_arguments[base_constants.CHECK_FOR_WARNINGS],
+            previous_hash=input_arguments[base_constants.PREVIOUS_HASH])
+        return json.dumps(a)
+    except Exception as ex:
+        return handle_error(ex)
+
+
+@route_blueprint.route(route_constants.TAG_COMPLETIONS_ROUTE, methods=['POST'])
+def tag_completions_results():
+    """Gets the schema tags that start with the tag prefix typed in a form.
+
+    Returns
+    -------
+    string
+        A serialized JSON string with the schema version, the tag prefix and a list of completions.
+
+    """
+    try:
+        completions = schema.get_tag_completions(request)
+        return json.dumps(completions)
+    except Exception as ex:
+        return handle_error(ex)
+
+
 @route_blueprint.route(route_constants.EVENTS_ROUTE, strict_slashes=False, methods=['GET'])
 def render_events_form():
     """The form for BIDS event file (with JSON sidecar) processing.
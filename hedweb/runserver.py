@@ -31,11 +31,13 @@ def configure_app():
 app = configure_app()
 with app.app_context():
     from routes import route_blueprint
+    from schema_loader import preload_schemas
 
     app.register_blueprint(route_blueprint, url_prefix=app.config['URL_PREFIX'])
     os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
     print(app.config['HED_CACHE_FOLDER'])
     hedschema.set_cache_directory(app.config['HED_CACHE_FOLDER'])
+    preload_schemas(app.config.get('PRELOAD_SCHEMA_VERSIONS', []))
     setup_logging()
 
 if __name__ == '__main__':
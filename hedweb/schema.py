@@ -1,3 +1,4 @@
+import re
 from os.path import basename
 from urllib.parse import urlparse
 from flask import current_app
@@ -8,11 +9,42 @@ from hed.util import get_file_extension
 from hed.errors import get_exception_issue_string, get_printable_issue_string
 from hed.errors import HedFileError
 from hed.util import generate_filename
-from web_util import form_has_file, form_has_option, form_has_url
+from lru_cache import LruCache
+from schema_loader import get_compliance_issues, get_schema_from_hash, get_schema_from_string, get_schema_from_url, \
+    get_schema_hash, get_tag_index
+from web_util import form_has_file, form_has_option, form_has_url, get_hed_schema_from_pull_down
 from constants import base_constants, file_constants
 
 app_config = current_app.config
 
+conversion_cache = LruCache(max_entries=app_config.get('SCHEMA_CONVERSION_CACHE_SIZE', 32),
+                            max_bytes=app_config.get('SCHEMA_CONVERSION_CACHE_BYTES', 64 * 1024 * 1024))
+
+XML_HEADER_PATTERN = re.compile(r'<HED\b([^>]*)>')
+WIKI_HEADER_PATTERN = re.compile(r'^\s*HED\b(.*)$', re.MULTILINE)
+HEADER_ATTRIBUTE_PATTERN = re.compile(r'([\w:.-]+)\s*=\s*"([^"]*)"')
+
+
+def get_header_version(header_text, file_type=file_constants.SCHEMA_XML_EXTENSION):
+    """ Return the version from the header of a schema without parsing the rest of the schema.
+
+    Args:
+        header_text (str): The beginning of a schema file, which must include the HED header line or element.
+        file_type (str): A file name or extension indicating whether the schema is XML or mediawiki.
+
+    Returns:
+        str or None: The version attribute of the header or None if no version could be found.
+
+    """
+    if file_type.lower().endswith(file_constants.SCHEMA_WIKI_EXTENSION):
+        match = WIKI_HEADER_PATTERN.search(header_text)
+    else:
+        match = XML_HEADER_PATTERN.search(header_text)
+    if not match:
+        return None
+    attributes = dict(HEADER_ATTRIBUTE_PATTERN.findall(match.group(1)))
+    return attributes.get('version', None)
+
 
 def get_schema(arguments):
     """ Return a HedSchema object from the given parameters.
@@ -31,10 +63,10 @@ def get_schema(arguments):
         if base_constants.SCHEMA_FILE in arguments:
             hed_schema = hedschema.load_schema(arguments[base_constants.SCHEMA_FILE])
         elif base_constants.SCHEMA_URL in arguments:
-            hed_schema = hedschema.load_schema(arguments[base_constants.SCHEMA_URL])
+            hed_schema = get_schema_from_url(arguments[base_constants.SCHEMA_URL])
         elif base_constants.SCHEMA_STRING in arguments:
-            hed_schema = hedschema.from_string(arguments[base_constants.SCHEMA_STRING],
-                                               file_type=arguments[base_constants.SCHEMA_FILE_TYPE])
+            hed_schema = get_schema_from_string(arguments[base_constants.SCHEMA_STRING],
+                                                file_type=arguments[base_constants.SCHEMA_FILE_TYPE])
         else:
             file_found = False
     except HedFileError as e:
@@ -79,6 +111,39 @@ def get_input_from_form(request):
     return arguments
 
 
+def get_tag_completions(request):
+    """ Return the schema tags that complete the tag prefix in a request from the string or sidecar form.
+
+    Args:
+        request (Request): A Request object with the schema pull-down fields or the schema_hash of a schema that
+                           was uploaded earlier, the tag_prefix and optionally a limit.
+
+    Returns:
+        dict: A dictionary with the schema_version, the schema_hash, the tag_prefix and the list of completions
+              (see TagIndex.complete).
+
+    Raises:
+        HedFileError:  If the schema could not be loaded or the limit is not a number.
+
+    Notes:
+        The limit defaults to 10 and is capped at TAG_COMPLETION_MAX_LIMIT.
+
+    """
+    schema_hash = request.form.get(base_constants.SCHEMA_HASH, None)
+    hed_schema = get_schema_from_hash(schema_hash) if schema_hash else None
+    if hed_schema is None:
+        hed_schema = get_hed_schema_from_pull_down(request)
+    tag_prefix = request.form.get(base_constants.TAG_PREFIX, '')
+    try:
+        limit = int(request.form.get(base_constants.LIMIT, 10))
+    except ValueError:
+        raise HedFileError('BadLimit', 'The completion limit must be a number', '')
+    limit = max(0, min(limit, app_config.get('TAG_COMPLETION_MAX_LIMIT', 100)))
+    return {base_constants.SCHEMA_VERSION: hed_schema.header_attributes.get('version', 'Unknown version'),
+            base_constants.SCHEMA_HASH: get_schema_hash(hed_schema), base_constants.TAG_PREFIX: tag_prefix,
+            base_constants.COMPLETIONS: get_tag_index(hed_schema).complete(tag_prefix, limit)}
+
+
 def process(arguments):
     """ Perform the requested action for the schema.
 
@@ -125,16 +190,27 @@ def schema_convert(hed_schema, display_name):
     Returns:
         dict: A dictionary of results in the standard results format.
 
+    Notes:
+        The converted text is cached by schema content hash and target format, so converting the same schema
+        again does no serialization work.
+
     """
 
     schema_version = hed_schema.header_attributes.get('version', 'Unknown')
     schema_format = get_file_extension(display_name)
     if schema_format == file_constants.SCHEMA_XML_EXTENSION:
-        data = hed_schema.get_as_mediawiki_string()
         extension = '.mediawiki'
     else:
-        data = hed_schema.get_as_xml_string()
         extension = '.xml'
+    schema_hash = get_schema_hash(hed_schema)
+    data = conversion_cache.get((schema_hash, extension)) if schema_hash else None
+    if data is None:
+        if extension == '.mediawiki':
+            data = hed_schema.get_as_mediawiki_string()
+        else:
+            data = hed_schema.get_as_xml_string()
+        if schema_hash:
+            conversion_cache.put((schema_hash, extension), data, size=len(data))
     file_name = generate_filename(display_name,  extension=extension)
 
     return {'command': base_constants.COMMAND_CONVERT_SCHEMA,
@@ -157,7 +233,7 @@ def schema_validate(hed_schema, display_name):
     """
 
     schema_version = hed_schema.header_attributes.get('version', 'Unknown')
-    issues = hed_schema.check_compliance()
+    issues = get_compliance_issues(hed_schema)
     if issues:
         issue_str = get_printable_issue_string(issues, f"Schema HED 3G compliance errors for {display_name}:")
         file_name = generate_filename(display_name, name_suffix='schema_3G_compliance_errors', extension='.txt')
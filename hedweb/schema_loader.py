@@ -0,0 +1,403 @@
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+import threading
+import time
+import weakref
+from datetime import datetime, timezone
+from urllib.parse import urlparse
+from flask import current_app
+
+from hed import schema as hedschema
+from hed.errors import HedFileError
+from hed.validator import HedValidator
+from constants import file_constants
+from lru_cache import LruCache
+from schema_snapshot import get_file_hash, load_schema_file
+from tag_index import TagIndex
+from tag_map import TagConverter, build_tag_map
+from url_cache import UrlCache
+
+app_config = current_app.config
+PARSED_SCHEMA_FACTOR = 3  # Approximate ratio of the memory of a parsed schema to its pickled size.
+
+version_cache = LruCache(max_entries=app_config.get('SCHEMA_CACHE_SIZE', 8),
+                         on_remove=lambda key, hed_schema: release_validators(hed_schema))
+schema_hashes = {}
+url_cache = UrlCache(app_config.get('SCHEMA_URL_CACHE_FOLDER',
+                                    os.path.join(tempfile.gettempdir(), 'hedtools_url_cache')),
+                     ttl=app_config.get('SCHEMA_URL_CACHE_TTL', 600),
+                     timeout=app_config.get('SCHEMA_URL_TIMEOUT', 10))
+compliance_cache = LruCache(max_entries=app_config.get('SCHEMA_COMPLIANCE_CACHE_SIZE', 32))
+validator_cache = LruCache(max_entries=app_config.get('VALIDATOR_CACHE_SIZE', 16))
+content_cache = LruCache(max_entries=app_config.get('SCHEMA_CONTENT_CACHE_SIZE', 32),
+                         max_bytes=app_config.get('SCHEMA_CONTENT_CACHE_BYTES', 64 * 1024 * 1024),
+                         on_remove=lambda key, hed_schema: release_validators(hed_schema))
+tag_map_cache = LruCache(max_entries=app_config.get('TAG_MAP_CACHE_SIZE', 16))
+tag_index_cache = LruCache(max_entries=app_config.get('TAG_INDEX_CACHE_SIZE', 16))
+
+
+def get_schema_from_version(hed_version):
+    """ Return the HedSchema for a version in the HED cache folder, parsing the XML only on a cache miss.
+
+    Args:
+        hed_version (str): The HED version string such as 8.0.0.
+
+    Returns:
+        HedSchema: The schema loaded from the HED cache folder.
+
+    Raises:
+        HedFileError: If the schema could not be loaded.
+
+    Notes:
+        Entries are keyed by version, file path and file modification time, so a schema file replaced
+        in the cache folder is reloaded on the next request. On a miss the schema is read from its
+        snapshot file when the snapshot is fresh and signed with the app SECRET_KEY.
+
+    """
+    hed_file_path = hedschema.get_path_from_hed_version(hed_version)
+    if not hed_file_path or not os.path.isfile(hed_file_path):
+        return hedschema.load_schema(hed_file_path)
+    key = (hed_version, hed_file_path, os.path.getmtime(hed_file_path))
+    hed_schema = version_cache.get(key)
+    if hed_schema is None:
+        source_hash = get_file_hash(hed_file_path)
+        hed_schema = load_schema_file(hed_file_path, source_hash=source_hash, key=app_config.get('SECRET_KEY'))
+        set_schema_hash(hed_schema, source_hash)
+        get_tag_converter(hed_schema)
+        get_tag_index(hed_schema)
+        version_cache.put(key, hed_schema)
+    return hed_schema
+
+
+def get_schema_from_string(schema_string, file_type=".xml"):
+    """ Return the HedSchema for the text of an uploaded or inline schema, parsing it only on a cache miss.
+
+    Args:
+        schema_string (str): The full text of the schema in XML or mediawiki format.
+        file_type (str): A file name or extension indicating the format of schema_string.
+
+    Returns:
+        HedSchema: The schema parsed from schema_string.
+
+    Raises:
+        HedFileError: If the schema could not be parsed.
+
+    Notes:
+        Entries are keyed by the SHA-256 hash of the schema text and its format. Each entry is charged
+        PARSED_SCHEMA_FACTOR times the pickled size of the schema against the SCHEMA_CONTENT_CACHE_BYTES budget,
+        which is close to the memory of a parsed HED 8 schema (about 2.2 MB) in either format. The size of the
+        schema text is a poor estimate, since the parsed schema is 7 to 17 times larger.
+
+    """
+    schema_bytes = schema_string.encode('utf-8')
+    key = (get_content_hash(schema_bytes), os.path.splitext(file_type.lower())[1] or file_type.lower())
+    hed_schema = content_cache.get(key)
+    if hed_schema is None:
+        hed_schema = hedschema.from_string(schema_string, file_type=file_type)
+        set_schema_hash(hed_schema, key[0])
+        get_tag_converter(hed_schema)
+        get_tag_index(hed_schema)
+        size = PARSED_SCHEMA_FACTOR * len(pickle.dumps(hed_schema, protocol=pickle.HIGHEST_PROTOCOL))
+        content_cache.put(key, hed_schema, size=size)
+    return hed_schema
+
+
+def get_schema_from_url(schema_url):
+    """ Return the HedSchema at a URL, downloading it only when the cached copy is out of date.
+
+    Args:
+        schema_url (str): The URL of a schema in XML or mediawiki format.
+
+    Returns:
+        HedSchema: The schema at schema_url.
+
+    Raises:
+        HedFileError: If the schema could not be downloaded or parsed.
+
+    Notes:
+        Downloads are revalidated with conditional GETs after SCHEMA_URL_CACHE_TTL seconds. The parsed schema
+        is looked up by content hash, so it is reused as long as the downloaded content is unchanged.
+
+    """
+    entry = url_cache.fetch(schema_url)
+    file_type = os.path.basename(urlparse(schema_url).path) or file_constants.SCHEMA_XML_EXTENSION
+    return get_schema_from_string(entry['content'].decode('utf-8'), file_type=file_type)
+
+
+def get_validator(hed_schema, run_semantic_validation=True):
+    """ Return a HedValidator for hed_schema, reusing a previously constructed validator when possible.
+
+    Args:
+        hed_schema (HedSchema or HedSchemaGroup): The schema the validator checks against.
+        run_semantic_validation (bool): True if the validator should check the HED data against the schema.
+
+    Returns:
+        HedValidator: A validator for hed_schema. Validators keep no per-request state and may be shared.
+
+    Notes:
+        A validator holds its schema, so the validators of a schema are released when the schema leaves the
+        version or content cache (see release_validators). Otherwise evicted schemas would stay in memory for
+        as long as their validators were cached.
+
+    """
+    key = (id(hed_schema), run_semantic_validation)
+    entry = validator_cache.get(key)
+    if entry is None or entry[0] is not hed_schema:
+        entry = (hed_schema, HedValidator(hed_schema=hed_schema, run_semantic_validation=run_semantic_validation))
+        validator_cache.put(key, entry)
+    return entry[1]
+
+
+def release_validators(hed_schema):
+    """ Remove the cached validators of a schema so that they do not keep it in memory.
+
+    Args:
+        hed_schema (HedSchema or HedSchemaGroup): A schema that is no longer cached.
+
+    Returns:
+        int: The number of validators removed.
+
+    """
+    return validator_cache.remove_if(lambda key: key[0] == id(hed_schema))
+
+
+def get_tag_converter(hed_schema):
+    """ Return a TagConverter for hed_schema whose tag map is built only once per schema source.
+
+    Args:
+        hed_schema (HedSchema): The schema to convert with.
+
+    Returns:
+        TagConverter: A converter that uses the precomputed long and short forms of the plain schema tags.
+
+    Notes:
+        The loading functions in this module call this when a schema enters the cache, so the map is ready
+        before the first conversion. Schemas without a content hash get a converter with a new map.
+
+    """
+    schema_hash = get_schema_hash(hed_schema)
+    tag_map = tag_map_cache.get(schema_hash) if schema_hash else None
+    if tag_map is None:
+        tag_map = build_tag_map(hed_schema)
+        if schema_hash:
+            tag_map_cache.put(schema_hash, tag_map)
+    return TagConverter(hed_schema, tag_map)
+
+
+def get_tag_index(hed_schema):
+    """ Return the TagIndex used to complete the tags of hed_schema, building it only once per schema source.
+
+    Args:
+        hed_schema (HedSchema): The schema whose tags are completed.
+
+    Returns:
+        TagIndex: A prefix index of the short, long and takes-value forms of the schema tags.
+
+    Notes:
+        Like the tag maps, indexes are built when a schema enters the cache. Schemas without a content hash
+        get a new index.
+
+    """
+    schema_hash = get_schema_hash(hed_schema)
+    tag_index = tag_index_cache.get(schema_hash) if schema_hash else None
+    if tag_index is None:
+        tag_index = TagIndex(hed_schema)
+        if schema_hash:
+            tag_index_cache.put(schema_hash, tag_index)
+    return tag_index
+
+
+def get_compliance_issues(hed_schema):
+    """ Return the HED-3G compliance issues of hed_schema, checking compliance only once per schema source.
+
+    Args:
+        hed_schema (HedSchema): The schema to check.
+
+    Returns:
+        list: A list of issue dictionaries, which is empty if the schema is compliant.
+
+    """
+    schema_hash = get_schema_hash(hed_schema)
+    issues = compliance_cache.get(schema_hash) if schema_hash else None
+    if issues is None:
+        issues = hed_schema.check_compliance()
+        if schema_hash:
+            compliance_cache.put(schema_hash, issues)
+    return issues
+
+
+def get_schema_from_hash(content_hash):
+    """ Return a loaded schema whose source has a given content hash if it is still in memory.
+
+    Args:
+        content_hash (str): The SHA-256 hex digest of the schema source, as returned by get_schema_hash.
+
+    Returns:
+        HedSchema or None: The schema or None if no live schema was loaded from a source with content_hash.
+
+    Notes:
+        This lets a client that uploaded a schema refer to it by hash in later requests rather than resending it.
+
+    """
+    for schema_ref, schema_hash in list(schema_hashes.values()):
+        hed_schema = schema_ref()
+        if schema_hash == content_hash and hed_schema is not None:
+            return hed_schema
+    return None
+
+
+def get_schema_hash(hed_schema):
+    """ Return the content hash of the source a schema was loaded from.
+
+    Args:
+        hed_schema (HedSchema): A schema returned by one of the loading functions in this module.
+
+    Returns:
+        str or None: The SHA-256 hex digest of the schema source or None if the schema was loaded elsewhere.
+
+    """
+    entry = schema_hashes.get(id(hed_schema))
+    if entry and entry[0]() is hed_schema:
+        return entry[1]
+    return None
+
+
+def set_schema_hash(hed_schema, content_hash):
+    """ Record the content hash of the source hed_schema was loaded from for as long as the schema is alive.
+
+    Args:
+        hed_schema (HedSchema): A loaded schema.
+        content_hash (str): The SHA-256 hex digest of the schema source.
+
+    """
+    schema_id = id(hed_schema)
+    schema_hashes[schema_id] = (weakref.ref(hed_schema, lambda ref: schema_hashes.pop(schema_id, None)),
+                                content_hash)
+
+
+def get_content_hash(content):
+    """ Return the SHA-256 hex digest of content.
+
+    Args:
+        content (bytes or str): The content to hash. Strings are encoded as UTF-8.
+
+    Returns:
+        str: The hex digest.
+
+    """
+    if isinstance(content, str):
+        content = content.encode('utf-8')
+    return hashlib.sha256(content).hexdigest()
+
+
+def invalidate_schemas():
+    """ Remove cached schemas whose files have been modified or removed from the HED cache folder.
+
+    Returns:
+        int: The number of cached schemas removed.
+
+    """
+    def is_stale(key):
+        hed_file_path, modified_time = key[1], key[2]
+        return not os.path.isfile(hed_file_path) or os.path.getmtime(hed_file_path) != modified_time
+
+    return version_cache.remove_if(is_stale)
+
+
+def preload_schemas(hed_versions):
+    """ Load the listed schema versions from the HED cache folder into the version cache.
+
+    Args:
+        hed_versions (list): A list of HED version strings such as 8.0.0.
+
+    Returns:
+        list: The versions that were loaded. Versions that cannot be loaded are skipped.
+
+    Notes:
+        This is called when the application is imported so that schemas are parsed before requests are served.
+        Each process that imports the application holds its own copy, since mod_wsgi imports it after forking.
+
+    """
+    loaded = []
+    for hed_version in hed_versions:
+        try:
+            get_schema_from_version(hed_version)
+        except HedFileError:
+            continue
+        loaded.append(hed_version)
+    return loaded
+
+
+def refresh_schema_cache():
+    """ Update the HED cache folder with the latest schema versions and drop parsed schemas that are out of date. """
+    hedschema.cache_all_hed_xml_versions()
+    invalidate_schemas()
+
+
+class SchemaVersionList:
+    """ An in-memory snapshot of the available HED versions that a background thread keeps up to date. """
+
+    def __init__(self, ttl=300):
+        """ Construct an empty version list.
+
+        Args:
+            ttl (float): Number of seconds between refreshes of the snapshot.
+
+        """
+        self.ttl = ttl
+        self.snapshot = None
+        self._lock = threading.Lock()
+        self._refresher = None
+
+    def get(self):
+        """ Return the current snapshot, loading it on first use and starting the background refresher.
+
+        Returns:
+            tuple: (versions, etag, last_modified) where versions is a list of HED version strings, etag is a
+                   hash of the list and last_modified is the datetime at which the list last changed.
+
+        """
+        if self.snapshot is None:
+            with self._lock:
+                if self.snapshot is None:
+                    self.refresh()
+        self._start_refresher()
+        return self.snapshot
+
+    def refresh(self):
+        """ Refresh the HED cache folder and replace the snapshot if the list of versions changed. """
+        refresh_schema_cache()
+        versions = hedschema.get_all_hed_versions()
+        etag = get_content_hash(json.dumps(versions))
+        if self.snapshot is None or etag != self.snapshot[1]:
+            self.snapshot = (versions, etag, datetime.now(timezone.utc).replace(microsecond=0))
+
+    def _start_refresher(self):
+        if self._refresher is not None and self._refresher.is_alive():
+            return
+        with self._lock:
+            if self._refresher is None or not self._refresher.is_alive():
+                self._refresher = threading.Thread(target=self._run, name='schema-version-refresher', daemon=True)
+                self._refresher.start()
+
+    def _run(self):
+        while True:
+            time.sleep(self.ttl)
+            try:
+                self.refresh()
+            except Exception:
+                # Keep serving the previous snapshot if the cache folder or the network is unavailable.
+                continue
+
+
+schema_version_list = SchemaVersionList(ttl=app_config.get('SCHEMA_VERSIONS_TTL', 300))
+
+
+def get_cache_stats():
+    """ Return a dictionary of usage statistics for the schema caches. """
+    return {'version_cache': version_cache.get_stats(), 'content_cache': content_cache.get_stats(),
+            'validator_cache': validator_cache.get_stats(), 'compliance_cache': compliance_cache.get_stats(),
+            'tag_map_cache': tag_map_cache.get_stats(), 'tag_index_cache': tag_index_cache.get_stats()}
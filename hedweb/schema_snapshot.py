@@ -0,0 +1,145 @@
+import hashlib
+import hmac
+import json
+import os
+import pickle
+
+import hed
+from hed import schema as hedschema
+
+SNAPSHOT_EXTENSION = '.snapshot'
+SNAPSHOT_FORMAT_VERSION = 2
+SNAPSHOT_MAGIC = b'HEDWEB-SCHEMA-SNAPSHOT\n'
+
+
+def get_snapshot_path(hed_file_path):
+    """ Return the path of the snapshot file that sits next to a schema file.
+
+    Args:
+        hed_file_path (str): Path of a schema XML file.
+
+    Returns:
+        str: The path of the corresponding snapshot file.
+
+    """
+    return os.path.splitext(hed_file_path)[0] + SNAPSHOT_EXTENSION
+
+
+def get_file_hash(file_path):
+    """ Return the SHA-256 hex digest of the contents of a file.
+
+    Args:
+        file_path (str): Path of the file.
+
+    Returns:
+        str: The hex digest.
+
+    """
+    with open(file_path, 'rb') as fp:
+        return hashlib.sha256(fp.read()).hexdigest()
+
+
+def load_schema_file(hed_file_path, source_hash=None, key=None):
+    """ Load a schema file, reading its snapshot when one is fresh and otherwise parsing it and writing a snapshot.
+
+    Args:
+        hed_file_path (str): Path of a schema XML file in the HED cache folder.
+        source_hash (str or None): The SHA-256 hex digest of the file if already known.
+        key (str, bytes or None): The secret key snapshots are signed with. If None, no snapshots are used.
+
+    Returns:
+        HedSchema: The loaded schema.
+
+    Raises:
+        HedFileError: If the schema file could not be parsed.
+
+    """
+    if not key:
+        return hedschema.load_schema(hed_file_path)
+    if not source_hash:
+        source_hash = get_file_hash(hed_file_path)
+    snapshot_path = get_snapshot_path(hed_file_path)
+    hed_schema = read_snapshot(snapshot_path, source_hash, key)
+    if hed_schema is None:
+        hed_schema = hedschema.load_schema(hed_file_path)
+        write_snapshot(snapshot_path, hed_schema, source_hash, key)
+    return hed_schema
+
+
+def read_snapshot(snapshot_path, source_hash, key):
+    """ Return the schema stored in a snapshot file if the snapshot is valid for the given source.
+
+    Args:
+        snapshot_path (str): Path of the snapshot file.
+        source_hash (str): SHA-256 hex digest of the schema file the snapshot must have been built from.
+        key (str or bytes): The secret key the snapshot must have been signed with.
+
+    Returns:
+        HedSchema or None: The schema, or None if the snapshot is missing, stale, corrupt, from another version
+                           or not signed with key.
+
+    Notes:
+        The payload is only unpickled after its HMAC-SHA256 signature over the header and payload is verified,
+        so a snapshot written by anyone without the key is never loaded.
+
+    """
+    try:
+        with open(snapshot_path, 'rb') as fp:
+            if fp.readline() != SNAPSHOT_MAGIC:
+                return None
+            header_line = fp.readline().rstrip(b'\n')
+            header = json.loads(header_line)
+            signature = fp.readline().rstrip(b'\n').decode('ascii')
+            payload = fp.read()
+    except (OSError, ValueError):
+        return None
+    if header != _get_header(source_hash) or \
+            not hmac.compare_digest(signature, _get_signature(key, header_line, payload)):
+        return None
+    try:
+        return pickle.loads(payload)
+    except Exception:
+        return None
+
+
+def write_snapshot(snapshot_path, hed_schema, source_hash, key):
+    """ Write a signed snapshot of hed_schema, replacing any existing snapshot atomically.
+
+    Args:
+        snapshot_path (str): Path of the snapshot file.
+        hed_schema (HedSchema): The fully loaded schema.
+        source_hash (str): SHA-256 hex digest of the schema file hed_schema was loaded from.
+        key (str or bytes): The secret key the snapshot is signed with.
+
+    Returns:
+        bool: True if the snapshot was written. Failures such as a read-only cache folder are not fatal.
+
+    """
+    payload = pickle.dumps(hed_schema, protocol=pickle.HIGHEST_PROTOCOL)
+    header_line = json.dumps(_get_header(source_hash)).encode('ascii')
+    temp_path = f"{snapshot_path}.{os.getpid()}.tmp"
+    try:
+        with open(temp_path, 'wb') as fp:
+            fp.write(SNAPSHOT_MAGIC)
+            fp.write(header_line + b'\n')
+            fp.write(_get_signature(key, header_line, payload).encode('ascii') + b'\n')
+            fp.write(payload)
+        os.replace(temp_path, snapshot_path)
+    except OSError:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        return False
+    return True
+
+
+def _get_header(source_hash):
+    return {'format_version': SNAPSHOT_FORMAT_VERSION, 'hed_version': getattr(hed, '__version__', 'unknown'),
+            'source_hash': source_hash}
+
+
+def _get_signature(key, header_line, payload):
+    if isinstance(key, str):
+        key = key.encode('utf-8')
+    signature = hmac.new(key, header_line + b'\n', hashlib.sha256)
+    signature.update(payload)
+    return signature.hexdigest()
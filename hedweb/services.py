@@ -4,8 +4,8 @@ import json
 from flask import current_app
 from hed.models import HedString, Sidecar, SpreadsheetInput, TabularInput
 from hed.errors import HedFileError
-from hed import schema as hedschema
 from constants import base_constants
+from schema_loader import get_schema_from_string, get_schema_from_url, get_schema_from_version
 import events, spreadsheet, sidecar, strings
 
 
@@ -31,7 +31,9 @@ def get_input_from_request(request):
     get_column_parameters(arguments, service_request)
     get_sidecar(arguments, service_request)
     get_input_objects(arguments, service_request)
-    arguments[base_constants.QUERY] = service_request.get('query', None)
+    arguments[base_constants.QUERY] = service_request.get(base_constants.QUERY, None)
+    query_list = service_request.get(base_constants.QUERY_LIST, None)
+    arguments[base_constants.QUERY_LIST] = [query_list] if isinstance(query_list, str) else query_list
     return arguments
 
 
@@ -98,7 +100,10 @@ def get_input_objects(arguments, params):
 
     """
 
-    if base_constants.EVENTS_STRING in params and params[base_constants.EVENTS_STRING]:
+    if base_constants.EVENTS_STRING in params and params[base_constants.EVENTS_STRING] and is_streaming(arguments):
+        arguments[base_constants.EVENTS_FILE] = io.StringIO(params[base_constants.EVENTS_STRING])
+        arguments[base_constants.EVENTS_DISPLAY_NAME] = 'Events'
+    elif base_constants.EVENTS_STRING in params and params[base_constants.EVENTS_STRING]:
         arguments[base_constants.EVENTS] = \
             TabularInput(file=io.StringIO(params[base_constants.EVENTS_STRING]),
                          sidecar=arguments.get(base_constants.JSON_SIDECAR, None), name='Events')
@@ -136,7 +141,10 @@ def get_service_info(params):
     has_column_names = params.get(base_constants.HAS_COLUMN_NAMES, '') == 'on'
     expand_defs = params.get(base_constants.EXPAND_DEFS, '') == 'on'
     check_for_warnings = params.get(base_constants.CHECK_FOR_WARNINGS, '') == 'on'
+    stream = params.get(base_constants.STREAM, '') == 'on'
     include_description_tags = params.get(base_constants.INCLUDE_DESCRIPTION_TAGS, '') == 'on'
+    unique_rows = params.get(base_constants.UNIQUE_ROWS, '') == 'on'
+    parallel = params.get(base_constants.PARALLEL, '') == 'on'
 
     return {base_constants.SERVICE: service,
             base_constants.COMMAND: command,
@@ -144,7 +152,10 @@ def get_service_info(params):
             base_constants.HAS_COLUMN_NAMES: has_column_names,
             base_constants.CHECK_FOR_WARNINGS: check_for_warnings,
             base_constants.EXPAND_DEFS: expand_defs,
-            base_constants.INCLUDE_DESCRIPTION_TAGS: include_description_tags
+            base_constants.INCLUDE_DESCRIPTION_TAGS: include_description_tags,
+            base_constants.STREAM: stream,
+            base_constants.UNIQUE_ROWS: unique_rows,
+            base_constants.PARALLEL: parallel
             # base_constants.TAG_COLUMNS: tag_columns,
             # base_constants.COLUMN_PREFIX_DICTIONARY: prefix_dict
             }
@@ -160,13 +171,11 @@ def get_input_schema(parameters):
     the_schema = None
     try:
         if base_constants.SCHEMA_STRING in parameters and parameters[base_constants.SCHEMA_STRING]:
-            the_schema = hedschema.from_string(parameters[base_constants.SCHEMA_STRING])
+            the_schema = get_schema_from_string(parameters[base_constants.SCHEMA_STRING])
         elif base_constants.SCHEMA_URL in parameters and parameters[base_constants.SCHEMA_URL]:
-            schema_url = parameters[base_constants.SCHEMA_URL]
-            the_schema = hedschema.load_schema(schema_url)
+            the_schema = get_schema_from_url(parameters[base_constants.SCHEMA_URL])
         elif base_constants.SCHEMA_VERSION in parameters and parameters[base_constants.SCHEMA_VERSION]:
-            hed_file_path = hedschema.get_path_from_hed_version(parameters[base_constants.SCHEMA_VERSION])
-            the_schema = hedschema.load_schema(hed_file_path)
+            the_schema = get_schema_from_version(parameters[base_constants.SCHEMA_VERSION])
     except HedFileError:
         the_schema = None
 
@@ -209,6 +218,59 @@ def process(arguments):
     return response
 
 
+def process_stream(arguments):
+    """ Call a streaming service processing function and return a generator of the results.
+
+    Args:
+        arguments (dict): A dictionary of arguments for the processing resolved from the request.
+
+    Returns:
+        generator: A generator of the per-item result dictionaries followed by a final dictionary in
+                   standard response format whose results field holds the summary.
+
+    Raises:
+        HedFileError: If the requested service does not support streaming or its arguments are invalid.
+
+    Notes:
+        Only the strings services and events_validate support streaming.
+
+    """
+    if not is_streaming(arguments):
+        raise HedFileError('HEDStreamingNotSupported',
+                           f"{arguments.get(base_constants.SERVICE, '')} does not support streaming", '')
+    elif arguments.get(base_constants.COMMAND_TARGET, '') == 'events':
+        results = events.process_stream(arguments)
+    else:
+        results = strings.process_stream(arguments)
+
+    def generate():
+        summary = None
+        for result in results:
+            if summary is not None:
+                yield summary
+            summary = result
+        yield {base_constants.SERVICE: arguments.get(base_constants.SERVICE, ''),
+               'results': summary, 'error_type': '', 'error_msg': ''}
+
+    return generate()
+
+
+def is_streaming(arguments):
+    """ Return True if the service request asked for a streamed response and the service supports it.
+
+    Args:
+        arguments (dict): A dictionary of arguments for the processing resolved from the request.
+
+    Returns:
+        bool: True if the results should be streamed one line at a time.
+
+    """
+    target = arguments.get(base_constants.COMMAND_TARGET, '')
+    return bool(arguments.get(base_constants.STREAM, False)) and \
+        (target == 'strings' or
+         (target == 'events' and arguments.get(base_constants.COMMAND, '') == base_constants.COMMAND_VALIDATE))
+
+
 def package_spreadsheet(results):
     """ Get the transformed results dictionary where spreadsheets are converted to strings.
 
@@ -4,17 +4,22 @@ from flask import current_app
 from werkzeug.utils import secure_filename
 
 from hed import schema as hedschema
-from hed.validator import HedValidator
-from hed.errors import HedFileError, get_printable_issue_string
+from hed.errors import ErrorContext, HedFileError, get_printable_issue_string
 
 from hed.models import SpreadsheetInput, Sidecar
 from hed.tools import df_to_hed, hed_to_df, merge_hed_dict
 from hed.util import generate_filename, get_file_extension
 from constants import base_constants, file_constants
+from lru_cache import LruCache
+from process_pool import get_issues_size, get_portable_issue
+from schema_loader import get_content_hash, get_schema_hash, get_tag_converter, get_validator
 from web_util import form_has_option, get_hed_schema_from_pull_down
 
 app_config = current_app.config
 
+validation_cache = LruCache(max_entries=app_config.get('SIDECAR_VALIDATION_CACHE_SIZE', 256),
+                            max_bytes=app_config.get('SIDECAR_VALIDATION_CACHE_BYTES', 32 * 1024 * 1024))
+
 
 def get_input_from_form(request):
     """ Gets the sidecar processing input arguments from a request object.
@@ -55,6 +60,39 @@ def get_input_from_form(request):
     return arguments
 
 
+def get_sidecar_issues(hed_schema, sidecar, check_for_warnings=False):
+    """ Return the validation issues of a sidecar, validating each distinct sidecar only once per schema.
+
+    Args:
+        hed_schema (HedSchema or HedSchemaGroup): The hed schemas to be used.
+        sidecar (Sidecar): A Sidecar object to validate.
+        check_for_warnings (bool): If True, check for warnings as well as errors.
+
+    Returns:
+        list: The validation issues of the sidecar. The issues may be shared and must not be modified.
+
+    Notes:
+        Results are cached by schema content hash, check_for_warnings and the SHA-256 hash of the JSON of the
+        sidecar, so the events files of a dataset that share a sidecar validate it once. The file name of the
+        issues is set to the name of sidecar on return, since the sidecars with the same JSON may have different
+        names. Cached issues are kept in portable form (see get_portable_issue) and the cache is charged their
+        approximate size.
+
+    """
+    schema_hash = get_schema_hash(hed_schema)
+    if not schema_hash:
+        return sidecar.validate_entries(get_validator(hed_schema), check_for_warnings=check_for_warnings)
+    json_string = sidecar.get_as_json_string()
+    key = (schema_hash, check_for_warnings, get_content_hash(json_string))
+    issues = validation_cache.get(key)
+    if issues is None:
+        issues = [get_portable_issue(issue) for issue in
+                  sidecar.validate_entries(get_validator(hed_schema), check_for_warnings=check_for_warnings)]
+        validation_cache.put(key, issues, size=get_issues_size(issues))
+    return [dict(issue, **{ErrorContext.FILE_NAME: sidecar.name}) if ErrorContext.FILE_NAME in issue else issue
+            for issue in issues]
+
+
 def process(arguments):
     """Perform the requested action for the sidecar.
 
@@ -117,11 +155,12 @@ def sidecar_convert(hed_schema, sidecar, command=base_constants.COMMAND_TO_SHORT
     else:
         tag_form = 'short_tag'
     issues = []
-    for hed_string_obj, position_info, issue_items in sidecar.hed_string_iter(hed_ops=hed_schema,
+    tag_converter = get_tag_converter(hed_schema)
+    for hed_string_obj, position_info, issue_items in sidecar.hed_string_iter(hed_ops=tag_converter.canonicalize,
                                                                               expand_defs=expand_defs,
                                                                               remove_definitions=False):
 
-        converted_string = hed_string_obj.get_as_form(tag_form)
+        converted_string = tag_converter.get_as_form(hed_string_obj, tag_form)
         issues = issues + issue_items
         sidecar.set_hed_string(converted_string, position_info)
 
@@ -213,8 +252,7 @@ def sidecar_validate(hed_schema, sidecar, check_for_warnings=False):
 
     schema_version = hed_schema.header_attributes.get('version', 'Unknown version')
     display_name = sidecar.name
-    validator = HedValidator(hed_schema)
-    issues = sidecar.validate_entries(validator, check_for_warnings=check_for_warnings)
+    issues = get_sidecar_issues(hed_schema, sidecar, check_for_warnings=check_for_warnings)
     if issues:
         issue_str = get_printable_issue_string(issues, f"JSON dictionary {sidecar.name} validation errors")
         file_name = generate_filename(display_name, name_suffix='validation_errors', extension='.txt')
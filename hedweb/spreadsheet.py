@@ -5,10 +5,10 @@ from hed import schema as hedschema
 from hed.errors import get_printable_issue_string, HedFileError
 from hed.models import SpreadsheetInput
 from hed.util import generate_filename, get_file_extension
-from hed.validator import HedValidator
 
 from constants import base_constants, file_constants
 from columns import get_prefix_dict
+from schema_loader import get_validator
 from web_util import form_has_option, get_hed_schema_from_pull_down
 
 
@@ -132,7 +132,7 @@ def spreadsheet_validate(hed_schema, spreadsheet, check_for_warnings=False):
 
     """
     schema_version = hed_schema.header_attributes.get('version', 'Unknown version')
-    validator = HedValidator(hed_schema=hed_schema)
+    validator = get_validator(hed_schema)
     issues = spreadsheet.validate_file(validator, check_for_warnings=check_for_warnings)
     display_name = spreadsheet.name
     if issues:
@@ -0,0 +1,197 @@
+from flask import current_app
+from hed.models.hed_string import HedString
+from hed.models.hed_tag import HedTag
+from hed.errors import get_printable_issue_string, HedFileError
+from hed.schema.hed_schema_constants import HedKey
+
+from constants import base_constants
+from lru_cache import LruCache
+from schema_loader import get_content_hash, get_schema_from_hash, get_schema_hash, get_tag_converter
+from strings import get_string_results, validation_cache
+from web_util import form_has_option, get_hed_schema_from_pull_down
+
+app_config = current_app.config
+
+incremental_cache = LruCache(max_entries=app_config.get('STRING_INCREMENTAL_CACHE_SIZE', 1000))
+segment_cache = LruCache(max_entries=app_config.get('STRING_SEGMENT_CACHE_SIZE', 10000))
+
+
+def get_input_from_incremental_form(request):
+    """Gets input arguments from a request object sent by the string form while the string is being typed.
+
+    Parameters
+    ----------
+    request: Request object
+        A Request object containing the string, the schema version or the hash of an uploaded schema, and the
+        token hash of the previously validated string.
+
+    Returns
+    -------
+    dict
+        A dictionary containing input arguments for calling validate_incremental.
+    """
+    schema_hash = request.form.get(base_constants.SCHEMA_HASH, None)
+    hed_schema = get_schema_from_hash(schema_hash) if schema_hash else None
+    if hed_schema is None:
+        hed_schema = get_hed_schema_from_pull_down(request)
+    hed_string = request.form.get(base_constants.STRING_INPUT, None)
+    if not hed_string:
+        raise HedFileError('EmptyHedString', 'Must enter a HED string', '')
+    arguments = {base_constants.SCHEMA: hed_schema,
+                 base_constants.STRING_INPUT: hed_string,
+                 base_constants.CHECK_FOR_WARNINGS:
+                     form_has_option(request, base_constants.CHECK_FOR_WARNINGS, 'on'),
+                 base_constants.PREVIOUS_HASH: request.form.get(base_constants.PREVIOUS_HASH, None)}
+    return arguments
+
+
+def split_top_level(hed_string):
+    """Returns the character spans of the top-level comma-separated parts of a HED string
+
+    Parameters
+    ----------
+    hed_string: str
+        The text of a HED string
+
+    Returns
+    -------
+    list or None
+        A (start, end) tuple for each top-level tag or tag group with surrounding blanks excluded, so an empty
+        part has start equal to end. None if the parentheses of hed_string are not balanced.
+    """
+    spans = []
+    depth = 0
+    start = 0
+    for pos, char in enumerate(hed_string + ','):
+        if char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+            if depth < 0:
+                return None
+        elif char == ',' and depth == 0:
+            part = hed_string[start:pos]
+            stripped_start = start + len(part) - len(part.lstrip())
+            spans.append((stripped_start, max(stripped_start, start + len(part.rstrip()))))
+            start = pos + 1
+    if depth:
+        return None
+    return spans
+
+
+def validate_incremental(hed_schema, hed_string, check_for_warnings=False, previous_hash=None):
+    """Validates a string that is being typed, revalidating only the top-level tags and groups that changed
+
+    Parameters
+    ----------
+    hed_schema: HedSchema
+        The HED schema to be used in processing
+    hed_string: str
+        The text of the HED string
+    check_for_warnings: bool
+        Indicates whether validation should check for warnings as well as errors
+    previous_hash: str or None
+        The token_hash returned for the previous version of the string, if any
+
+    Returns
+    -------
+    dict
+        A dictionary with results in standard format that also has the schema_hash of hed_schema (which can be
+        sent in place of an uploaded schema), the token_hash of this string, the issues as
+        a list of dictionaries with code, message, severity and absolute start and end offsets, the segment_count
+        and the indices of the changed_segments that were not part of the previous string.
+
+    Notes
+    -----
+    Each top-level tag or group is validated as a HED string of its own, so its issues come from the string
+    validation cache unless its text changed. The checks that span top-level parts (repeated tags or groups and
+    the schema's unique and required tags) use a key and the unique tags of each part, which are also cached by
+    text. The string is validated in full when any of these checks could apply or when it has empty parts or
+    unbalanced parentheses. Issue messages refer
+    to positions within their part. Because parts are validated independently, errors in one part do not hide
+    the group-level issues of another as they can in a full validation, which is still done on submit.
+    """
+
+    schema_hash = get_schema_hash(hed_schema)
+    token_hash = get_content_hash(f"{schema_hash}\n{check_for_warnings}\n{hed_string}")
+    previous = incremental_cache.get(previous_hash) if schema_hash and previous_hash else None
+    entry = incremental_cache.get(token_hash) if schema_hash else None
+    if entry is None:
+        spans = split_top_level(hed_string) or []
+        segments = tuple(hed_string[start:end] for start, end in spans)
+        if not segments or not all(segments) or _has_top_level_conflicts(hed_schema, schema_hash, segments):
+            spans, segments = [(0, len(hed_string))], (hed_string,)
+        issues_by_text = _get_segment_issues(hed_schema, schema_hash, set(segments), check_for_warnings)
+        entry = (segments, [(issues_by_text[segment], start) for segment, (start, _) in zip(segments, spans)])
+        if schema_hash:
+            incremental_cache.put(token_hash, entry)
+    segments, segment_issues = entry
+    previous_segments = set(previous[0]) if previous else set()
+    issues = [issue for part_issues, _ in segment_issues for issue in part_issues]
+    issue_list = [{'code': issue['code'], 'message': issue['message'], 'severity': issue['severity'],
+                   'start': offset + issue.get('char_index', 0),
+                   'end': offset + issue.get('char_index_end', len(segments[pos]))}
+                  for pos, (part_issues, offset) in enumerate(segment_issues) for issue in part_issues]
+    return {base_constants.COMMAND: base_constants.COMMAND_VALIDATE, base_constants.COMMAND_TARGET: 'string',
+            'data': get_printable_issue_string(issues, "Errors for HED string:") if issues else '',
+            base_constants.SCHEMA_VERSION: hed_schema.header_attributes.get('version', 'Unknown version'),
+            'msg_category': 'warning' if issues else 'success',
+            'msg': f'String has {len(issues)} issues' if issues else 'String is valid',
+            base_constants.SCHEMA_HASH: schema_hash, base_constants.TOKEN_HASH: token_hash,
+            base_constants.ISSUES: issue_list,
+            base_constants.SEGMENT_COUNT: len(segments),
+            base_constants.CHANGED_SEGMENTS: [pos for pos, segment in enumerate(segments)
+                                              if segment not in previous_segments]}
+
+
+def _get_segment_issues(hed_schema, schema_hash, texts, check_for_warnings):
+    # Returns the issues of each text, parsing only the texts that are not in the string validation cache.
+    segment_issues = {}
+    for text in texts:
+        key = (schema_hash, check_for_warnings, text)
+        if schema_hash and key in validation_cache:
+            segment_issues[text] = validation_cache.get(key)
+    missing = [text for text in texts if segment_issues.get(text) is None]
+    if missing:
+        missing_issues, _ = get_string_results(hed_schema, [HedString(text) for text in missing],
+                                               check_for_warnings=check_for_warnings)
+        segment_issues.update(zip(missing, missing_issues))
+    return segment_issues
+
+
+def _has_top_level_conflicts(hed_schema, schema_hash, segments):
+    # True if the checks that span top-level parts (repeats, unique and required tags) could apply to segments.
+    if hed_schema.get_tags_with_attribute(HedKey.Required):
+        return True
+    segment_info = [_get_segment_info(hed_schema, schema_hash, segment) for segment in segments]
+    keys = [key for key, _ in segment_info]
+    unique_tags = [prefix for _, prefixes in segment_info for prefix in prefixes]
+    return len(set(keys)) != len(keys) or len(set(unique_tags)) != len(unique_tags)
+
+
+def _get_segment_info(hed_schema, schema_hash, segment):
+    # Returns the order-independent key of a segment and the unique tag prefixes its tags match, cached by text.
+    key = (schema_hash, segment)
+    info = segment_cache.get(key) if schema_hash else None
+    if info is None:
+        hed_string_obj = HedString(segment)
+        tag_converter = get_tag_converter(hed_schema)
+        tag_converter.canonicalize(hed_string_obj)
+        unique_prefixes = [prefix.lower() for prefix in hed_schema.get_tags_with_attribute(HedKey.Unique)]
+        long_tags = [_get_long_tag(tag_converter, tag) for tag in hed_string_obj.get_all_tags()]
+        info = (tuple(_get_child_key(tag_converter, child) for child in hed_string_obj.children),
+                tuple(prefix for tag in long_tags for prefix in unique_prefixes if tag.startswith(prefix)))
+        if schema_hash:
+            segment_cache.put(key, info)
+    return info
+
+
+def _get_child_key(tag_converter, child):
+    if isinstance(child, HedTag):
+        return 'tag', _get_long_tag(tag_converter, child)
+    return 'group', tuple(sorted(_get_child_key(tag_converter, grandchild) for grandchild in child.children))
+
+
+def _get_long_tag(tag_converter, tag):
+    forms = tag_converter.lookup(tag)
+    return (forms[0] if forms else tag.long_tag).lower()
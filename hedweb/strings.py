@@ -1,3 +1,4 @@
+from concurrent.futures.process import BrokenProcessPool
 from flask import current_app
 
 # from hed.models.hed_string import HedString
@@ -6,13 +7,22 @@ from flask import current_app
 from hed.models.hed_string import HedString
 from hed import schema as hedschema
 from hed.errors import get_printable_issue_string, HedFileError
-from hed.validator import HedValidator
 
 from constants import base_constants
+from lru_cache import LruCache
+from process_pool import SchemaProcessPool, get_issues_size, get_portable_issue, split_chunks, validate_strings, \
+    validate_strings_chunk
+from schema_loader import get_schema_hash, get_tag_converter, get_validator
 from web_util import form_has_option, get_hed_schema_from_pull_down
 
 app_config = current_app.config
 
+process_pool = SchemaProcessPool(max_workers=app_config.get('PROCESS_POOL_SIZE', None),
+                                 start_method=app_config.get('PROCESS_POOL_START_METHOD', None),
+                                 executable=app_config.get('PROCESS_POOL_EXECUTABLE', None))
+validation_cache = LruCache(max_entries=app_config.get('STRING_VALIDATION_CACHE_SIZE', 10000),
+                            max_bytes=app_config.get('STRING_VALIDATION_CACHE_BYTES', 32 * 1024 * 1024))
+
 
 def get_input_from_form(request):
     """Gets input arguments from a request object associated with the string form.
@@ -37,7 +47,8 @@ def get_input_from_form(request):
                  base_constants.SCHEMA: hed_schema,
                  base_constants.STRING_LIST: string_list,
                  base_constants.CHECK_FOR_WARNINGS:
-                     form_has_option(request, base_constants.CHECK_FOR_WARNINGS, 'on')}
+                     form_has_option(request, base_constants.CHECK_FOR_WARNINGS, 'on'),
+                 base_constants.STREAM: form_has_option(request, base_constants.STREAM, 'on')}
     return arguments
 
 
@@ -60,20 +71,101 @@ def process(arguments):
     string_list = arguments.get(base_constants.STRING_LIST, None)
     command = arguments.get(base_constants.COMMAND, None)
     check_for_warnings = arguments.get(base_constants.CHECK_FOR_WARNINGS, False)
+    parallel = arguments.get(base_constants.PARALLEL, False)
     if not string_list:
         raise HedFileError('EmptyHedStringList', "Please provide a list of HED strings to be processed", "")
     if command == base_constants.COMMAND_VALIDATE:
-        results = validate(hed_schema, string_list, check_for_warnings=check_for_warnings)
+        results = validate(hed_schema, string_list, check_for_warnings=check_for_warnings, parallel=parallel)
     elif command == base_constants.COMMAND_TO_SHORT:
-        results = convert(hed_schema, string_list, command, check_for_warnings=check_for_warnings)
+        results = convert(hed_schema, string_list, command, check_for_warnings=check_for_warnings, parallel=parallel)
     elif command == base_constants.COMMAND_TO_LONG:
-        results = convert(hed_schema, string_list, command, check_for_warnings=check_for_warnings)
+        results = convert(hed_schema, string_list, command, check_for_warnings=check_for_warnings, parallel=parallel)
     else:
         raise HedFileError('UnknownProcessingMethod', f'Command {command} is missing or invalid', '')
     return results
 
 
-def convert(hed_schema, string_list, command=base_constants.COMMAND_TO_SHORT, check_for_warnings=False):
+def process_stream(arguments):
+    """Checks the arguments of a string processing request and returns a generator of its results
+
+    Parameters
+    ----------
+    arguments: dict
+        A dictionary with the input arguments from the string form or string service request.
+
+    Returns
+    -------
+    generator
+        A generator of a result dictionary for each string followed by a summary dictionary (see generate_results).
+
+    Notes
+    -----
+    The arguments are checked before the generator is returned, so bad requests raise before any results are sent.
+    """
+    hed_schema = arguments.get('schema', None)
+    if not hed_schema or not isinstance(hed_schema, hedschema.hed_schema.HedSchema):
+        raise HedFileError('BadHedSchema', "Please provide a valid HedSchema", "")
+    string_list = arguments.get(base_constants.STRING_LIST, None)
+    command = arguments.get(base_constants.COMMAND, None)
+    if not string_list:
+        raise HedFileError('EmptyHedStringList', "Please provide a list of HED strings to be processed", "")
+    if command not in (base_constants.COMMAND_VALIDATE, base_constants.COMMAND_TO_SHORT,
+                       base_constants.COMMAND_TO_LONG):
+        raise HedFileError('UnknownProcessingMethod', f'Command {command} is missing or invalid', '')
+    return generate_results(hed_schema, string_list, command,
+                            check_for_warnings=arguments.get(base_constants.CHECK_FOR_WARNINGS, False))
+
+
+def generate_results(hed_schema, string_list, command=base_constants.COMMAND_VALIDATE, check_for_warnings=False):
+    """Validates or converts strings a chunk at a time, yielding the result of each string as soon as it is ready
+
+    Parameters
+    ----------
+    hed_schema: HedSchema
+        The HED schema to be used in processing
+    string_list: list
+        A list of HedString to be processed
+    command: str
+        Name of the command to execute (validate, to_long or to_short)
+    check_for_warnings: bool
+        Indicates whether validation should check for warnings as well as errors
+
+    Yields
+    ------
+    dict
+        For each string in order, a dictionary with its 1-based index, msg_category, issues as a printable string
+        and, for conversions, the converted string in data (empty if the string had issues). The last dictionary
+        is a summary in standard results format with the string count and the number of strings with issues.
+
+    Notes
+    -----
+    Unlike convert, each valid string is converted even if other strings in the list have issues.
+    """
+
+    schema_version = hed_schema.header_attributes.get('version', 'Unknown version')
+    tag_form = {base_constants.COMMAND_TO_LONG: 'long_tag', base_constants.COMMAND_TO_SHORT: 'short_tag'}.get(command)
+    issue_count = 0
+    for start, chunk in split_chunks(string_list, app_config.get('STRING_BATCH_SIZE', 1000)):
+        unique_list, unique_index = get_unique_strings(chunk)
+        unique_issues, unique_strings = get_string_results(hed_schema, unique_list,
+                                                           check_for_warnings=check_for_warnings, tag_form=tag_form)
+        for pos, index in enumerate(unique_index, start=start):
+            issues = unique_issues[index]
+            result = {'index': pos, 'msg_category': 'warning' if issues else 'success',
+                      'issues': get_printable_issue_string(issues, f"Errors for HED string {pos}:") if issues else ''}
+            if tag_form:
+                result['data'] = unique_strings[index] or ''
+            issue_count += 1 if issues else 0
+            yield result
+    yield {base_constants.COMMAND: command, base_constants.COMMAND_TARGET: 'strings',
+           base_constants.SCHEMA_VERSION: schema_version, 'msg_category': 'warning' if issue_count else 'success',
+           'msg': f'{issue_count} of {len(string_list)} strings had issues' if issue_count else
+           'Strings processed successfully', base_constants.STRING_COUNT: len(string_list),
+           base_constants.ISSUE_COUNT: issue_count}
+
+
+def convert(hed_schema, string_list, command=base_constants.COMMAND_TO_SHORT, check_for_warnings=False,
+            parallel=False):
     """Converts a list of strings from long to short or long to short then converts to short
 
     Parameters
@@ -86,6 +178,8 @@ def convert(hed_schema, string_list, command=base_constants.COMMAND_TO_SHORT, ch
         Name of the command to execute (default to short if unrecognized)
     check_for_warnings: bool
         Indicates whether validation should check for warnings as well as errors
+    parallel: bool
+        Indicates whether a large list may be validated on the process pool (see get_string_results)
 
     Returns
     -------
@@ -94,34 +188,184 @@ def convert(hed_schema, string_list, command=base_constants.COMMAND_TO_SHORT, ch
     """
 
     schema_version = hed_schema.header_attributes.get('version', 'Unknown version')
-    results = validate(hed_schema, string_list, check_for_warnings=check_for_warnings)
-    if results['data']:
-        return results
-    strings = []
-    conversion_errors = []
-    for pos, hed_string_obj in enumerate(string_list, start=1):
-        if command == base_constants.COMMAND_TO_LONG:
-            converted_string, issues = hed_string_obj.convert_to_long(hed_schema)
-        else:
-            converted_string, issues = hed_string_obj.convert_to_short(hed_schema)
-        if issues:
-            conversion_errors.append(get_printable_issue_string(issues, f"Errors for HED string {pos}:"))
-        strings.append(converted_string)
-
-    if conversion_errors:
-        return {base_constants.COMMAND: command,
-                base_constants.COMMAND_TARGET: 'strings',
-                'data': conversion_errors, 'additional_info': string_list,
+    tag_form = 'long_tag' if command == base_constants.COMMAND_TO_LONG else 'short_tag'
+    unique_list, unique_index = get_unique_strings(string_list)
+    unique_issues, unique_strings = get_string_results(hed_schema, unique_list, check_for_warnings=check_for_warnings,
+                                                       tag_form=tag_form, parallel=parallel)
+    validation_errors = get_printable_issue_list(unique_issues, unique_index)
+    if validation_errors:
+        return {base_constants.COMMAND: base_constants.COMMAND_VALIDATE,
+                base_constants.COMMAND_TARGET: 'strings', 'data': validation_errors,
                 base_constants.SCHEMA_VERSION: schema_version, 'msg_category': 'warning',
-                'msg': 'Some strings had conversion errors, results of conversion in additional_info'}
+                'msg': 'Strings had validation errors', **get_dedup_info(string_list, unique_list)}
     else:
         return {base_constants.COMMAND: command,
-                base_constants.COMMAND_TARGET: 'strings', 'data': strings,
+                base_constants.COMMAND_TARGET: 'strings',
+                'data': [unique_strings[index] for index in unique_index],
                 base_constants.SCHEMA_VERSION: schema_version, 'msg_category': 'success',
-                'msg': 'Strings converted successfully'}
+                'msg': 'Strings converted successfully', **get_dedup_info(string_list, unique_list)}
+
+
+def get_dedup_info(string_list, unique_list):
+    """Returns the deduplication counts that are reported in the results of string processing
+
+    Parameters
+    ----------
+    string_list: list
+        The list of HedString that was submitted
+    unique_list: list
+        The distinct strings of string_list that were actually processed
+
+    Returns
+    -------
+    dict
+        A dictionary with the string count, the unique string count and the dedup ratio (strings per unique string)
+    """
+    return {base_constants.STRING_COUNT: len(string_list), base_constants.UNIQUE_STRING_COUNT: len(unique_list),
+            base_constants.DEDUP_RATIO: round(len(string_list) / len(unique_list), 3) if unique_list else 1.0}
+
+
+def get_printable_issue_list(unique_issues, unique_index):
+    """Returns the printable issue strings for every original position of strings that were processed once each
+
+    Parameters
+    ----------
+    unique_issues: list
+        The list of issues for each unique string
+    unique_index: list
+        For each position in the original list, the index of its string in the unique list
+
+    Returns
+    -------
+    list
+        A printable issue string for each original position whose string had issues
+    """
+    return [get_printable_issue_string(unique_issues[index], f"Errors for HED string {pos}:")
+            for pos, index in enumerate(unique_index, start=1) if unique_issues[index]]
+
+
+def get_unique_strings(string_list):
+    """Returns the distinct strings of a list along with the position of each original string in the distinct list
+
+    Parameters
+    ----------
+    string_list: list
+        A list of HedString
+
+    Returns
+    -------
+    tuple
+        (unique_list, unique_index) where unique_list holds the first HedString with each distinct text and
+        unique_index gives for each position of string_list the index of its text in unique_list
+    """
+    positions = {}
+    unique_list = []
+    unique_index = []
+    for hed_string_obj in string_list:
+        text = hed_string_obj.get_original_hed_string()
+        index = positions.get(text)
+        if index is None:
+            index = positions[text] = len(unique_list)
+            unique_list.append(hed_string_obj)
+        unique_index.append(index)
+    return unique_list, unique_index
+
+
+def get_string_results(hed_schema, string_list, check_for_warnings=False, tag_form=None, parallel=False):
+    """Returns the validation issues and optionally the converted form of each string, reusing cached issues
+
+    Parameters
+    ----------
+    hed_schema: HedSchema
+        The HED schema to be used in processing
+    string_list: list
+        A list of distinct HedString to be validated
+    check_for_warnings: bool
+        Indicates whether validation should check for warnings as well as errors
+    tag_form: str or None
+        If given, the tag attribute (long_tag or short_tag) of the form the valid strings are converted to
+    parallel: bool
+        Indicates whether the strings may be validated on the process pool
+
+    Returns
+    -------
+    tuple
+        (string_issues, converted_strings) with the list of issues and the converted string of each string in
+        string_list, in order. A converted string is None if tag_form is None or the string had issues.
 
+    Notes
+    -----
+    Validation leaves the canonical forms of the tags computed, so a string validated here is converted
+    directly from its tags without the second lookup that convert_to_long or convert_to_short would do.
+    Strings whose issues come from the cache are converted with the precomputed tag map of the schema.
+    The cache is keyed by schema content hash, check_for_warnings and the exact original text of the string,
+    since the issues refer to character positions in that text. Schemas without a content hash are not cached.
+    Cached issues are kept in portable form (see get_portable_issue) so that they do not hold the parsed strings,
+    and the byte budget of the cache is charged their approximate size.
+    The parallel option only uses the process pool for at least STRING_BATCH_THRESHOLD uncached strings when
+    the pool has more than one worker and the schema has a content hash. If the pool cannot start its workers
+    or breaks, the strings are validated in this process instead.
+    """
+
+    schema_hash = get_schema_hash(hed_schema)
+    keys = [(schema_hash, check_for_warnings, hed_string_obj.get_original_hed_string())
+            for hed_string_obj in string_list]
+    string_issues = [validation_cache.get(key) for key in keys] if schema_hash else [None] * len(string_list)
+    converted_strings = [None] * len(string_list)
+    missing = [pos for pos, issues in enumerate(string_issues) if issues is None]
+    if tag_form:
+        tag_converter = get_tag_converter(hed_schema)
+        for pos, issues in enumerate(string_issues):
+            if issues is not None and not issues:
+                converted_strings[pos], string_issues[pos] = tag_converter.convert(string_list[pos], tag_form)
+    missing_list = [string_list[pos] for pos in missing]
+    missing_results = None
+    if parallel and schema_hash and process_pool.max_workers > 1 and \
+            len(missing_list) >= (app_config.get('STRING_BATCH_THRESHOLD', None) or 0):
+        try:
+            missing_results = validate_batch(hed_schema, schema_hash, missing_list, check_for_warnings, tag_form)
+        except (BrokenProcessPool, OSError):
+            missing_results = None
+    if missing_results is None:
+        missing_results = validate_strings(get_validator(hed_schema), missing_list, check_for_warnings, tag_form)
+    for pos, (issues, converted_string) in zip(missing, missing_results):
+        if schema_hash:
+            issues = [get_portable_issue(issue) for issue in issues]
+            validation_cache.put(keys[pos], issues, size=len(keys[pos][2]) + get_issues_size(issues))
+        string_issues[pos] = issues
+        converted_strings[pos] = converted_string
+    return string_issues, converted_strings
+
+
+def validate_batch(hed_schema, schema_hash, string_list, check_for_warnings=False, tag_form=None):
+    """Validates a large list of strings in chunks on the process pool and returns the results of each string
 
-def validate(hed_schema, string_list, check_for_warnings=False):
+    Parameters
+    ----------
+    hed_schema: HedSchema
+        The HED schema to be used in processing
+    schema_hash: str
+        The content hash of hed_schema, which identifies the schema held by the pool workers
+    string_list: list
+        A list of HedString to be processed
+    check_for_warnings: bool
+        Indicates whether validation should check for warnings as well as errors
+    tag_form: str or None
+        If given, the tag attribute (long_tag or short_tag) of the form the valid strings are converted to
+
+    Returns
+    -------
+    list
+        An (issues, converted_string) tuple for each string in string_list, in order
+    """
+
+    chunk_size = app_config.get('STRING_BATCH_SIZE', 1000)
+    chunks = [(chunk, check_for_warnings, tag_form) for _, chunk in split_chunks(string_list, chunk_size)]
+    chunk_results = process_pool.map_chunks(validate_strings_chunk, chunks, schema_hash, {'schema': hed_schema})
+    return [result for results in chunk_results for result in results]
+
+
+def validate(hed_schema, string_list, check_for_warnings=False, parallel=False):
     """Validates a list of strings and returns a dictionary containing the issues or a no errors message
 
     Parameters
@@ -132,6 +376,8 @@ def validate(hed_schema, string_list, check_for_warnings=False):
         A list of string to be processed
     check_for_warnings: bool
         Indicates whether validation should check for warnings as well as errors
+    parallel: bool
+        Indicates whether a large list may be validated on the process pool (see get_string_results)
 
     Returns
     -------
@@ -140,20 +386,17 @@ def validate(hed_schema, string_list, check_for_warnings=False):
     """
 
     schema_version = hed_schema.header_attributes.get('version', 'Unknown version')
-    hed_validator = HedValidator(hed_schema=hed_schema)
-
-    validation_errors = []
-    for pos, h_string in enumerate(string_list, start=1):
-        issues = h_string.validate(hed_validator, check_for_warnings=check_for_warnings)
-        if issues:
-            validation_errors.append(get_printable_issue_string(issues, f"Errors for HED string {pos}:"))
+    unique_list, unique_index = get_unique_strings(string_list)
+    unique_issues, _ = get_string_results(hed_schema, unique_list, check_for_warnings=check_for_warnings,
+                                          parallel=parallel)
+    validation_errors = get_printable_issue_list(unique_issues, unique_index)
     if validation_errors:
         return {base_constants.COMMAND: base_constants.COMMAND_VALIDATE,
                 base_constants.COMMAND_TARGET: 'strings', 'data': validation_errors,
                 base_constants.SCHEMA_VERSION: schema_version, 'msg_category': 'warning',
-                'msg': 'Strings had validation errors'}
+                'msg': 'Strings had validation errors', **get_dedup_info(string_list, unique_list)}
     else:
         return {base_constants.COMMAND: base_constants.COMMAND_VALIDATE,
                 base_constants.COMMAND_TARGET: 'strings', 'data': '',
                 base_constants.SCHEMA_VERSION: schema_version, 'msg_category': 'success',
-                'msg': 'Strings validated successfully...'}
+                'msg': 'Strings validated successfully...', **get_dedup_info(string_list, unique_list)}
@@ -0,0 +1,51 @@
+import bisect
+
+
+class TagIndex:
+    """ A sorted-array index of the short and long forms of the tags of a schema for prefix completion. """
+
+    def __init__(self, hed_schema):
+        """ Build the index of hed_schema.
+
+        Args:
+            hed_schema (HedSchema): The schema whose tags are indexed.
+
+        Notes:
+            Takes-value tags are indexed with their # placeholder, for example Duration/#, along with the
+            names of the unit classes of the value.
+
+        """
+        completions = {}
+        for name, entry in hed_schema.all_tags.items():
+            takes_value = name.endswith('#')
+            suffix = '/#' if takes_value else ''
+            completion = {'short_tag': entry.short_tag_name + suffix, 'long_tag': entry.long_tag_name + suffix,
+                          'takes_value': takes_value,
+                          'unit_classes': sorted(entry.unit_classes) if takes_value else []}
+            for tag in (completion['short_tag'], completion['long_tag']):
+                completions[tag.lower()] = dict(completion, tag=tag)
+        self._keys = sorted(completions)
+        self._completions = [completions[key] for key in self._keys]
+
+    def __len__(self):
+        return len(self._keys)
+
+    def complete(self, prefix, limit=10):
+        """ Return the tags that start with prefix in alphabetical order.
+
+        Args:
+            prefix (str): The beginning of a short or long tag. Case and surrounding blanks are ignored.
+            limit (int): The maximum number of completions returned.
+
+        Returns:
+            list: A dictionary for each completion with the matching tag, its short_tag and long_tag, whether it
+                  takes_value and its unit_classes. The dictionaries are shared and must not be modified.
+
+        """
+        key = prefix.strip().lower()
+        completions = []
+        for pos in range(bisect.bisect_left(self._keys, key), len(self._keys)):
+            if len(completions) >= limit or not self._keys[pos].startswith(key):
+                break
+            completions.append(self._completions[pos])
+        return completions
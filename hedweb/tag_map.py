@@ -0,0 +1,125 @@
+from hed.models import HedTag
+
+TAG_FORM_INDEX = {'long_tag': 0, 'short_tag': 1}
+
+
+def build_tag_map(hed_schema):
+    """ Return a map from the lower case text of every plain schema tag to its long and short forms.
+
+    Args:
+        hed_schema (HedSchema): The schema whose tags are mapped.
+
+    Returns:
+        dict: Keys are the lower case short form, long form and any other name the schema accepts for a tag
+              and values are (long_tag_name, short_tag_name) tuples. Placeholder (#) entries are not included.
+
+    """
+    tag_map = {}
+    for name, entry in hed_schema.all_tags.items():
+        if name.endswith('#'):
+            continue
+        forms = (entry.long_tag_name, entry.short_tag_name)
+        tag_map[name.lower()] = forms
+        tag_map[entry.long_tag_name.lower()] = forms
+        tag_map[entry.short_tag_name.lower()] = forms
+    return tag_map
+
+
+class TagConverter:
+    """ Converts HED strings to long or short form using a precomputed tag map, falling back to the schema. """
+
+    def __init__(self, hed_schema, tag_map=None):
+        """ Construct a converter for hed_schema.
+
+        Args:
+            hed_schema (HedSchema): The schema used for tags that are not in the map.
+            tag_map (dict or None): A map returned by build_tag_map for hed_schema. If None, one is built.
+
+        """
+        self.hed_schema = hed_schema
+        self.tag_map = tag_map if tag_map is not None else build_tag_map(hed_schema)
+
+    def canonicalize(self, hed_string_obj):
+        """ Compute the canonical forms of the tags in hed_string_obj that are not in the map.
+
+        Args:
+            hed_string_obj (HedString): The string whose tags are prepared for get_as_form.
+
+        Returns:
+            list: The issues found by the schema converter for the tags that were not in the map.
+
+        Notes:
+            The signature matches a HedOps string function, so this can be passed as hed_ops to the
+            hed_string_iter methods of hedtools, which then add the context of each string to the issues.
+
+        """
+        issues = []
+        for tag in hed_string_obj.get_all_tags():
+            if self.lookup(tag) is None:
+                issues += tag.convert_to_canonical_forms(self.hed_schema)
+        return issues
+
+    def get_as_form(self, hed_string_obj, tag_form):
+        """ Return hed_string_obj with its tags in tag_form after canonicalize has been called on it.
+
+        Args:
+            hed_string_obj (HedString): The string to convert.
+            tag_form (str): long_tag or short_tag. Other tag attributes are taken from the tags themselves.
+
+        Returns:
+            str: The converted string, in the same format as HedString.get_as_form.
+
+        """
+        if tag_form not in TAG_FORM_INDEX:
+            return hed_string_obj.get_as_form(tag_form)
+        return self._join(hed_string_obj, tag_form, TAG_FORM_INDEX[tag_form], None)
+
+    def convert(self, hed_string_obj, tag_form):
+        """ Return hed_string_obj converted to tag_form and the issues found converting it.
+
+        Args:
+            hed_string_obj (HedString): The string to convert.
+            tag_form (str): long_tag or short_tag.
+
+        Returns:
+            tuple: (converted_string, issues) like HedString.convert_to_long and convert_to_short.
+
+        Notes:
+            Looking up, falling back to the schema and joining are done in a single traversal of the string.
+
+        """
+        issues = []
+        return self._join(hed_string_obj, tag_form, TAG_FORM_INDEX[tag_form], issues), issues
+
+    def lookup(self, tag):
+        """ Return the (long_tag_name, short_tag_name) of a plain tag or None if the tag needs the schema.
+
+        Args:
+            tag (HedTag): The tag to look up.
+
+        Returns:
+            tuple or None: The forms of the tag if it is a schema tag without prefix, extension or value.
+
+        """
+        if tag.schema_prefix:
+            return None
+        return self.tag_map.get(str(tag).lower())
+
+    def _join(self, group, tag_form, index, issues):
+        # Mirrors HedGroup.get_as_form. If issues is a list, tags not in the map are converted and their issues added.
+        pieces = []
+        for child in group.children:
+            if isinstance(child, HedTag):
+                forms = self.lookup(child)
+                if forms:
+                    pieces.append(forms[index])
+                    continue
+                if issues is not None:
+                    issues += child.convert_to_canonical_forms(self.hed_schema)
+                pieces.append(getattr(child, tag_form))
+            else:
+                pieces.append(self._join(child, tag_form, index, issues))
+        result = ",".join(pieces)
+        if group.is_group:
+            return f"({result})"
+        return result
@@ -96,11 +96,17 @@ function setOptions() {
     if ($("#validate").is(":checked")) {
         hideOption("expand_defs");
         showOption("check_for_warnings");
+        showOption("unique_rows");
+        showOption("parallel");
+        showOption("stream");
         $("#json_input_section").show();
         $("#schema_pulldown_section").show();
         $("#options_section").show();
     } else if ($("#assemble").is(":checked")) {
         hideOption("check_for_warnings");
+        hideOption("unique_rows");
+        hideOption("parallel");
+        hideOption("stream");
         showOption("expand_defs");
         $("#json_input_section").show();
         $("#schema_pulldown_section").show();
@@ -108,6 +114,9 @@ function setOptions() {
     } else if ($("#generate_sidecar").is(":checked")) {
         hideOption("check_for_warnings");
         hideOption("expand_defs");
+        hideOption("unique_rows");
+        hideOption("parallel");
+        hideOption("stream");
         $("#json_input_section").hide();
         $("#schema_pulldown_section").hide();
         $("#options_section").hide();
@@ -127,6 +136,10 @@ function submitForm() {
     clearFlashMessages();
     flashMessageOnScreen('Event file is being processed ...', 'success',
         'events_submit_flash')
+    if ($("#validate").is(":checked") && $("#stream").is(":checked")) {
+        submitStreamForm(formData, display_name);
+        return;
+    }
     $.ajax({
             type: 'POST',
             url: "{{url_for('route_blueprint.events_results')}}",
@@ -142,4 +155,57 @@ function submitForm() {
             }
         }
     )
-}
\ No newline at end of file
+}
+
+
+/**
+ * Submit the form for streamed validation, reading the results one JSON line at a time as the rows are validated.
+ * The issues of all the chunks of rows are downloaded as an attachment file when the summary line arrives.
+ * @param {Object} formData - The data of the events form with stream on.
+ * @param {String} display_name - The name of the downloaded issues file.
+ */
+function submitStreamForm(formData, display_name) {
+    let decoder = new TextDecoder();
+    let buffer = '';
+    let issues = '';
+    let handleLine = function (line) {
+        let result = JSON.parse(line);
+        if ('start' in result) {
+            issues += result['issues'];
+            flashMessageOnScreen('Validated ' + (result['start'] + result['rows']) + ' rows ...', 'success',
+                'events_submit_flash');
+        } else if ('row_count' in result) {
+            if (issues) {
+                triggerDownloadBlob(issues, display_name, 'text/plain');
+            }
+            flashMessageOnScreen(result['msg'], result['msg_category'], 'events_submit_flash');
+        } else {
+            flashMessageOnScreen(result['message'], 'error', 'events_submit_flash');
+        }
+    };
+    fetch("{{url_for('route_blueprint.events_results')}}", {method: 'POST', body: formData})
+        .then(function (response) {
+            if (response.headers.get('Content-type') !== 'application/x-ndjson') {
+                flashMessageOnScreen(response.headers.get('Message') || 'Unknown processing error occurred',
+                    response.headers.get('Category') || 'error', 'events_submit_flash');
+                return;
+            }
+            let reader = response.body.getReader();
+            let read = function () {
+                return reader.read().then(function (chunk) {
+                    buffer += decoder.decode(chunk.value || new Uint8Array(0), {stream: !chunk.done});
+                    let lines = buffer.split('\n');
+                    buffer = lines.pop();
+                    lines.filter(line => line.trim()).forEach(handleLine);
+                    if (!chunk.done) {
+                        return read();
+                    }
+                });
+            };
+            return read();
+        })
+        .catch(function (error) {
+            flashMessageOnScreen('Streamed validation failed [Source: ' + display_name + '][Error:' + error + ']',
+                'error', 'events_submit_flash');
+        });
+}
@@ -1,8 +1,47 @@
 
+let incrementalTimer = null;
+let completionTimer = null;
+let previousTokenHash = '';
+let schemaHash = '';
+
 $(function () {
     prepareForm();
 });
 
+/**
+ * Validates the string as it is typed, once typing pauses.
+ */
+$('#string_input').on('input', function () {
+    clearTimeout(incrementalTimer);
+    incrementalTimer = setTimeout(validateIncrementally, 250);
+    clearTimeout(completionTimer);
+    completionTimer = setTimeout(completeTag, 150);
+});
+
+/**
+ * Replaces the tag being typed with the completion that was picked.
+ */
+$('#string_completions').change(function () {
+    let completion = $(this).val();
+    if (!completion) {
+        return;
+    }
+    let input = $('#string_input')[0];
+    let start = getTagStart(input.value, input.selectionStart);
+    let tag = completion.endsWith('/#') ? completion.slice(0, -1) : completion;
+    input.value = input.value.slice(0, start) + tag + input.value.slice(input.selectionStart);
+    input.selectionStart = input.selectionEnd = start + tag.length;
+    $(this).prop('hidden', true);
+    input.focus();
+});
+
+/**
+ * Forgets the hash of the uploaded schema when a different schema is chosen.
+ */
+$('#schema_version, #schema_path').on('change', function () {
+    schemaHash = '';
+});
+
 /**
  * Set the options according to the action specified.
  */
@@ -26,6 +65,9 @@ $('#string_submit').on('click', function () {
  */
 function clearForm() {
     $('#string_form')[0].reset();
+    previousTokenHash = '';
+    schemaHash = '';
+    $('#string_completions').empty().prop('hidden', true);
     clearFormFlashMessages();
     $("#validate").prop('checked', true);
     setOptions();
@@ -109,4 +151,108 @@ function submitStringForm() {
             }
         }
     )
-}
\ No newline at end of file
+}
+
+/**
+ * Validate the string typed so far. Only the top-level tags and groups that changed since the previous string
+ * are revalidated by the server, so this is fast enough to run while typing. Only the string fields and the
+ * schema version are sent. An uploaded schema is sent once and then referred to by the hash the server returns.
+ */
+function validateIncrementally() {
+    if (!$("#validate").is(":checked") || !$('#string_input').val()) {
+        flashMessageOnScreen('', 'success', 'string_flash');
+        return;
+    }
+    let formData = getSchemaFormData(['string_input', 'check_for_warnings']);
+    formData.append('previous_hash', previousTokenHash);
+    $.ajax({
+            type: 'POST',
+            url: "{{url_for('route_blueprint.string_incremental_results')}}",
+            data: formData,
+            contentType: false,
+            processData: false,
+            dataType: 'json',
+            success: function (hedInfo) {
+                if (hedInfo['token_hash']) {
+                    previousTokenHash = hedInfo['token_hash'];
+                }
+                schemaHash = hedInfo['schema_hash'] || '';
+                flashMessageOnScreen(hedInfo['msg'], hedInfo['msg_category'], 'string_flash')
+            },
+            error: function () {
+                previousTokenHash = '';
+                schemaHash = '';
+            }
+        }
+    )
+}
+
+/**
+ * Show the schema tags that complete the tag being typed.
+ */
+function completeTag() {
+    let input = $('#string_input')[0];
+    let prefix = input.value.slice(getTagStart(input.value, input.selectionStart), input.selectionStart);
+    let completions = $('#string_completions');
+    if (prefix.trim().length < 2) {
+        completions.empty().prop('hidden', true);
+        return;
+    }
+    let formData = getSchemaFormData([]);
+    formData.append('tag_prefix', prefix);
+    formData.append('limit', '10');
+    $.ajax({
+            type: 'POST',
+            url: "{{url_for('route_blueprint.tag_completions_results')}}",
+            data: formData,
+            contentType: false,
+            processData: false,
+            dataType: 'json',
+            success: function (hedInfo) {
+                schemaHash = hedInfo['schema_hash'] || '';
+                completions.empty();
+                for (const completion of hedInfo['completions'] || []) {
+                    completions.append($('<option>', {value: completion['tag'], text: completion['tag']}));
+                }
+                completions.prop('hidden', completions.children().length === 0);
+            },
+            error: function () {
+                schemaHash = '';
+                completions.empty().prop('hidden', true);
+            }
+        }
+    )
+}
+
+/**
+ * Return form data with the CSRF token, the schema and the named string form fields for the requests made
+ * while typing. An uploaded schema is sent only until the server has returned its hash.
+ */
+function getSchemaFormData(names) {
+    let form = new FormData(document.getElementById("string_form"));
+    let formData = new FormData();
+    for (const name of ['csrf_token', 'schema_version'].concat(names)) {
+        if (form.has(name)) {
+            formData.append(name, form.get(name));
+        }
+    }
+    if (form.get('schema_version') === OTHER_VERSION_OPTION) {
+        if (schemaHash) {
+            formData.append('schema_hash', schemaHash);
+        } else if (form.has('schema_path')) {
+            formData.append('schema_path', form.get('schema_path'));
+        }
+    }
+    return formData;
+}
+
+/**
+ * Return the position in text at which the tag that ends at position end begins.
+ */
+function getTagStart(text, end) {
+    let start = Math.max(text.lastIndexOf(',', end - 1), text.lastIndexOf('(', end - 1)) + 1;
+    while (start < end && text[start] === ' ') {
+        start++;
+    }
+    return start;
+}
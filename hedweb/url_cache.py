@@ -0,0 +1,128 @@
+import hashlib
+import json
+import os
+import time
+from urllib.error import HTTPError, URLError
+from urllib.parse import urlsplit, urlunsplit
+from urllib.request import Request, urlopen
+
+from hed.errors import HedFileError
+from lru_cache import LruCache
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+
+def normalize_url(url):
+    """ Return a canonical form of url for use as a cache key.
+
+    Args:
+        url (str): An http or https URL.
+
+    Returns:
+        str: The URL with a lower case scheme and host, no default port and no fragment.
+
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or '').lower()
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    return urlunsplit((scheme, host, parts.path or '/', parts.query, ''))
+
+
+class UrlCache:
+    """ An in-memory and on-disk cache of downloaded files that revalidates entries with conditional GETs. """
+
+    def __init__(self, cache_folder, ttl=600, timeout=10, max_entries=32):
+        """ Construct a cache that stores its files in cache_folder.
+
+        Args:
+            cache_folder (str): Folder in which downloaded files and their metadata are kept.
+            ttl (float): Number of seconds an entry is used without checking the origin.
+            timeout (float): Number of seconds to wait for the origin to respond.
+            max_entries (int): Maximum number of entries kept in memory.
+
+        """
+        self.cache_folder = cache_folder
+        self.ttl = ttl
+        self.timeout = timeout
+        self._entries = LruCache(max_entries=max_entries)
+
+    def fetch(self, url):
+        """ Return the contents of url, downloading or revalidating it only when the cached copy is older than ttl.
+
+        Args:
+            url (str): The URL of the file.
+
+        Returns:
+            dict: An entry with keys url, content (bytes), content_hash, etag, last_modified and checked.
+
+        Raises:
+            HedFileError: If the file cannot be downloaded and there is no cached copy to fall back on.
+
+        Notes:
+            If the origin cannot be reached or returns a server error, a stale cached copy is returned.
+
+        """
+        key = normalize_url(url)
+        entry = self._entries.get(key) or self._read_entry(key)
+        if entry and time.time() - entry['checked'] < self.ttl:
+            return entry
+        headers = {}
+        if entry and entry['etag']:
+            headers['If-None-Match'] = entry['etag']
+        if entry and entry['last_modified']:
+            headers['If-Modified-Since'] = entry['last_modified']
+        try:
+            with urlopen(Request(key, headers=headers), timeout=self.timeout) as response:
+                content = response.read()
+                entry = {'url': key, 'content': content, 'content_hash': hashlib.sha256(content).hexdigest(),
+                         'etag': response.headers.get('ETag'),
+                         'last_modified': response.headers.get('Last-Modified'), 'checked': time.time()}
+        except HTTPError as ex:
+            if entry and ex.code == 304:
+                entry = dict(entry, checked=time.time())
+            elif entry and ex.code >= 500:
+                return entry
+            else:
+                raise HedFileError('URLDownloadError', f"Could not download {url}: HTTP {ex.code}", url)
+        except (URLError, OSError) as ex:
+            if not entry:
+                raise HedFileError('URLDownloadError', f"Could not download {url}: {ex}", url)
+            return entry
+        self._entries.put(key, entry)
+        self._write_entry(key, entry)
+        return entry
+
+    def _get_paths(self, key):
+        base_path = os.path.join(self.cache_folder, hashlib.sha256(key.encode('utf-8')).hexdigest())
+        return base_path + '.json', base_path + '.data'
+
+    def _read_entry(self, key):
+        meta_path, data_path = self._get_paths(key)
+        try:
+            with open(meta_path, 'r') as fp:
+                entry = json.load(fp)
+            with open(data_path, 'rb') as fp:
+                entry['content'] = fp.read()
+        except (OSError, ValueError):
+            return None
+        if entry.get('url') != key or hashlib.sha256(entry['content']).hexdigest() != entry.get('content_hash'):
+            return None
+        self._entries.put(key, entry)
+        return entry
+
+    def _write_entry(self, key, entry):
+        meta_path, data_path = self._get_paths(key)
+        meta = {name: value for name, value in entry.items() if name != 'content'}
+        suffix = f".{os.getpid()}.tmp"
+        try:
+            os.makedirs(self.cache_folder, exist_ok=True)
+            with open(data_path + suffix, 'wb') as fp:
+                fp.write(entry['content'])
+            os.replace(data_path + suffix, data_path)
+            with open(meta_path + suffix, 'w') as fp:
+                json.dump(meta, fp)
+            os.replace(meta_path + suffix, meta_path)
+        except OSError:
+            pass
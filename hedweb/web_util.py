@@ -2,12 +2,12 @@ import io
 import json
 import os
 from urllib.parse import urlparse
-from flask import current_app, Response, make_response
+from flask import current_app, Response, make_response, stream_with_context
 from werkzeug.utils import secure_filename
 
-from hed import schema as hedschema
 from hed.errors import HedFileError
 from constants import base_constants, file_constants
+from schema_loader import get_schema_from_string, get_schema_from_version
 
 app_config = current_app.config
 
@@ -132,8 +132,8 @@ def generate_download_file_from_text(download_text, display_name=None,
     def generate():
         if header:
             yield header
-        for issue in download_text.splitlines(True):
-            yield issue
+        for start in range(0, len(download_text), file_constants.DOWNLOAD_CHUNK_SIZE):
+            yield download_text[start:start + file_constants.DOWNLOAD_CHUNK_SIZE]
 
     return Response(generate(), mimetype='text/plain charset=utf-8',
                     headers={'Content-Disposition': f"attachment filename={display_name}",
@@ -160,6 +160,31 @@ def generate_download_spreadsheet(results,  msg_category='success', msg=''):
     return response
 
 
+def generate_ndjson_response(results):
+    """Generates a streamed response with one JSON object per line
+
+    Parameters
+    ----------
+    results: iterable
+        The dictionaries to send, which are produced as the response is written
+
+    Returns
+    -------
+    Response
+        A response with mimetype application/x-ndjson. If producing the results raises an exception,
+        the last line is the error in the format returned by handle_error.
+
+    """
+    def generate():
+        try:
+            for result in results:
+                yield json.dumps(result) + '\n'
+        except Exception as ex:
+            yield handle_error(ex) + '\n'
+
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+
 def generate_text_response(download_text, msg_category='success', msg=''):
     """Generates a download other response.
 
@@ -200,13 +225,12 @@ def get_hed_schema_from_pull_down(request):
     if base_constants.SCHEMA_VERSION not in request.form:
         raise HedFileError("NoSchemaError", "Must provide a valid schema or schema version", "")
     elif request.form[base_constants.SCHEMA_VERSION] != base_constants.OTHER_VERSION_OPTION:
-        hed_file_path = hedschema.get_path_from_hed_version(request.form[base_constants.SCHEMA_VERSION])
-        hed_schema = hedschema.load_schema(hed_file_path)
+        hed_schema = get_schema_from_version(request.form[base_constants.SCHEMA_VERSION])
     elif request.form[base_constants.SCHEMA_VERSION] == \
             base_constants.OTHER_VERSION_OPTION and base_constants.SCHEMA_PATH in request.files:
         f = request.files[base_constants.SCHEMA_PATH]
-        hed_schema = hedschema.from_string(f.read(file_constants.BYTE_LIMIT).decode('ascii'),
-                                           file_type=secure_filename(f.filename))
+        hed_schema = get_schema_from_string(f.read(file_constants.BYTE_LIMIT).decode('ascii'),
+                                            file_type=secure_filename(f.filename))
     else:
         raise HedFileError("NoSchemaFile", "Must provide a valid schema for upload if other chosen", "")
     return hed_schema
@@ -176,6 +176,86 @@ class Test(TestWebBase):
             self.assertEqual('success', results['msg_category'],
                              'make_query msg_category should be success when no errors')
 
+    def test_events_search_cached(self):
+        from unittest import mock
+        import events
+        from schema_loader import get_schema_from_version
+        events_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data/bids_events.tsv')
+        json_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data/bids_events.json')
+        with self.app.app_context():
+            hed_schema = get_schema_from_version('8.0.0')
+            events.assembly_cache.clear()
+            results = []
+            with mock.patch.object(events, 'get_assembled_strings', wraps=events.get_assembled_strings) as assembled:
+                for query in ['Sensory-event', 'Sensory-event', 'Agent-action and Hand']:
+                    json_sidecar = Sidecar(file=json_path, name='bids_json')
+                    tabular_input = TabularInput(file=events_path, sidecar=json_sidecar, name='bids_events')
+                    results.append(events.search(hed_schema, tabular_input, query, sidecar=json_sidecar))
+            self.assertEqual(1, assembled.call_count, "An events file should only be assembled once for searches")
+            self.assertEqual(results[0], results[1], "A repeated search should give the same results")
+            self.assertTrue(results[2]['data'], "A different query should be evaluated on the cached events")
+            self.assertNotEqual(results[0]['data'], results[2]['data'], "Different queries should match differently")
+
+    def test_events_search_cached_names(self):
+        import events
+        from schema_loader import get_schema_from_version
+        events_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data/bids_events.tsv')
+        json_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data/bids_events_bad.json')
+        with self.app.app_context():
+            hed_schema = get_schema_from_version('8.0.0')
+            events.assembly_cache.clear()
+            for name in ['sub-01_events', 'sub-02_events']:
+                json_sidecar = Sidecar(file=json_path, name=f'{name}_json')
+                tabular_input = TabularInput(file=events_path, sidecar=json_sidecar, name=name)
+                results = events.search(hed_schema, tabular_input, 'Sensory-event', sidecar=json_sidecar)
+                self.assertEqual('warning', results['msg_category'], "The invalid sidecar should be reported")
+                self.assertIn(name, results['msg'], "The message should name the events file that was searched")
+                self.assertIn(name, results['output_display_name'], "The errors should be named after the events")
+
+    def test_events_search_multiple(self):
+        import io
+        import pandas as pd
+        import events
+        from schema_loader import get_schema_from_version
+        events_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data/bids_events.tsv')
+        json_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data/bids_events.json')
+        query_list = ['Sensory-event', 'Agent-action and Hand', 'Sensory-event or Agent-action']
+        with self.app.app_context():
+            hed_schema = get_schema_from_version('8.0.0')
+            json_sidecar = Sidecar(file=json_path, name='bids_json')
+            tabular_input = TabularInput(file=events_path, sidecar=json_sidecar, name='bids_events')
+            results = events.search_multiple(hed_schema, tabular_input, query_list, columns_included=['onset'],
+                                             sidecar=json_sidecar)
+            self.assertEqual('success', results['msg_category'], "Valid queries should be searched")
+            df = pd.read_csv(io.StringIO(results['data']), sep='\t', dtype=str)
+            self.assertEqual(['row_number', 'onset'] + query_list, list(df.columns),
+                             "The results should have a match column per query after the included columns")
+            self.assertEqual(len(tabular_input.dataframe), len(df), "The results should have a row per event")
+            for query in query_list:
+                single = events.search(hed_schema, tabular_input, query, sidecar=json_sidecar)
+                rows = list(pd.read_csv(io.StringIO(single['data']), sep='\t')['row_number'])
+                self.assertEqual(rows, list(df.index[df[query] == '1']),
+                                 "Each match column should have the events found by searching for its query")
+            results = events.search_multiple(hed_schema, tabular_input, ['Sensory-event', 'Blech-multiple'])
+            self.assertEqual('warning', results['msg_category'], "An invalid query in the list should be reported")
+            self.assertIn('Blech-multiple', results['data'], "The invalid query should be named")
+
+    def test_events_validate_query(self):
+        from events import compile_query, validate_query
+        from schema_loader import get_schema_from_version
+        with self.app.app_context():
+            hed_schema = get_schema_from_version('8.0.0')
+            results = validate_query(hed_schema, 'Sensory-event and ([[Red, Square]] or ~Agent-action)')
+            self.assertEqual('success', results['msg_category'], "A query of schema terms should be valid")
+            self.assertIs(compile_query(hed_schema, 'Sensory-event')[0], compile_query(hed_schema, 'Sensory-event')[0],
+                          "A query should only be parsed once per schema")
+            results = validate_query(hed_schema, 'Sensory-event and Blech-term')
+            self.assertEqual('warning', results['msg_category'], "A query with an unknown term should be invalid")
+            self.assertIn("'blech-term'", results['data'], "The unknown term should be reported")
+            results = validate_query(hed_schema, '(Sensory-event or Red')
+            self.assertEqual('warning', results['msg_category'], "A query that does not parse should be invalid")
+            self.assertIn('parsed', results['data'], "The parse error should be reported")
+
     def test_events_validate_invalid(self):
         from events import validate
         events_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data/bids_events.tsv')
@@ -191,6 +271,152 @@ class Test(TestWebBase):
             self.assertEqual('warning', results["msg_category"],
                              'validate msg_category should be warning when errors')
 
+    def test_events_validate_cached_sidecar(self):
+        from unittest import mock
+        from events import validate
+        from schema_loader import get_schema_from_version
+        from sidecar import validation_cache
+        events_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data/bids_events.tsv')
+        json_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data/bids_events.json')
+        with self.app.app_context():
+            hed_schema = get_schema_from_version('8.0.0')
+            validation_cache.clear()
+            for run in range(3):
+                json_sidecar = Sidecar(file=json_path, name='bids_events')
+                events = TabularInput(file=events_path, sidecar=json_sidecar, name=f'sub-0{run}_events')
+                with mock.patch.object(Sidecar, 'validate_entries', wraps=json_sidecar.validate_entries) as entries:
+                    results = validate(hed_schema, events, json_sidecar)
+                self.assertEqual(1 if run == 0 else 0, entries.call_count,
+                                 "A sidecar shared by events files should only be validated once")
+                self.assertEqual('success', results['msg_category'], "The cached sidecar should still be valid")
+                self.assertIn(f'sub-0{run}_events', results['msg'], "The events file should still be validated")
+
+    def test_events_process_stream_closes_file(self):
+        import io
+        from events import process_stream
+        from schema_loader import get_schema_from_version
+        events_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data/bids_events.tsv')
+        with open(events_path, 'r') as fp:
+            events_text = fp.read()
+        with self.app.app_context():
+            arguments = {base_constants.SCHEMA: get_schema_from_version('8.0.0'),
+                         base_constants.COMMAND: base_constants.COMMAND_VALIDATE,
+                         base_constants.EVENTS_FILE: io.StringIO(events_text)}
+            results = list(process_stream(arguments))
+            self.assertEqual(21, results[-1][base_constants.ROW_COUNT], "The summary should count the rows")
+            self.assertTrue(arguments[base_constants.EVENTS_FILE].closed,
+                            "The events file should be closed when the results are finished")
+            arguments[base_constants.EVENTS_FILE] = io.StringIO(events_text)
+            results = process_stream(arguments)
+            next(results)
+            results.close()
+            self.assertTrue(arguments[base_constants.EVENTS_FILE].closed,
+                            "The events file should be closed when the results are abandoned")
+
+    def test_events_validate_chunks(self):
+        import io
+        import pandas as pd
+        from events import validate_chunks
+        from schema_loader import get_schema_from_version, get_validator
+        events_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data/bids_events.tsv')
+        json_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data/bids_events.json')
+        df = pd.read_csv(events_path, sep='\t', dtype=str, keep_default_na=False)
+        df['HED'] = 'n/a'
+        df.loc[1, 'HED'] = '(Definition/Chunk-def, (Red))'
+        df.loc[2, 'HED'] = 'Blech/Chunk'
+        df.loc[5, 'HED'] = '(Def/Chunk-def, Onset)'
+        df.loc[12, 'HED'] = '(Def/Chunk-def, Offset)'
+        df.loc[14, 'HED'] = '(Def/Chunk-def, Offset)'
+        events_text = df.to_csv(sep='\t', index=False)
+        with self.app.app_context():
+            validator = get_validator(get_schema_from_version('8.0.0'))
+            json_sidecar = Sidecar(file=json_path, name='bids_events')
+            events = TabularInput(file=io.StringIO(events_text), sidecar=json_sidecar, name='bids_events_chunks')
+            expected = [(issue.get('ec_row'), issue['code']) for issue in events.validate_file(validator)]
+            self.assertEqual(2, len(expected), "The events file should have an invalid tag and an extra offset")
+            for chunk_size in (1, 4, 100):
+                chunks = list(validate_chunks(validator, io.StringIO(events_text), json_sidecar,
+                                              name='bids_events_chunks', chunk_size=chunk_size))
+                self.assertEqual(len(df), sum(rows for _, rows, _ in chunks), "The chunks should cover every row")
+                self.assertEqual(expected, [(issue.get('ec_row'), issue['code'])
+                                            for _, _, issues in chunks for issue in issues],
+                                 "Validating in chunks should report the same issues on the same rows")
+
+    def test_events_validate_parallel(self):
+        import io
+        from unittest import mock
+        import pandas as pd
+        import events
+        from events import validate
+        from process_pool import SchemaProcessPool
+        from schema_loader import get_schema_from_version
+        events_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data/bids_events.tsv')
+        json_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data/bids_events.json')
+        df = pd.read_csv(events_path, sep='\t', dtype=str, keep_default_na=False)
+        df['HED'] = 'n/a'
+        df.loc[1, 'HED'] = '(Definition/Parallel-def, (Red))'
+        df.loc[3, 'HED'] = 'Def/Parallel-def, Blech/Parallel'
+        df.loc[5, 'HED'] = '(Def/Parallel-def, Onset)'
+        df.loc[12, 'HED'] = '(Def/Parallel-def, Offset)'
+        df.loc[14, 'HED'] = '(Def/Parallel-def, Offset)'
+        events_text = df.to_csv(sep='\t', index=False)
+        df['HED'] = ['(Def/Parallel-def, Onset)' if row % 2 else '(Def/Parallel-def, Offset)' for row in range(len(df))]
+        df.loc[0, 'HED'] = '(Definition/Parallel-def, (Red)), (Def/Parallel-def, Onset)'
+        temporal_text = df.to_csv(sep='\t', index=False)
+        with self.app.app_context():
+            hed_schema = get_schema_from_version('8.0.0')
+            json_sidecar = Sidecar(file=json_path, name='bids_events')
+            serial_results = [validate(hed_schema, TabularInput(file=io.StringIO(text), sidecar=json_sidecar,
+                                                                name='bids_events_parallel'), json_sidecar)
+                              for text in (events_text, temporal_text)]
+            saved_pool, saved_config = events.process_pool, dict(events.app_config)
+            events.process_pool = SchemaProcessPool(max_workers=2)
+            events.app_config.update({'EVENTS_PARALLEL_THRESHOLD': 2, 'EVENTS_CHUNK_SIZE': 4})
+            try:
+                with mock.patch.object(events.process_pool, 'map_chunks') as map_chunks:
+                    validate(hed_schema, TabularInput(file=io.StringIO(events_text), sidecar=json_sidecar,
+                                                      name='bids_events_parallel'), json_sidecar)
+                map_chunks.assert_not_called()
+                parallel_results = [validate(hed_schema, TabularInput(file=io.StringIO(text), sidecar=json_sidecar,
+                                                                      name='bids_events_parallel'), json_sidecar,
+                                             parallel=True)
+                                    for text in (events_text, temporal_text)]
+            finally:
+                events.process_pool.shutdown()
+                events.process_pool = saved_pool
+                events.app_config.clear()
+                events.app_config.update(saved_config)
+        self.assertEqual('warning', serial_results[0]['msg_category'], "The events file should have issues")
+        self.assertEqual(serial_results, parallel_results,
+                         "Validating on the process pool should give the same results as validating serially")
+
+    def test_events_validate_unique_rows(self):
+        import io
+        import pandas as pd
+        from events import validate, validate_unique_rows
+        from schema_loader import get_schema_from_version, get_validator
+        events_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data/bids_events.tsv')
+        json_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data/bids_events.json')
+        df = pd.read_csv(events_path, sep='\t', dtype=str, keep_default_na=False)
+        df['HED'] = 'n/a'
+        df.loc[2, 'HED'] = 'Blech/Unique'
+        df.loc[5, 'HED'] = '(Def/Unique-def, Onset)'
+        df = pd.concat([df] * 10, ignore_index=True)
+        with self.app.app_context():
+            hed_schema = get_schema_from_version('8.0.0')
+            validator = get_validator(hed_schema)
+            json_sidecar = Sidecar(file=json_path, name='bids_events')
+            events = TabularInput(file=io.StringIO(df.to_csv(sep='\t', index=False)), sidecar=json_sidecar,
+                                  name='bids_events_unique')
+            expected = events.validate_file(validator)
+            issues = validate_unique_rows(validator, events, json_sidecar)
+            self.assertTrue(expected, "The events file should have row errors")
+            self.assertEqual([(issue.get('ec_row'), issue['code'], issue['message']) for issue in expected],
+                             [(issue.get('ec_row'), issue['code'], issue['message']) for issue in issues],
+                             "Validating distinct rows should report the same issues on the same rows")
+            results = validate(hed_schema, events, json_sidecar, unique_rows=True)
+            self.assertEqual('warning', results['msg_category'], "validate with unique rows should report errors")
+
     def test_events_validate_valid(self):
         from events import validate
         events_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data/bids_events.tsv')
@@ -0,0 +1,53 @@
+import os
+import unittest
+from unittest import mock
+import hed.schema as hedschema
+from hed.models import Sidecar, TabularInput, TagExpressionParser
+from hed.tools import get_assembled_strings
+from events_index import EventsIndex
+
+
+class Test(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        data_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+        hed_schema = hedschema.load_schema(os.path.join(data_dir, 'HED8.0.0.xml'))
+        sidecar = Sidecar(file=os.path.join(data_dir, 'bids_events.json'), name='bids_json')
+        events = TabularInput(file=os.path.join(data_dir, 'bids_events.tsv'), sidecar=sidecar, name='bids_events')
+        cls.hed_list = get_assembled_strings(events, hed_schema=hed_schema, expand_defs=True)[0]
+        cls.index = EventsIndex(cls.hed_list)
+
+    def get_full_rows(self, expression):
+        return [row for row, hed_string in enumerate(self.hed_list) if expression.search_hed_string(hed_string)]
+
+    def test_index_ancestors(self):
+        self.assertEqual(len(self.hed_list), self.index.row_count, "The index should have a row per string")
+        sensory = self.index.search(TagExpressionParser('Sensory-event'), self.hed_list)
+        event = self.index.search(TagExpressionParser('Event'), self.hed_list)
+        self.assertTrue(sensory, "Rows with a tag should be found by the tag")
+        self.assertTrue(set(sensory).issubset(event), "Rows with a tag should be found by its ancestors")
+        self.assertFalse(self.index.search(TagExpressionParser('Blech-index'), self.hed_list),
+                         "A term in no string should match no rows")
+
+    def test_search_bitsets(self):
+        queries = ['Sensory-event', 'Agent-action and Hand', 'Red or Feedback', '(Cue or Press) and Mouse-button',
+                   'Def and Sensory-event']
+        for query in queries:
+            expression = TagExpressionParser(query)
+            with mock.patch.object(expression, 'search_hed_string') as search_hed_string:
+                rows = self.index.search(expression, self.hed_list)
+            search_hed_string.assert_not_called()
+            self.assertEqual(self.get_full_rows(expression), rows,
+                             f"The bitsets of {query} should give the rows that satisfy it")
+
+    def test_search_fallback(self):
+        queries = ['[[Press, Mouse-button]]', '[Hand, Torso]', '~Hand', 'Sensory-event and [[Intended-effect, Reward]]',
+                   'Agent-action and ~Press']
+        for query in queries:
+            expression = TagExpressionParser(query)
+            self.assertEqual(self.get_full_rows(expression), self.index.search(expression, self.hed_list),
+                             f"The query {query} should be evaluated on the candidate rows")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import unittest
+from lru_cache import LruCache
+
+
+class Test(unittest.TestCase):
+    def test_get_put(self):
+        cache = LruCache(max_entries=2)
+        self.assertIsNone(cache.get('a'), "get should return None for a missing key")
+        cache.put('a', 1)
+        self.assertEqual(1, cache.get('a'), "get should return the stored value")
+        self.assertIn('a', cache, "The cache should contain a stored key")
+        stats = cache.get_stats()
+        self.assertEqual(1, stats['hits'], "get_stats should count hits")
+        self.assertEqual(1, stats['misses'], "get_stats should count misses")
+
+    def test_eviction(self):
+        cache = LruCache(max_entries=2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        cache.get('a')
+        cache.put('c', 3)
+        self.assertNotIn('b', cache, "The least recently used entry should be evicted")
+        self.assertIn('a', cache, "A recently used entry should not be evicted")
+        self.assertEqual(2, len(cache), "The cache should not exceed its maximum number of entries")
+        self.assertEqual(1, cache.get_stats()['evictions'], "get_stats should count evictions")
+
+    def test_remove_if(self):
+        cache = LruCache(max_entries=4)
+        for key in range(4):
+            cache.put(key, key)
+        removed = cache.remove_if(lambda key: key % 2 == 0)
+        self.assertEqual(2, removed, "remove_if should return the number of entries removed")
+        self.assertEqual([1, 3], cache.keys(), "remove_if should only remove the matching entries")
+        cache.clear()
+        self.assertEqual(0, len(cache), "clear should empty the cache")
+
+    def test_byte_budget(self):
+        cache = LruCache(max_entries=10, max_bytes=100)
+        cache.put('a', 1, size=60)
+        cache.put('b', 2, size=30)
+        self.assertEqual(90, cache.get_stats()['bytes'], "get_stats should report the bytes in use")
+        cache.put('c', 3, size=30)
+        self.assertNotIn('a', cache, "The least recently used entry should be evicted when over the byte budget")
+        self.assertEqual(60, cache.total_bytes, "Evicted entries should no longer count against the budget")
+        self.assertFalse(cache.put('d', 4, size=101), "put should refuse an entry larger than the budget")
+        self.assertNotIn('d', cache, "An entry larger than the budget should not be stored")
+        cache.put('b', 5, size=10)
+        self.assertEqual(40, cache.total_bytes, "Replacing an entry should replace its size")
+
+    def test_on_remove(self):
+        removed = []
+        cache = LruCache(max_entries=2, on_remove=lambda key, value: removed.append((key, value)))
+        cache.put('a', 1)
+        cache.put('b', 2)
+        cache.put('c', 3)
+        self.assertEqual([('a', 1)], removed, "on_remove should be called for an evicted entry")
+        cache.put('b', 4)
+        cache.remove('c')
+        self.assertEqual([('a', 1), ('b', 2), ('c', 3)], removed,
+                         "on_remove should be called for replaced and removed entries")
+        cache.clear()
+        self.assertEqual(('b', 4), removed[-1], "on_remove should be called for the entries that are cleared")
+
+    def test_bad_size(self):
+        self.assertRaises(ValueError, LruCache, max_entries=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+import os
+import pickle
+import unittest
+from concurrent.futures.process import BrokenProcessPool
+import hed.schema as hedschema
+from hed.models import HedString
+from hed.validator import HedValidator
+from hed.errors import get_printable_issue_string
+from process_pool import SchemaProcessPool, init_worker, split_chunks, validate_events_chunk, validate_rows, validate_strings, \
+    validate_strings_chunk
+
+
+class Test(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        schema_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data/HED8.0.0.xml')
+        cls.hed_schema = hedschema.load_schema(schema_path)
+        cls.pool = SchemaProcessPool(max_workers=2)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.pool.shutdown()
+
+    def test_split_chunks(self):
+        chunks = split_chunks(list(range(7)), 3)
+        self.assertEqual([(1, [0, 1, 2]), (4, [3, 4, 5]), (7, [6])], chunks,
+                         "split_chunks should return 1-based starts and consecutive chunks")
+        self.assertEqual([], split_chunks([], 3), "split_chunks of an empty list should be empty")
+
+    def test_default_start_method(self):
+        self.assertIn(SchemaProcessPool().start_method, ('forkserver', 'spawn'),
+                      "The pool should not fork the threaded server process by default")
+        self.assertEqual('fork', SchemaProcessPool(start_method='fork').start_method,
+                         "An explicit start method should be used")
+
+    def test_map_chunks_matches_serial(self):
+        string_list = [HedString(text) for text in ['Red', 'Blech', 'Blue', 'Red, Blue/Apple', 'Green', 'Junk']]
+        validator = HedValidator(hed_schema=self.hed_schema)
+        expected = [get_printable_issue_string(hed_string_obj.validate(validator, check_for_warnings=False))
+                    for hed_string_obj in string_list]
+        chunks = [(chunk, False, None) for _, chunk in split_chunks(string_list, 2)]
+        results = self.pool.map_chunks(validate_strings_chunk, chunks, 'schema-a', {'schema': self.hed_schema})
+        self.assertEqual(len(chunks), len(results), "map_chunks should return one result per chunk")
+        self.assertEqual(expected, [get_printable_issue_string(issues) for chunk in results for issues, _ in chunk],
+                         "Validating in chunks on the pool should give the same issues as validating serially")
+
+    def test_validate_strings_chunk_portable(self):
+        init_worker(pickle.dumps({'schema': self.hed_schema}))
+        results = validate_strings_chunk(([HedString('Red'), HedString('Blech, Blue/Apple')], False, None))
+        self.assertTrue(results[1][0], "An invalid string should have issues")
+        self.assertLess(len(pickle.dumps(results)), 10000,
+                        "The issues returned from a worker should not pickle the parsed strings or the schema")
+
+    def test_validate_strings_convert(self):
+        validator = HedValidator(hed_schema=self.hed_schema)
+        string_list = [HedString('Red, (Blue, Square)'), HedString('Blech')]
+        results = validate_strings(validator, string_list, tag_form='short_tag')
+        self.assertEqual(HedString('Red, (Blue, Square)').convert_to_short(self.hed_schema)[0], results[0][1],
+                         "A valid string should be converted in the same pass as validation")
+        self.assertFalse(results[0][0], "A valid string should have no issues")
+        self.assertTrue(results[1][0], "An invalid string should have issues")
+        self.assertIsNone(results[1][1], "An invalid string should not be converted")
+        results = validate_strings(validator, [HedString('Red')], tag_form='long_tag')
+        self.assertEqual(HedString('Red').convert_to_long(self.hed_schema)[0], results[0][1],
+                         "A valid string should be converted to long form when requested")
+
+    def test_map_chunks_events(self):
+        from hed.models import Sidecar
+        json_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data/bids_events.json')
+        with open(json_path, 'r') as fp:
+            sidecar_string = fp.read()
+        sidecar = Sidecar(file=json_path, name='bids_events')
+        validator = HedValidator(hed_schema=self.hed_schema)
+        events_text = 'onset\tevent_type\tHED\n1.0\tcue\tBlech\n2.0\tgo\tRed\n3.0\tjunk\t(Red, Red)\n'
+        rows = [4, 9, 12]
+        expected = validate_rows(validator, events_text, rows, sidecar=sidecar, name='pool_events')
+        self.assertEqual([4, 12], sorted({issue['ec_row'][0] for issue in expected}),
+                         "validate_rows should report issues by their row in the whole file")
+        results = self.pool.map_chunks(validate_events_chunk, [(events_text, rows, None, False, 'pool_events')],
+                                       'schema-events', {'schema': self.hed_schema, 'sidecar_string': sidecar_string})
+        self.assertEqual(get_printable_issue_string(expected), get_printable_issue_string(results[0]),
+                         "Validating events rows on the pool should give the same issues as validating serially")
+
+    def test_map_chunks_broken_pool(self):
+        pool = SchemaProcessPool(max_workers=2)
+        try:
+            self.assertRaises(BrokenProcessPool, pool.map_chunks, os._exit, [1], 'schema-d', {})
+            self.assertIsNone(pool._executor, "A broken pool should be shut down")
+            self.assertEqual([1], pool.map_chunks(abs, [-1], 'schema-d', {}), "The pool should start new workers")
+        finally:
+            pool.shutdown()
+
+    def test_map_chunks_reuses_workers(self):
+        chunks = [([HedString('Red')], False, None)]
+        self.pool.map_chunks(validate_strings_chunk, chunks, 'schema-b', {'schema': self.hed_schema})
+        executor = self.pool._executor
+        self.pool.map_chunks(validate_strings_chunk, chunks, 'schema-b', {'schema': self.hed_schema})
+        self.assertIs(executor, self.pool._executor, "The pool should be reused for the same data key")
+        self.pool.map_chunks(validate_strings_chunk, chunks, 'schema-c', {'schema': self.hed_schema})
+        self.assertIsNot(executor, self.pool._executor, "The pool should be recreated for a new data key")
+
+
+if __name__ == '__main__':
+    unittest.main()
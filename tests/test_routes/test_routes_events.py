@@ -1,4 +1,5 @@
 import io
+import json
 import os
 import unittest
 from flask import Response
@@ -100,6 +101,38 @@ class Test(TestWebBase):
             json_buffer.close()
             events_buffer.close()
 
+    def test_events_results_validate_stream(self):
+        json_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '../data/bids_events.json')
+        events_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '../data/bids_events.tsv')
+
+        with open(json_path, 'r') as sc:
+            x = sc.read()
+        json_buffer = io.BytesIO(bytes(x, 'utf-8'))
+
+        with open(events_path, 'r') as sc:
+            y = sc.read()
+        events_buffer = io.BytesIO(bytes(y, 'utf-8'))
+
+        with self.app.app_context():
+            from events import app_config
+            app_config['EVENTS_CHUNK_SIZE'] = 8
+            input_data = {base_constants.SCHEMA_VERSION: '8.0.0',
+                          base_constants.COMMAND_OPTION: base_constants.COMMAND_VALIDATE,
+                          base_constants.JSON_FILE: (json_buffer, 'bids_events.json'),
+                          base_constants.EVENTS_FILE: (events_buffer, 'bids_events.tsv'),
+                          base_constants.STREAM: 'on'}
+            response = self.app.test.post('/events_submit', content_type='multipart/form-data', data=input_data)
+            app_config['EVENTS_CHUNK_SIZE'] = 10000
+            self.assertEqual(200, response.status_code, 'A streamed events validation has a valid status code')
+            self.assertEqual('application/x-ndjson', response.mimetype, "A streamed response is NDJSON")
+            lines = [json.loads(line) for line in response.data.decode('utf-8').splitlines()]
+            self.assertEqual([0, 8, 16], [line['start'] for line in lines[:-1]],
+                             "A streamed response has a line per chunk of rows")
+            self.assertEqual(21, lines[-1][base_constants.ROW_COUNT], "The summary line counts the rows")
+            self.assertEqual('success', lines[-1]['msg_category'], "The valid events file should have no issues")
+            json_buffer.close()
+            events_buffer.close()
+
     def test_events_results_validate_invalid(self):
         json_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '../data/bids_events.json')
         events_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '../data/bids_events.tsv')
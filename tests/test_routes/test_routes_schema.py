@@ -193,6 +193,30 @@ class Test(TestWebBase):
             self.assertTrue(headers_dict['Content-Disposition'],
                             "Validation of valid gen2 xml should return validation error file")
 
+    def test_tag_completions_results(self):
+        import json
+        from constants import base_constants
+        with self.app.app_context():
+            input_data = {base_constants.SCHEMA_VERSION: '8.0.0', base_constants.TAG_PREFIX: 'Sensory-',
+                          base_constants.LIMIT: '2'}
+            response = self.app.test.post('/tag_completions', content_type='multipart/form-data', data=input_data)
+            self.assertEqual(200, response.status_code, 'Tag completion has a response')
+            response_dict = json.loads(response.data)
+            self.assertEqual('8.0.0', response_dict[base_constants.SCHEMA_VERSION], "The schema version is returned")
+            completions = response_dict[base_constants.COMPLETIONS]
+            self.assertEqual(2, len(completions), "The completions should be limited")
+            self.assertTrue(completions[0]['tag'].startswith('Sensory-'), "The completions match the prefix")
+            self.assertTrue(response_dict[base_constants.SCHEMA_HASH], "The response has the hash of the schema")
+            other_data = {base_constants.SCHEMA_VERSION: base_constants.OTHER_VERSION_OPTION,
+                          base_constants.SCHEMA_HASH: response_dict[base_constants.SCHEMA_HASH],
+                          base_constants.TAG_PREFIX: 'Sensory-', base_constants.LIMIT: '2'}
+            response = self.app.test.post('/tag_completions', content_type='multipart/form-data', data=other_data)
+            self.assertEqual(completions, json.loads(response.data)[base_constants.COMPLETIONS],
+                             "The hash of a loaded schema should stand in for an uploaded schema")
+            input_data[base_constants.LIMIT] = 'many'
+            response = self.app.test.post('/tag_completions', content_type='multipart/form-data', data=input_data)
+            self.assertTrue(json.loads(response.data)['message'], "A bad limit should be reported")
+
     # TODO: Uncomment when version 8.0.1 is released --- it should work
     # def test_schema_results_validate_xml_url_valid(self):
     #     schema_url = \
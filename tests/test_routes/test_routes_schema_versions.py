@@ -18,6 +18,30 @@ class Test(TestWebBase):
             v_list = v_dict["schema_version_list"]
             self.assertIsInstance(v_list, list, "The versions are in a list")
 
+    def test_schema_versions_conditional(self):
+        with self.app.app_context():
+            response = self.app.test.get('/schema_versions')
+            self.assertEqual(200, response.status_code, 'The HED version list can be retrieved with GET')
+            etag = response.headers.get('ETag')
+            self.assertTrue(etag, "The HED version list response should have an ETag")
+            self.assertTrue(response.headers.get('Last-Modified'),
+                            "The HED version list response should have a Last-Modified header")
+            response = self.app.test.get('/schema_versions', headers={'If-None-Match': etag})
+            self.assertEqual(304, response.status_code, 'An unchanged HED version list should not be resent')
+            self.assertFalse(response.data, "A not modified response should have no body")
+
+    def test_schema_version_results_mediawiki(self):
+        with self.app.app_context():
+            schema_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '../data/HED8.0.1.mediawiki')
+            with open(schema_path, 'rb') as sc:
+                y = io.BytesIO(sc.read())
+            the_file = FileStorage(stream=y, filename='HED8.0.1.mediawiki')
+            response = self.app.test.post('/schema_version', content_type='multipart/form-data',
+                                          data={'schema_path': the_file})
+            self.assertEqual(200, response.status_code, 'The schema version of a mediawiki file can be found')
+            response_dict = json.loads(response.data.decode('utf-8'))
+            self.assertEqual("8.0.1", response_dict["schema_version"], "The HED version should be returned")
+
     def test_schema_version_results1(self):
         with self.app.app_context():
             schema_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '../data/HED8.0.0.xml')
@@ -6,6 +6,42 @@ from constants import base_constants
 
 class Test(TestWebBase):
 
+    def test_string_results_cache_stats(self):
+        with self.app.app_context():
+            input_data = {base_constants.SCHEMA_VERSION: '8.0.0',
+                          base_constants.COMMAND_OPTION: base_constants.COMMAND_VALIDATE,
+                          base_constants.STRING_INPUT: 'Red, (Blue, Square), Label/CacheStats'}
+            self.app.test.post('/string_submit', content_type='multipart/form-data', data=input_data)
+            stats = json.loads(self.app.test.get('/cache_stats').data)
+            self.assertIn('string_validation_cache', stats, "The cache statistics include the string results")
+            hits = stats['string_validation_cache']['hits']
+            self.app.test.post('/string_submit', content_type='multipart/form-data', data=input_data)
+            stats = json.loads(self.app.test.get('/cache_stats').data)
+            self.assertEqual(hits + 1, stats['string_validation_cache']['hits'],
+                             "Validating the same string again should reuse the cached result")
+            self.assertIn('hit_rate', stats['version_cache'], "The cache statistics include hit rates")
+
+    def test_string_incremental_results(self):
+        with self.app.app_context():
+            input_data = {base_constants.SCHEMA_VERSION: '8.0.0',
+                          base_constants.STRING_INPUT: 'Red, (Blue, Square), Label/IncrementalRoute'}
+            response = self.app.test.post('/string_incremental', content_type='multipart/form-data', data=input_data)
+            self.assertEqual(200, response.status_code, 'Incremental validation has a response')
+            response_dict = json.loads(response.data)
+            self.assertEqual('success', response_dict['msg_category'], "The valid string should have no issues")
+            self.assertTrue(response_dict[base_constants.TOKEN_HASH], "The response has the token hash of the string")
+            self.assertTrue(response_dict[base_constants.SCHEMA_HASH], "The response has the hash of the schema")
+            input_data[base_constants.SCHEMA_VERSION] = base_constants.OTHER_VERSION_OPTION
+            input_data[base_constants.SCHEMA_HASH] = response_dict[base_constants.SCHEMA_HASH]
+            input_data[base_constants.STRING_INPUT] = 'Red, (Blue, Square), Label/IncrementalRoute, Blech'
+            input_data[base_constants.PREVIOUS_HASH] = response_dict[base_constants.TOKEN_HASH]
+            response = self.app.test.post('/string_incremental', content_type='multipart/form-data', data=input_data)
+            response_dict = json.loads(response.data)
+            self.assertEqual('warning', response_dict['msg_category'], "The invalid tag should be reported")
+            self.assertEqual([3], response_dict[base_constants.CHANGED_SEGMENTS], "Only the last segment changed")
+            self.assertEqual(45, response_dict[base_constants.ISSUES][0]['start'],
+                             "Issue offsets are relative to the whole string")
+
     def test_string_results_empty_data(self):
         response = self.app.test.post('/string_submit')
         self.assertEqual(200, response.status_code, 'HED string request succeeds even when no data')
@@ -14,6 +50,20 @@ class Test(TestWebBase):
         self.assertIsInstance(response_dict, dict, "The empty string response data is returned in a dictionary")
         self.assertTrue(response_dict["message"], "The empty string response message is not empty")
 
+    def test_string_results_stream(self):
+        with self.app.app_context():
+            input_data = {base_constants.SCHEMA_VERSION: '8.0.0',
+                          base_constants.COMMAND_OPTION: base_constants.COMMAND_TO_LONG,
+                          base_constants.STREAM: 'on', base_constants.STRING_INPUT: 'Red'}
+            response = self.app.test.post('/string_submit', content_type='multipart/form-data', data=input_data)
+            self.assertEqual(200, response.status_code, 'A streamed string request has a response')
+            self.assertEqual('application/x-ndjson', response.mimetype, "A streamed response is NDJSON")
+            lines = [json.loads(line) for line in response.data.decode('utf-8').splitlines()]
+            self.assertEqual(2, len(lines), "A streamed response has a line per string and a summary line")
+            self.assertEqual(1, lines[0]['index'], "The string lines give the position of the string")
+            self.assertTrue(lines[0]['data'].endswith('/Red'), "The string line has the converted string")
+            self.assertEqual('success', lines[1]['msg_category'], "The summary line has the overall category")
+
     def test_string_results_to_long(self):
         with self.app.app_context():
             test_string = 'Property/Sensory-property/Sensory-attribute/Visual-attribute/Color/CSS-color/Red-color/Red'
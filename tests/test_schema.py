@@ -30,6 +30,23 @@ class Test(TestWebBase):
             self.assertFalse(arguments[base_constants.CHECK_FOR_WARNINGS],
                              "get_input_from_form should have check_warnings false when not given")
 
+    def test_get_header_version(self):
+        from schema import get_header_version
+        xml_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data/HED8.0.0.xml')
+        with open(xml_path, 'r') as fp:
+            xml_header = fp.read(4096)
+        self.assertEqual('8.0.0', get_header_version(xml_header, 'HED8.0.0.xml'),
+                         "get_header_version should find the version in an XML header")
+        wiki_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data/HED8.0.1.mediawiki')
+        with open(wiki_path, 'r') as fp:
+            wiki_header = fp.read(4096)
+        self.assertEqual('8.0.1', get_header_version(wiki_header, '.mediawiki'),
+                         "get_header_version should find the version in a mediawiki header")
+        self.assertEqual('0.0.1', get_header_version('<?xml version="1.0" ?>\n<HED library="score" version="0.0.1">'),
+                         "get_header_version should find the version of a library schema")
+        self.assertIsNone(get_header_version('<?xml version="1.0" ?>\n<prologue>', '.xml'),
+                          "get_header_version should return None if there is no HED header")
+
     def test_schema_process(self):
         from schema import process
         from hed.errors.exceptions import HedFileError
@@ -60,6 +77,21 @@ class Test(TestWebBase):
             results = schema_validate(hed_schema, display_name)
             self.assertFalse(results['data'], "HED8.0.0 is HED-3G compliant")
 
+    def test_schema_convert_cached(self):
+        from schema import conversion_cache, schema_convert
+        from schema_loader import get_schema_from_string
+        schema_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data/HED8.0.0.xml')
+        with open(schema_path, 'r') as fp:
+            hed_schema = get_schema_from_string(fp.read(), file_type='.xml')
+        with self.app.app_context():
+            conversion_cache.clear()
+            results1 = schema_convert(hed_schema, 'HED8.0.0.xml')
+            results2 = schema_convert(hed_schema, 'HED8.0.0.xml')
+            self.assertIs(results1['data'], results2['data'], "schema_convert should reuse the converted text")
+            self.assertEqual(1, conversion_cache.get_stats()['hits'], "The second conversion should be a cache hit")
+            results3 = schema_convert(hed_schema, 'HED8.0.0.mediawiki')
+            self.assertTrue(results3['data'].startswith('<?xml'), "schema_convert should cache each format separately")
+
     def test_schema_convert(self):
         from schema import schema_convert
         from hed import schema as hedschema
@@ -0,0 +1,146 @@
+import os
+import unittest
+from tests.test_web_base import TestWebBase
+
+
+class Test(TestWebBase):
+    def test_get_schema_from_version(self):
+        from hed.schema import HedSchema
+        from schema_loader import get_schema_from_version, version_cache
+        with self.app.app_context():
+            version_cache.clear()
+            hed_schema1 = get_schema_from_version('8.0.0')
+            self.assertIsInstance(hed_schema1, HedSchema, "get_schema_from_version should return a HedSchema")
+            hed_schema2 = get_schema_from_version('8.0.0')
+            self.assertIs(hed_schema1, hed_schema2, "get_schema_from_version should reuse the parsed schema")
+            stats = version_cache.get_stats()
+            self.assertEqual(1, stats['hits'], "The second load should be a cache hit")
+            self.assertEqual(1, stats['misses'], "The first load should be a cache miss")
+
+    def test_get_schema_from_string(self):
+        from hed.schema import HedSchema
+        from schema_loader import content_cache, get_schema_from_string
+        schema_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data/HED8.0.0.xml')
+        with open(schema_path, 'r') as fp:
+            schema_string = fp.read()
+        with self.app.app_context():
+            content_cache.clear()
+            hed_schema1 = get_schema_from_string(schema_string, file_type='HED8.0.0.xml')
+            self.assertIsInstance(hed_schema1, HedSchema, "get_schema_from_string should return a HedSchema")
+            hed_schema2 = get_schema_from_string(schema_string, file_type='.xml')
+            self.assertIs(hed_schema1, hed_schema2, "get_schema_from_string should reuse schemas with the same text")
+            self.assertGreater(content_cache.total_bytes, 5 * len(schema_string.encode('utf-8')),
+                               "The size of the parsed schema rather than its text should be charged")
+            self.assertLess(content_cache.total_bytes, 4 * 1024 * 1024,
+                            "The charge should be close to the size of the parsed schema")
+
+    def test_get_content_hash(self):
+        from schema_loader import get_content_hash
+        self.assertEqual(get_content_hash('abc'), get_content_hash(b'abc'),
+                         "get_content_hash should give the same hash for a string and its UTF-8 bytes")
+        self.assertNotEqual(get_content_hash('abc'), get_content_hash('abd'),
+                            "get_content_hash should distinguish different content")
+
+    def test_get_compliance_issues(self):
+        from schema_loader import compliance_cache, get_compliance_issues, get_schema_from_string
+        schema_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data/HED8.0.0.xml')
+        with open(schema_path, 'r') as fp:
+            schema_string = fp.read()
+        with self.app.app_context():
+            compliance_cache.clear()
+            issues1 = get_compliance_issues(get_schema_from_string(schema_string))
+            self.assertTrue(issues1, "HED 8.0.0 is not fully HED-3G compliant")
+            issues2 = get_compliance_issues(get_schema_from_string(schema_string))
+            self.assertIs(issues1, issues2, "get_compliance_issues should reuse the issues of a schema already seen")
+
+    def test_get_schema_hash(self):
+        from hed import schema as hedschema
+        from schema_loader import get_schema_from_version, get_schema_hash
+        from schema_snapshot import get_file_hash
+        with self.app.app_context():
+            hed_schema = get_schema_from_version('8.0.0')
+            hed_file_path = hedschema.get_path_from_hed_version('8.0.0')
+            self.assertEqual(get_file_hash(hed_file_path), get_schema_hash(hed_schema),
+                             "get_schema_hash should return the hash of the file a version was loaded from")
+            schema_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data/HED8.0.0.xml')
+            self.assertIsNone(get_schema_hash(hedschema.load_schema(schema_path)),
+                              "get_schema_hash should return None for schemas not loaded through schema_loader")
+
+    def test_get_tag_index(self):
+        from schema_loader import get_schema_from_version, get_tag_index, tag_index_cache, version_cache
+        with self.app.app_context():
+            version_cache.clear()
+            tag_index_cache.clear()
+            hed_schema = get_schema_from_version('8.0.0')
+            self.assertEqual(1, len(tag_index_cache), "Loading a schema should build its tag index")
+            self.assertIs(get_tag_index(hed_schema), get_tag_index(hed_schema),
+                          "get_tag_index should reuse the index of a schema")
+            self.assertTrue(get_tag_index(hed_schema).complete('Sensory-event'), "The index should have the tags")
+
+    def test_get_validator(self):
+        from hed.validator import HedValidator
+        from schema_loader import get_schema_from_version, get_validator
+        with self.app.app_context():
+            hed_schema = get_schema_from_version('8.0.0')
+            validator1 = get_validator(hed_schema)
+            self.assertIsInstance(validator1, HedValidator, "get_validator should return a HedValidator")
+            self.assertIs(validator1, get_validator(hed_schema), "get_validator should reuse the validator")
+            self.assertIsNot(validator1, get_validator(hed_schema, run_semantic_validation=False),
+                             "get_validator should return different validators for different options")
+
+    def test_get_validator_released(self):
+        import gc
+        import weakref
+        from schema_loader import content_cache, get_schema_from_string, get_validator, validator_cache
+        schema_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data/HED8.0.1.xml')
+        with open(schema_path, 'r') as fp:
+            schema_string = fp.read()
+        with self.app.app_context():
+            content_cache.clear()
+            hed_schema = get_schema_from_string(schema_string)
+            get_validator(hed_schema)
+            schema_ref = weakref.ref(hed_schema)
+            del hed_schema
+            entries = len(validator_cache)
+            content_cache.clear()
+            gc.collect()
+            self.assertEqual(entries - 1, len(validator_cache), "The validators of an evicted schema are removed")
+            self.assertIsNone(schema_ref(), "A schema evicted from the content cache should be freed")
+
+    def test_preload_schemas(self):
+        from schema_loader import preload_schemas, version_cache
+        with self.app.app_context():
+            version_cache.clear()
+            loaded = preload_schemas(['8.0.0', '0.0.0'])
+            self.assertEqual(['8.0.0'], loaded, "preload_schemas should skip versions that cannot be loaded")
+            self.assertEqual(1, len(version_cache), "preload_schemas should put the loaded schemas in the cache")
+
+    def test_schema_version_list(self):
+        from schema_loader import SchemaVersionList
+        with self.app.app_context():
+            version_list = SchemaVersionList(ttl=3600)
+            versions, etag, last_modified = version_list.get()
+            self.assertIsInstance(versions, list, "SchemaVersionList should return a list of versions")
+            self.assertIn('8.0.0', versions, "SchemaVersionList should include the versions in the cache folder")
+            version_list.refresh()
+            self.assertEqual((versions, etag, last_modified), version_list.get(),
+                             "SchemaVersionList should keep the snapshot if the versions are unchanged")
+
+    def test_invalidate_schemas(self):
+        from schema_loader import get_schema_from_version, invalidate_schemas, version_cache
+        with self.app.app_context():
+            version_cache.clear()
+            get_schema_from_version('8.0.0')
+            self.assertEqual(0, invalidate_schemas(), "invalidate_schemas should keep schemas whose files are unchanged")
+            hed_file_path = version_cache.keys()[0][1]
+            modified_time = os.path.getmtime(hed_file_path)
+            os.utime(hed_file_path, (modified_time + 10, modified_time + 10))
+            try:
+                self.assertEqual(1, invalidate_schemas(), "invalidate_schemas should remove modified schemas")
+                self.assertEqual(0, len(version_cache), "The version cache should be empty after invalidation")
+            finally:
+                os.utime(hed_file_path, (modified_time, modified_time))
+
+
+if __name__ == '__main__':
+    unittest.main()
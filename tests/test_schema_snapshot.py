@@ -0,0 +1,71 @@
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+from hed.schema import HedSchema
+from schema_snapshot import get_snapshot_path, load_schema_file, read_snapshot, write_snapshot
+
+
+class Test(unittest.TestCase):
+    key = 'snapshot-test-key'
+
+    @classmethod
+    def setUpClass(cls):
+        cls.temp_dir = tempfile.mkdtemp()
+        source_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data/HED8.0.0.xml')
+        cls.schema_path = os.path.join(cls.temp_dir, 'HED8.0.0.xml')
+        shutil.copy(source_path, cls.schema_path)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.temp_dir)
+
+    def test_load_schema_file(self):
+        snapshot_path = get_snapshot_path(self.schema_path)
+        self.assertEqual(os.path.join(self.temp_dir, 'HED8.0.0.snapshot'), snapshot_path,
+                         "The snapshot should sit next to the schema file")
+        hed_schema = load_schema_file(self.schema_path, key=self.key)
+        self.assertIsInstance(hed_schema, HedSchema, "load_schema_file should return a HedSchema")
+        self.assertTrue(os.path.isfile(snapshot_path), "load_schema_file should write a snapshot")
+        hed_schema2 = load_schema_file(self.schema_path, key=self.key)
+        self.assertEqual(hed_schema.header_attributes['version'], hed_schema2.header_attributes['version'],
+                         "A schema read from its snapshot should have the same version")
+
+    def test_load_schema_file_without_key(self):
+        schema_path = os.path.join(self.temp_dir, 'HED_nokey.xml')
+        shutil.copy(self.schema_path, schema_path)
+        self.assertIsInstance(load_schema_file(schema_path), HedSchema, "load_schema_file should parse the XML")
+        self.assertFalse(os.path.exists(get_snapshot_path(schema_path)), "No snapshot should be written without a key")
+
+    def test_read_snapshot_invalid(self):
+        hed_schema = load_schema_file(self.schema_path, key=self.key)
+        snapshot_path = os.path.join(self.temp_dir, 'other.snapshot')
+        self.assertTrue(write_snapshot(snapshot_path, hed_schema, 'abc', self.key), "write_snapshot should succeed")
+        self.assertIsInstance(read_snapshot(snapshot_path, 'abc', self.key), HedSchema,
+                              "read_snapshot should return the schema when the source hash matches")
+        self.assertIsNone(read_snapshot(snapshot_path, 'def', self.key),
+                          "read_snapshot should reject a snapshot built from a different source")
+        self.assertIsNone(read_snapshot(snapshot_path, 'abc', 'other-key'),
+                          "read_snapshot should reject a snapshot signed with a different key")
+        with open(snapshot_path, 'r+b') as fp:
+            fp.seek(-10, os.SEEK_END)
+            fp.write(b'0123456789')
+        self.assertIsNone(read_snapshot(snapshot_path, 'abc', self.key),
+                          "read_snapshot should reject a corrupted snapshot")
+        self.assertIsNone(read_snapshot(os.path.join(self.temp_dir, 'missing.snapshot'), 'abc', self.key),
+                          "read_snapshot should return None for a missing snapshot")
+
+    def test_read_snapshot_tampered(self):
+        snapshot_path = os.path.join(self.temp_dir, 'tampered.snapshot')
+        write_snapshot(snapshot_path, load_schema_file(self.schema_path, key=self.key), 'abc', self.key)
+        with open(snapshot_path, 'rb') as fp:
+            magic, header_line, signature = fp.readline(), fp.readline(), fp.readline()
+        with open(snapshot_path, 'wb') as fp:
+            fp.write(magic + header_line + signature + pickle.dumps({'not': 'a schema'}))
+        self.assertIsNone(read_snapshot(snapshot_path, 'abc', self.key),
+                          "read_snapshot should not unpickle a payload that was replaced")
+
+
+if __name__ == '__main__':
+    unittest.main()
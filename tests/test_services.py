@@ -40,6 +40,26 @@ class Test(TestWebBase):
             self.assertTrue(arguments[base_constants.CHECK_FOR_WARNINGS],
                             "get_input_from_request should have check_warnings true when on")
 
+    def test_services_process_stream(self):
+        from services import is_streaming, process_stream
+        from schema_loader import get_schema_from_version
+        with self.app.app_context():
+            arguments = {base_constants.SERVICE: 'strings_to_short', base_constants.COMMAND: 'to_short',
+                         base_constants.COMMAND_TARGET: 'strings', base_constants.STREAM: True,
+                         base_constants.SCHEMA: get_schema_from_version('8.0.0'),
+                         base_constants.STRING_LIST: [models.HedString('Red'), models.HedString('Blech')]}
+            self.assertTrue(is_streaming(arguments), "A strings service with stream on should be streamed")
+            results = list(process_stream(arguments))
+            self.assertEqual(3, len(results), "There should be a line per string and a summary line")
+            self.assertEqual('Red', results[0]['data'], "The first line should have the converted string")
+            self.assertTrue(results[1]['issues'], "The second line should have the issues of the invalid string")
+            self.assertEqual('strings_to_short', results[2][base_constants.SERVICE],
+                             "The summary line should be a standard service response")
+            self.assertEqual(1, results[2]['results'][base_constants.ISSUE_COUNT],
+                             "The summary should count the strings with issues")
+            arguments[base_constants.COMMAND_TARGET] = 'sidecar'
+            self.assertFalse(is_streaming(arguments), "Only the strings services are streamed")
+
     def test_services_process_empty(self):
         from services import process
         arguments = {'service': ''}
@@ -36,6 +36,41 @@ class Test(TestWebBase):
             self.assertFalse(arguments[base_constants.CHECK_FOR_WARNINGS],
                              "generate_input_from_sidecar_form should have check for warnings false when not given")
 
+    def test_get_sidecar_issues_cached(self):
+        from hed import models
+        from hed.errors import ErrorContext, get_printable_issue_string
+        from schema_loader import get_schema_from_version, get_validator
+        from sidecar import get_sidecar_issues, validation_cache
+        json_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data/bids_events_bad.json')
+        with self.app.app_context():
+            hed_schema = get_schema_from_version('8.0.0')
+            validation_cache.clear()
+            issues = get_sidecar_issues(hed_schema, models.Sidecar(file=json_path, name='bids_events_bad'))
+            self.assertTrue(issues, "get_sidecar_issues should return the issues of an invalid sidecar")
+            issues2 = get_sidecar_issues(hed_schema, models.Sidecar(file=json_path, name='task-other_events'))
+            self.assertEqual(1, validation_cache.hits, "A sidecar with the same content should be validated once")
+            self.assertEqual({'bids_events_bad'}, {issue[ErrorContext.FILE_NAME] for issue in issues
+                                                   if ErrorContext.FILE_NAME in issue},
+                             "Sidecar issues should have the name of the sidecar")
+            self.assertEqual({'task-other_events'}, {issue[ErrorContext.FILE_NAME] for issue in issues2
+                                                     if ErrorContext.FILE_NAME in issue},
+                             "Cached sidecar issues should have the name of the sidecar they are returned for")
+            self.assertEqual([{key: value for key, value in issue.items() if key != ErrorContext.FILE_NAME}
+                              for issue in issues],
+                             [{key: value for key, value in issue.items() if key != ErrorContext.FILE_NAME}
+                              for issue in issues2], "Cached sidecar issues should only differ in the name")
+            expected = models.Sidecar(file=json_path, name='bids_events_bad').validate_entries(
+                get_validator(hed_schema))
+            self.assertEqual(get_printable_issue_string(expected), get_printable_issue_string(issues),
+                             "Cached sidecar issues should print the same as the issues from validation")
+            self.assertFalse(any(isinstance(issue.get('source_tag'), models.HedTag) or
+                                 isinstance(issue.get(ErrorContext.HED_STRING, ('',))[0], models.HedString)
+                                 for issue in issues), "Cached sidecar issues should not refer to parsed strings")
+            get_sidecar_issues(hed_schema, models.Sidecar(file=json_path, name='bids_events_bad'),
+                               check_for_warnings=True)
+            self.assertEqual(1, validation_cache.hits, "check_for_warnings should be part of the cache key")
+            self.assertEqual(2, len(validation_cache), "There should be a cache entry for each check_for_warnings")
+
     def test_sidecar_process_empty_file(self):
         from sidecar import process
         from hed.errors.exceptions import HedFileError
@@ -0,0 +1,92 @@
+import unittest
+from werkzeug.test import create_environ
+from werkzeug.wrappers import Request
+
+from tests.test_web_base import TestWebBase
+from hed.errors import HedFileError
+from hed.models import HedString
+from constants import base_constants
+
+
+class Test(TestWebBase):
+    def test_get_input_from_incremental_form(self):
+        from string_incremental import get_input_from_incremental_form
+        from schema_loader import get_schema_from_version, get_schema_hash
+        with self.app.test:
+            hed_schema = get_schema_from_version('8.0.0')
+            environ = create_environ(data={base_constants.STRING_INPUT: 'Red, Blue',
+                                           base_constants.SCHEMA_VERSION: '8.0.0'})
+            arguments = get_input_from_incremental_form(Request(environ))
+            self.assertIs(hed_schema, arguments[base_constants.SCHEMA], "The schema version should give the schema")
+            environ = create_environ(data={base_constants.STRING_INPUT: 'Red, Blue',
+                                           base_constants.SCHEMA_VERSION: base_constants.OTHER_VERSION_OPTION,
+                                           base_constants.SCHEMA_HASH: get_schema_hash(hed_schema)})
+            arguments = get_input_from_incremental_form(Request(environ))
+            self.assertEqual(get_schema_hash(hed_schema), get_schema_hash(arguments[base_constants.SCHEMA]),
+                             "The hash of a loaded schema should stand in for an uploaded schema")
+            environ = create_environ(data={base_constants.STRING_INPUT: 'Red, Blue',
+                                           base_constants.SCHEMA_VERSION: base_constants.OTHER_VERSION_OPTION,
+                                           base_constants.SCHEMA_HASH: 'blech'})
+            with self.assertRaises(HedFileError, msg="An unknown hash without an uploaded schema should raise"):
+                get_input_from_incremental_form(Request(environ))
+
+    def test_split_top_level(self):
+        from string_incremental import split_top_level
+        with self.app.app_context():
+            text = ' Red, (Blue, (Green)) ,Label/Split'
+            self.assertEqual(['Red', '(Blue, (Green))', 'Label/Split'],
+                             [text[start:end] for start, end in split_top_level(text)],
+                             "split_top_level should split at top-level commas and strip blanks")
+            self.assertEqual([(0, 3), (4, 4)], split_top_level('Red,'), "Empty parts should have empty spans")
+            self.assertIsNone(split_top_level('Red, (Blue'), "Unbalanced parentheses should give None")
+            self.assertIsNone(split_top_level('Red), (Blue'), "Unbalanced parentheses should give None")
+
+    def test_string_validate_incremental(self):
+        from string_incremental import validate_incremental
+        from strings import validation_cache
+        from schema_loader import get_schema_from_version, get_validator
+        with self.app.app_context():
+            hed_schema = get_schema_from_version('8.0.0')
+            results = validate_incremental(hed_schema, 'Red, (Blue, Square), Label/Incremental')
+            self.assertEqual('success', results['msg_category'], "A valid string should have no issues")
+            self.assertEqual(3, results[base_constants.SEGMENT_COUNT], "Each top-level part should be a segment")
+            self.assertEqual([0, 1, 2], results[base_constants.CHANGED_SEGMENTS],
+                             "Without a previous hash every segment has changed")
+            hits = validation_cache.hits
+            text = 'Red, (Blue, Square), Label/Incremental, Blech/Incremental'
+            results2 = validate_incremental(hed_schema, text, previous_hash=results[base_constants.TOKEN_HASH])
+            self.assertEqual(hits + 3, validation_cache.hits, "Unchanged segments should reuse cached results")
+            self.assertEqual([3], results2[base_constants.CHANGED_SEGMENTS], "Only the new segment has changed")
+            self.assertEqual('warning', results2['msg_category'], "An invalid tag should be reported")
+            issue = results2[base_constants.ISSUES][0]
+            self.assertEqual('HED_TAG_INVALID', issue['code'], "The issue should have the issue code")
+            self.assertEqual('Blech', text[issue['start']:issue['end']],
+                             "The issue offsets should be relative to the whole string")
+            full_issues = HedString(text).validate(get_validator(hed_schema))
+            self.assertEqual([issue['code'] for issue in full_issues],
+                             [issue['code'] for issue in results2[base_constants.ISSUES]],
+                             "Incremental validation should find the issues of full validation")
+            results3 = validate_incremental(hed_schema, text, previous_hash=results2[base_constants.TOKEN_HASH])
+            self.assertEqual(results2[base_constants.TOKEN_HASH], results3[base_constants.TOKEN_HASH],
+                             "The same string should have the same token hash")
+            self.assertEqual([], results3[base_constants.CHANGED_SEGMENTS], "An unchanged string has no changes")
+
+    def test_string_validate_incremental_whole_string(self):
+        from string_incremental import validate_incremental
+        from schema_loader import get_schema_from_version, get_validator
+        with self.app.app_context():
+            hed_schema = get_schema_from_version('8.0.0')
+            for text in ['Red, (Blue, Square), Property/Sensory-property/Sensory-attribute/Visual-attribute/Color/'
+                         'CSS-color/Red-color/Red', 'Red, (Blue, Square), (Square, Blue)',
+                         '(Event-context), (Event-context)', 'Red,, Blue', 'Red, (Blue']:
+                results = validate_incremental(hed_schema, text)
+                self.assertEqual(1, results[base_constants.SEGMENT_COUNT],
+                                 f"'{text}' needs to be validated as a whole")
+                full_issues = HedString(text).validate(get_validator(hed_schema))
+                self.assertEqual([issue['code'] for issue in full_issues],
+                                 [issue['code'] for issue in results[base_constants.ISSUES]],
+                                 f"'{text}' should have the issues of full validation")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,7 @@
 import os
 import unittest
+from concurrent.futures.process import BrokenProcessPool
+from unittest import mock
 from werkzeug.test import create_environ
 from werkzeug.wrappers import Request
 
@@ -101,6 +103,130 @@ class Test(TestWebBase):
             results = validate(hed_schema, string_list)
             self.assertEqual('success', results['msg_category'], "validate should return success if converted")
 
+    def test_string_validate_dedup(self):
+        from strings import convert, get_unique_strings, validate
+        schema_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data/HED8.0.0.xml')
+        hed_schema = hedschema.load_schema(schema_path)
+        texts = ['Red', 'Blech', 'Red', 'Blue', 'Blech', 'Red']
+        unique_list, unique_index = get_unique_strings([HedString(text) for text in texts])
+        self.assertEqual(['Red', 'Blech', 'Blue'], [str(hed_string) for hed_string in unique_list],
+                         "get_unique_strings should keep the first string with each text")
+        self.assertEqual([0, 1, 0, 2, 1, 0], unique_index, "get_unique_strings should index every position")
+        with self.app.app_context():
+            results = validate(hed_schema, [HedString(text) for text in texts])
+            self.assertEqual(2, len(results['data']), "validate should report each repeated invalid string")
+            self.assertTrue(results['data'][0].startswith('Errors for HED string 2:'),
+                            "validate should report the original position of the first invalid string")
+            self.assertTrue(results['data'][1].startswith('Errors for HED string 5:'),
+                            "validate should report the original position of a repeated invalid string")
+            self.assertEqual(6, results[base_constants.STRING_COUNT], "validate should report the string count")
+            self.assertEqual(3, results[base_constants.UNIQUE_STRING_COUNT],
+                             "validate should report the number of distinct strings")
+            self.assertEqual(2.0, results[base_constants.DEDUP_RATIO], "validate should report the dedup ratio")
+            results = convert(hed_schema, [HedString(text) for text in ['Red', 'Blue', 'Red']],
+                              command=base_constants.COMMAND_TO_LONG)
+            self.assertEqual(3, len(results['data']), "convert should return a string for every position")
+            self.assertEqual(results['data'][0], results['data'][2], "convert should repeat duplicate results")
+
+    def test_string_validate_cached(self):
+        from strings import validate, validation_cache
+        from schema_loader import get_schema_from_version
+        with self.app.app_context():
+            hed_schema = get_schema_from_version('8.0.0')
+            string_list = [HedString('Red, Label/ValidateCached'), HedString('Blech/ValidateCached')]
+            results = validate(hed_schema, string_list)
+            hits = validation_cache.hits
+            results2 = validate(hed_schema, [HedString('Red, Label/ValidateCached'),
+                                             HedString('Blech/ValidateCached')])
+            self.assertEqual(hits + 2, validation_cache.hits, "Repeated strings should be found in the cache")
+            self.assertEqual(results, results2, "Cached validation results should be the same as computed ones")
+            validate(hed_schema, string_list, check_for_warnings=True)
+            self.assertEqual(hits + 2, validation_cache.hits, "check_for_warnings should be part of the cache key")
+
+    def test_string_validate_cached_portable(self):
+        from hed.errors import ErrorContext, get_printable_issue_string
+        from strings import get_string_results
+        from schema_loader import get_schema_from_version, get_validator
+        text = 'Red, Blech/PortableCached, (Blue, Junk/PortableCached)'
+        with self.app.app_context():
+            hed_schema = get_schema_from_version('8.0.0')
+            expected = HedString(text).validate(get_validator(hed_schema))
+            issues = get_string_results(hed_schema, [HedString(text)])[0][0]
+            cached_issues = get_string_results(hed_schema, [HedString(text)])[0][0]
+        self.assertIs(issues, cached_issues, "The issues of a repeated string should come from the cache")
+        self.assertEqual(get_printable_issue_string(expected), get_printable_issue_string(issues),
+                         "Portable issues should print the same as the issues from validation")
+        self.assertTrue(all(isinstance(issue['source_tag'], str) for issue in issues if 'source_tag' in issue),
+                        "Cached issues should not refer to parsed tags")
+        self.assertFalse(any(isinstance(issue[ErrorContext.HED_STRING][0], HedString) for issue in issues),
+                         "Cached issues should not refer to parsed strings")
+
+    def test_string_convert_cached(self):
+        from strings import convert, validation_cache
+        from schema_loader import get_schema_from_version
+        texts = ['Red, (Blue, Square), Label/ConvertCached', 'Sensory-event, Label/ConvertCached']
+        with self.app.app_context():
+            hed_schema = get_schema_from_version('8.0.0')
+            results = convert(hed_schema, [HedString(text) for text in texts], base_constants.COMMAND_TO_LONG)
+            hits = validation_cache.hits
+            results2 = convert(hed_schema, [HedString(text) for text in texts], base_constants.COMMAND_TO_LONG)
+            self.assertEqual(hits + 2, validation_cache.hits, "Converting again should reuse the validation results")
+            self.assertEqual(results['data'], results2['data'],
+                             "Conversion of strings with cached validation should give the same strings")
+            expected = [HedString(text).convert_to_long(hed_schema)[0] for text in texts]
+            self.assertEqual(expected, results['data'], "Single pass conversion should match convert_to_long")
+
+    def test_string_process_stream(self):
+        from strings import process_stream
+        from hed.errors.exceptions import HedFileError
+        schema_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data/HED8.0.0.xml')
+        hed_schema = hedschema.load_schema(schema_path)
+        arguments = {base_constants.SCHEMA: hed_schema, base_constants.COMMAND: base_constants.COMMAND_VALIDATE,
+                     base_constants.STRING_LIST: [HedString('Red'), HedString('Blech'), HedString('Red')]}
+        with self.app.app_context():
+            results = list(process_stream(arguments))
+            self.assertEqual([1, 2, 3], [result['index'] for result in results[:3]],
+                             "process_stream should yield a result per string in order")
+            self.assertEqual(['success', 'warning', 'success'], [result['msg_category'] for result in results[:3]],
+                             "process_stream should give the category of each string")
+            self.assertTrue(results[1]['issues'].startswith('Errors for HED string 2:'),
+                            "process_stream should give printable issues for strings with issues")
+            self.assertEqual(3, results[3][base_constants.STRING_COUNT], "The summary should count the strings")
+            self.assertEqual(1, results[3][base_constants.ISSUE_COUNT],
+                             "The summary should count the strings with issues")
+            arguments[base_constants.COMMAND] = 'blech'
+            self.assertRaises(HedFileError, process_stream, arguments)
+
+    def test_string_validate_batch(self):
+        import strings
+        from process_pool import SchemaProcessPool
+        from schema_loader import get_schema_from_version
+        string_list = [HedString('Red'), HedString('Blech'), HedString('Blue'), HedString('Junk, Green')]
+        with self.app.app_context():
+            hed_schema = get_schema_from_version('8.0.0')
+            serial_results = strings.validate(hed_schema, string_list)
+            saved_pool, saved_config = strings.process_pool, dict(strings.app_config)
+            strings.process_pool = SchemaProcessPool(max_workers=2)
+            strings.app_config.update({'STRING_BATCH_THRESHOLD': 2, 'STRING_BATCH_SIZE': 1})
+            try:
+                strings.validation_cache.clear()
+                with mock.patch.object(strings.process_pool, 'map_chunks') as map_chunks:
+                    strings.validate(hed_schema, string_list)
+                map_chunks.assert_not_called()
+                strings.validation_cache.clear()
+                batch_results = strings.validate(hed_schema, string_list, parallel=True)
+                strings.validation_cache.clear()
+                with mock.patch.object(strings.process_pool, 'map_chunks', side_effect=BrokenProcessPool):
+                    fallback_results = strings.validate(hed_schema, string_list, parallel=True)
+            finally:
+                strings.process_pool.shutdown()
+                strings.process_pool = saved_pool
+                strings.app_config.clear()
+                strings.app_config.update(saved_config)
+        self.assertEqual(serial_results, batch_results,
+                         "Validating on the process pool should give the same results as validating serially")
+        self.assertEqual(serial_results, fallback_results, "A broken pool should fall back to serial validation")
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,45 @@
+import os
+import unittest
+import hed.schema as hedschema
+from tag_index import TagIndex
+
+
+class Test(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        schema_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data/HED8.0.0.xml')
+        cls.hed_schema = hedschema.load_schema(schema_path)
+        cls.tag_index = TagIndex(cls.hed_schema)
+
+    def test_complete_short_tags(self):
+        completions = self.tag_index.complete('Sensory-', limit=100)
+        tags = [completion['tag'] for completion in completions]
+        self.assertIn('Sensory-event', tags, "Short tags should be completed")
+        self.assertEqual(sorted(tags, key=str.lower), tags, "Completions should be in alphabetical order")
+        self.assertTrue(all(tag.lower().startswith('sensory-') for tag in tags), "Completions match the prefix")
+        event = completions[tags.index('Sensory-event')]
+        self.assertEqual('Event/Sensory-event', event['long_tag'], "A completion should have the long form")
+        self.assertFalse(event['takes_value'], "Sensory-event does not take a value")
+
+    def test_complete_long_tags(self):
+        tags = [completion['tag'] for completion in self.tag_index.complete('event/', limit=100)]
+        self.assertIn('Event/Sensory-event', tags, "Long tags should be completed")
+        self.assertNotIn('Sensory-event', tags, "Short tags should not match a long prefix")
+
+    def test_complete_takes_value(self):
+        completions = self.tag_index.complete(' duration/', limit=5)
+        self.assertEqual(['Duration/#'], [completion['tag'] for completion in completions],
+                         "Takes-value tags should be completed with a placeholder")
+        self.assertTrue(completions[0]['takes_value'], "The placeholder completion takes a value")
+        self.assertEqual(['timeUnits'], completions[0]['unit_classes'], "The completion has the unit classes")
+
+    def test_complete_limit(self):
+        self.assertEqual(3, len(self.tag_index.complete('s', limit=3)), "The number of completions is limited")
+        self.assertFalse(self.tag_index.complete('s', limit=0), "A limit of 0 gives no completions")
+        self.assertFalse(self.tag_index.complete('Blech'), "A prefix of no tag gives no completions")
+        self.assertEqual(len(self.tag_index), len(self.tag_index.complete('', limit=len(self.tag_index))),
+                         "An empty prefix matches every tag")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+import os
+import unittest
+import hed.schema as hedschema
+from hed.models import HedString
+from tag_map import TagConverter, build_tag_map
+
+
+class Test(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        schema_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data/HED8.0.0.xml')
+        cls.hed_schema = hedschema.load_schema(schema_path)
+        cls.tag_converter = TagConverter(cls.hed_schema, build_tag_map(cls.hed_schema))
+
+    def test_build_tag_map(self):
+        tag_map = build_tag_map(self.hed_schema)
+        long_red = 'Property/Sensory-property/Sensory-attribute/Visual-attribute/Color/CSS-color/Red-color/Red'
+        self.assertEqual((long_red, 'Red'), tag_map['red'], "The map should have the short form of a tag")
+        self.assertEqual((long_red, 'Red'), tag_map[long_red.lower()], "The map should have the long form of a tag")
+        self.assertFalse([name for name in tag_map if name.endswith('#')], "The map should not have placeholders")
+
+    def test_convert_matches_schema(self):
+        texts = ['Red', 'red, (Blue, (Square, Label/Apple))', 'Sensory-event, Def/MyDef, Duration/3 s',
+                 'Property/Informational-property/Label/Banana, Agent-action, (Press, Mouse-button)']
+        for text in texts:
+            long_string, long_issues = self.tag_converter.convert(HedString(text), 'long_tag')
+            self.assertEqual(HedString(text).convert_to_long(self.hed_schema), (long_string, long_issues),
+                             f"The long form of {text} should be the same as the schema converter's")
+            short_string, short_issues = self.tag_converter.convert(HedString(text), 'short_tag')
+            self.assertEqual(HedString(text).convert_to_short(self.hed_schema), (short_string, short_issues),
+                             f"The short form of {text} should be the same as the schema converter's")
+
+    def test_convert_invalid(self):
+        converted_string, issues = self.tag_converter.convert(HedString('Red, Blech/Junk'), 'long_tag')
+        self.assertTrue(issues, "A tag that is not in the schema should fall back to the schema and report issues")
+        self.assertTrue(converted_string.endswith(',Blech/Junk'), "An invalid tag should be left as it is")
+
+    def test_canonicalize_get_as_form(self):
+        hed_string_obj = HedString('Red, (Label/Apple, Square)')
+        self.assertFalse(self.tag_converter.canonicalize(hed_string_obj), "canonicalize of a valid string is clean")
+        self.assertEqual(HedString('Red, (Label/Apple, Square)').convert_to_long(self.hed_schema)[0],
+                         self.tag_converter.get_as_form(hed_string_obj, 'long_tag'),
+                         "get_as_form after canonicalize should give the long form")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from hed.errors import HedFileError
+from url_cache import UrlCache, normalize_url
+
+
+class SchemaHandler(BaseHTTPRequestHandler):
+    content = b''
+    etag = '"v1"'
+    status = 200
+    requests = []
+
+    def do_GET(self):
+        SchemaHandler.requests.append(self.headers.get('If-None-Match'))
+        if SchemaHandler.status != 200:
+            self.send_response(SchemaHandler.status)
+            self.end_headers()
+        elif self.headers.get('If-None-Match') == SchemaHandler.etag:
+            self.send_response(304)
+            self.end_headers()
+        else:
+            self.send_response(200)
+            self.send_header('ETag', SchemaHandler.etag)
+            self.send_header('Content-Length', str(len(SchemaHandler.content)))
+            self.end_headers()
+            self.wfile.write(SchemaHandler.content)
+
+    def log_message(self, *args):
+        pass
+
+
+class Test(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        schema_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data/HED8.0.0.xml')
+        with open(schema_path, 'rb') as fp:
+            SchemaHandler.content = fp.read()
+        cls.server = HTTPServer(('127.0.0.1', 0), SchemaHandler)
+        cls.url = f"http://127.0.0.1:{cls.server.server_port}/HED8.0.0.xml"
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.cache_folder = tempfile.mkdtemp()
+        SchemaHandler.requests = []
+        SchemaHandler.status = 200
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_folder)
+
+    def test_normalize_url(self):
+        self.assertEqual('https://example.org/a/HED8.0.0.xml?x=1',
+                         normalize_url(' HTTPS://Example.ORG:443/a/HED8.0.0.xml?x=1#top'),
+                         "normalize_url should lower case the host and drop the default port and fragment")
+        self.assertEqual('http://example.org:8080/', normalize_url('http://example.org:8080'),
+                         "normalize_url should keep non-default ports")
+
+    def test_fetch_within_ttl(self):
+        cache = UrlCache(self.cache_folder, ttl=3600)
+        entry = cache.fetch(self.url)
+        self.assertEqual(SchemaHandler.content, entry['content'], "fetch should return the downloaded content")
+        self.assertEqual('"v1"', entry['etag'], "fetch should keep the ETag of the response")
+        cache.fetch(self.url)
+        self.assertEqual(1, len(SchemaHandler.requests), "fetch should not contact the origin within the ttl")
+
+    def test_fetch_revalidate(self):
+        cache = UrlCache(self.cache_folder, ttl=0)
+        entry1 = cache.fetch(self.url)
+        entry2 = cache.fetch(self.url)
+        self.assertEqual([None, '"v1"'], SchemaHandler.requests, "fetch should revalidate with If-None-Match")
+        self.assertEqual(entry1['content_hash'], entry2['content_hash'],
+                         "A not modified response should keep the cached content")
+
+    def test_fetch_from_disk(self):
+        UrlCache(self.cache_folder, ttl=3600).fetch(self.url)
+        entry = UrlCache(self.cache_folder, ttl=3600).fetch(self.url)
+        self.assertEqual(SchemaHandler.content, entry['content'], "A new cache should read entries from disk")
+        self.assertEqual(1, len(SchemaHandler.requests), "An entry read from disk within the ttl is not revalidated")
+
+    def test_fetch_stale(self):
+        cache = UrlCache(self.cache_folder, ttl=0)
+        cache.fetch(self.url)
+        SchemaHandler.status = 503
+        entry = cache.fetch(self.url)
+        self.assertEqual(SchemaHandler.content, entry['content'], "fetch should serve stale content on server errors")
+        missing_url = self.url.replace('HED8.0.0.xml', 'missing.xml')
+        self.assertRaises(HedFileError, cache.fetch, missing_url)
+
+    def test_fetch_unreachable(self):
+        server = HTTPServer(('127.0.0.1', 0), SchemaHandler)
+        url = f"http://127.0.0.1:{server.server_port}/HED8.0.0.xml"
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        UrlCache(self.cache_folder, ttl=0).fetch(url)
+        server.shutdown()
+        server.server_close()
+        entry = UrlCache(self.cache_folder, ttl=0, timeout=1).fetch(url)
+        self.assertEqual(SchemaHandler.content, entry['content'],
+                         "fetch should serve stale content from disk when the origin is unreachable")
+
+
+if __name__ == '__main__':
+    unittest.main()